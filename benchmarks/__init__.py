@@ -0,0 +1,11 @@
+"""
+Pinned performance workloads (python -m bid.benchmarks). Every input is
+seeded or read from a checked-in fixture, so results from different
+revisions compare with --compare.
+"""
+from bid.benchmarks.harness import (BenchmarkResult, Workload, compare_reports, load_report, run_suite,
+                                    run_workload, save_report)
+from bid.benchmarks.workloads import default_workloads
+
+__all__ = ["BenchmarkResult", "Workload", "compare_reports", "default_workloads", "load_report", "run_suite",
+           "run_workload", "save_report"]
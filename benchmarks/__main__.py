@@ -0,0 +1,29 @@
+import argparse
+import sys
+from bid.benchmarks.harness import compare_reports, format_result, load_report, run_suite, save_report
+from bid.benchmarks.workloads import default_workloads
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pinned benchmark suite for the bidding engine")
+    parser.add_argument("only", nargs="*", help="run workloads whose name starts with one of these")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per workload")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown counted as a regression")
+    parser.add_argument("--list", action="store_true", help="list workload names and exit")
+    args = parser.parse_args()
+
+    workloads = default_workloads()
+    if args.list:
+        print("\n".join(w.name for w in workloads))
+        sys.exit(0)
+
+    report = run_suite(workloads, args.only, args.min_time, progress=lambda r: print(format_result(r), flush=True))
+    if args.json:
+        save_report(report, args.json)
+    if args.compare:
+        lines, regressions = compare_reports(load_report(args.compare), report, args.threshold)
+        print("\n" + "\n".join(lines))
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold * 100:.0f}%")
+            sys.exit(1)
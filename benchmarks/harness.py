@@ -0,0 +1,108 @@
+import json
+import platform
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+class Workload:
+    """
+    A named operation run over a fixed list of inputs. `setup` builds the
+    inputs once (seeded, so every run measures the same work); `op` is
+    called on them in turn, one call being one "op".
+    """
+    def __init__(self, name: str, setup: Callable[[], Sequence], op: Callable, group: str = ""):
+        self.name = name
+        self.setup = setup
+        self.op = op
+        self.group = group
+
+class BenchmarkResult:
+    def __init__(self, name: str, latencies_ns: List[int]):
+        self.name = name
+        self.ops = len(latencies_ns)
+        self.elapsed = sum(latencies_ns) / 1e9
+        ordered = sorted(latencies_ns)
+        self.p50_us = _percentile(ordered, 50) / 1e3
+        self.p99_us = _percentile(ordered, 99) / 1e3
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.ops / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict:
+        return {"ops": self.ops, "elapsed": self.elapsed, "ops_per_second": self.ops_per_second,
+                "p50_us": self.p50_us, "p99_us": self.p99_us}
+
+def _percentile(ordered: List[int], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def run_workload(workload: Workload, min_time: float = 0.5, min_ops: int = 20, warmup: int = 3) -> BenchmarkResult:
+    """Time `op` one input at a time, cycling through the inputs until min_time and min_ops are both reached."""
+    inputs = list(workload.setup())
+    if not inputs:
+        raise ValueError(f"Workload {workload.name} has no inputs")
+    op = workload.op
+    for i in range(min(warmup, len(inputs))):
+        op(inputs[i])
+    latencies: List[int] = []
+    clock = time.perf_counter_ns
+    deadline = clock() + int(min_time * 1e9)
+    i = 0
+    while len(latencies) < min_ops or clock() < deadline:
+        item = inputs[i % len(inputs)]
+        start = clock()
+        op(item)
+        latencies.append(clock() - start)
+        i += 1
+    return BenchmarkResult(workload.name, latencies)
+
+def run_suite(workloads: List[Workload],
+              selected: Optional[List[str]] = None,
+              min_time: float = 0.5,
+              progress: Optional[Callable[[BenchmarkResult], None]] = None) -> Dict:
+    """Run the workloads whose name starts with any of `selected` (all by default) into a JSON-ready report."""
+    results = {}
+    for workload in workloads:
+        if selected and not any(workload.name.startswith(prefix) for prefix in selected):
+            continue
+        result = run_workload(workload, min_time)
+        results[workload.name] = result.to_dict()
+        if progress:
+            progress(result)
+    return {"meta": {"python": platform.python_version(), "machine": platform.machine(),
+                     "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            "results": results}
+
+def format_result(result: BenchmarkResult) -> str:
+    return (f"{result.name:<40} {result.ops_per_second:>12,.0f} ops/s"
+            f"  p50 {result.p50_us:>9.1f}us  p99 {result.p99_us:>9.1f}us")
+
+def save_report(report: Dict, path: str):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+def load_report(path: str) -> Dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+def compare_reports(baseline: Dict, current: Dict, threshold: float = 0.10):
+    """
+    (lines, regressions): per workload present in both reports, the change
+    in ops/s; a workload more than `threshold` slower (relative) is a
+    regression.
+    """
+    lines, regressions = [], []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            lines.append(f"{name:<40} new")
+            continue
+        change = new["ops_per_second"] / old["ops_per_second"] - 1 if old["ops_per_second"] else 0.0
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        lines.append(f"{name:<40} {old['ops_per_second']:>12,.0f} -> {new['ops_per_second']:>12,.0f} ops/s"
+                     f" ({change * 100:+.1f}%){flag}")
+    return lines, regressions
@@ -0,0 +1,109 @@
+import os
+import random
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from bid.models import (Call, CallType, Card, CompactHand, DealGenerator, Hand, Rank, Seat, Suit, hand_features,
+                        parse_hand)
+from bid.engine import Engine
+from bid.ingest import parse_pbn
+from bid.translator import SystemTranslator
+from bid.benchmarks.harness import Workload
+
+SYSTEM_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "system")
+SEED = 2024
+# Self-play auctions of the shipped systems, recorded once, so that the
+# engine workloads do not change when the rule files do.
+AUCTIONS_PBN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "auctions.pbn")
+
+def dsl_paths() -> Dict[str, str]:
+    """name -> path of every .dsl shipped in bid/system."""
+    return {os.path.splitext(f)[0]: os.path.join(SYSTEM_DIR, f)
+            for f in sorted(os.listdir(SYSTEM_DIR)) if f.endswith(".dsl")}
+
+def _read(path: str) -> str:
+    with open(path, "r") as f:
+        return f.read()
+
+def _card_lists(n: int) -> List[List[Card]]:
+    rng = random.Random(SEED)
+    deck = [Card(s, r) for s in Suit for r in Rank]
+    return [rng.sample(deck, 13) for _ in range(n)]
+
+@lru_cache(maxsize=1)
+def _positions() -> List[Tuple[List[Call], CompactHand, Seat]]:
+    """(auction so far, hand to bid, dealer) at every call of the pinned AUCTIONS_PBN boards."""
+    positions = []
+    for board in parse_pbn(_read(AUCTIONS_PBN)):
+        for n in range(len(board.auction)):
+            positions.append((board.auction[:n], board.deal[Seat((board.dealer + n) % 4)], board.dealer))
+    return positions
+
+def _bids_so_far(history: List[Call]) -> int:
+    return sum(1 for c in history if c.type == CallType.BID)
+
+def _engine_workloads(name: str, path: str) -> List[Workload]:
+    state = {}
+
+    def setup(depth: str):
+        def build():
+            if "system" not in state:
+                state["system"] = SystemTranslator().parse(_read(path))
+                state["engine"] = Engine(state["system"])
+            positions = _positions()
+            if depth == "opening":
+                return [p for p in positions if _bids_so_far(p[0]) == 0]
+            if depth == "response":
+                return [p for p in positions if _bids_so_far(p[0]) == 1]
+            return [p for p in positions if len(p[0]) >= 6]
+        return build
+
+    def get_bid(item):
+        history, hand, dealer = item
+        state["engine"].get_bid(history, hand, Seat.NORTH, dealer, state["system"])
+
+    def long_auctions():
+        setup("deep")()
+        # Auctions in progress (prefixes of the pinned auctions) of eight calls or more.
+        return [(p[0], p[2]) for p in _positions() if len(p[0]) >= 8]
+
+    def estimate(item):
+        history, dealer = item
+        state["engine"].estimate_deal(history, Seat.NORTH, dealer, state["system"], state["system"])
+
+    return [Workload(f"engine.get_bid.{name}.{depth}", setup(depth), get_bid, "engine")
+            for depth in ("opening", "response", "deep")] + \
+           [Workload(f"engine.estimate_deal.{name}", long_auctions, estimate, "engine")]
+
+def default_workloads() -> List[Workload]:
+    """The pinned suite: every input is derived from SEED, the shipped .dsl files and AUCTIONS_PBN."""
+    workloads = []
+    for name, path in dsl_paths().items():
+        workloads.append(Workload(f"translator.parse.{name}", lambda path=path: [_read(path)],
+                                  SystemTranslator().parse, "translator"))
+
+    workloads.append(Workload("hand.construct", lambda: _card_lists(500), Hand, "hand"))
+    workloads.append(Workload("hand.evaluate", lambda: [Hand(cards) for cards in _card_lists(500)],
+                              hand_features, "hand"))
+    workloads.append(Workload("compact_hand.construct",
+                              lambda: [h.suit_masks for h in DealGenerator(SEED).batch(500)[Seat.NORTH]],
+                              CompactHand, "hand"))
+
+    def hand_strings():
+        hands = [CompactHand.from_cards(cards) for cards in _card_lists(500)]
+        return [" ".join(str(s) + ("".join(str(c.rank) for c in h.by_suit[s]) or "-") for s in reversed(Suit))
+                for h in hands]
+    workloads.append(Workload("hand.from_string", hand_strings, Hand.from_string, "hand"))
+    workloads.append(Workload("compact_hand.parse", hand_strings, parse_hand, "hand"))
+
+    def constraint_pairs():
+        system = SystemTranslator().parse(_read(dsl_paths()["gib"]))
+        constraints = [rule.constraints for rule in system.rules]
+        hands = [Hand(cards) for cards in _card_lists(100)]
+        rng = random.Random(SEED)
+        return [(rng.choice(constraints), hand) for hand in hands for _ in range(5)]
+    workloads.append(Workload("constraints.matches", constraint_pairs,
+                              lambda item: item[0].matches(item[1]), "constraints"))
+
+    for name, path in dsl_paths().items():
+        workloads.extend(_engine_workloads(name, path))
+    return workloads
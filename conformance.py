@@ -0,0 +1,162 @@
+import argparse
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from bid.models import Call, CallType, Seat, auction_context
+from bid.system import BiddingSystem
+from bid.sharding import run_sharded
+from bid.ingest import Board, board_ranges, boards_in_range, file_format
+
+PASS = Call(CallType.PASS)
+NO_RULE = "(no rule: PASS)"
+
+class ConformanceReport:
+    """
+    Agreement of a system with recorded decisions. confusion counts
+    (context, system call, actual call); rules counts, per rule that fired
+    (or NO_RULE), how often it did and how often the actual call differed.
+    Reports from separate shards combine with merge().
+    """
+    def __init__(self):
+        self.decisions = 0
+        self.agreed = 0
+        self.boards = 0
+        self.confusion = Counter()
+        self.rule_fired = Counter()
+        self.rule_disagreed = Counter()
+        self.elapsed = 0.0
+
+    def record(self, context: str, rule_key: str, predicted: str, actual: str):
+        self.decisions += 1
+        self.rule_fired[rule_key] += 1
+        if predicted == actual:
+            self.agreed += 1
+        else:
+            self.rule_disagreed[rule_key] += 1
+        self.confusion[(context, predicted, actual)] += 1
+
+    def merge(self, other: 'ConformanceReport') -> 'ConformanceReport':
+        self.decisions += other.decisions
+        self.agreed += other.agreed
+        self.boards += other.boards
+        self.confusion.update(other.confusion)
+        self.rule_fired.update(other.rule_fired)
+        self.rule_disagreed.update(other.rule_disagreed)
+        return self
+
+    @property
+    def agreement(self) -> float:
+        return self.agreed / self.decisions if self.decisions else 0.0
+
+    @property
+    def decisions_per_second(self) -> float:
+        return self.decisions / self.elapsed if self.elapsed else 0.0
+
+    def context_matrix(self, context: str) -> Counter:
+        """(system call, actual call) -> count for one auction context."""
+        return Counter({(p, a): n for (c, p, a), n in self.confusion.items() if c == context})
+
+    def worst_rules(self, top: int = 10, min_fired: int = 1) -> List[Tuple[str, int, int]]:
+        """(rule, disagreements, times fired), most disagreements first."""
+        rows = [(rule, self.rule_disagreed[rule], fired) for rule, fired in self.rule_fired.items()
+                if fired >= min_fired and self.rule_disagreed[rule]]
+        return sorted(rows, key=lambda row: (-row[1], row[0]))[:top]
+
+    def format(self, top: int = 10) -> str:
+        lines = [f"Decisions: {self.decisions} from {self.boards} boards in {self.elapsed:.2f}s "
+                 f"({self.decisions_per_second:,.0f}/sec)",
+                 f"Agreement: {self.agreed}/{self.decisions} ({self.agreement * 100:.1f}%)"]
+
+        by_context = Counter()
+        for (context, predicted, actual), n in self.confusion.items():
+            if predicted != actual:
+                by_context[context] += n
+        lines.append(f"\n=== Contexts with most disagreements (top {top}) ===")
+        for context, wrong in by_context.most_common(top):
+            total = sum(n for (c, _, _), n in self.confusion.items() if c == context)
+            lines.append(f"{context}: {wrong}/{total} disagree")
+            pairs = [(pair, n) for pair, n in self.context_matrix(context).most_common() if pair[0] != pair[1]]
+            for (predicted, actual), n in pairs[:5]:
+                lines.append(f"    system {predicted:<5} actual {actual:<5} {n}")
+
+        lines.append(f"\n=== Worst rules (top {top}) ===")
+        for rule, wrong, fired in self.worst_rules(top):
+            lines.append(f"{rule}: {wrong}/{fired} disagree ({wrong / fired * 100:.0f}%)")
+        return "\n".join(lines)
+
+def check_board(system: BiddingSystem,
+                board: Board,
+                report: ConformanceReport,
+                seats: Optional[Iterable[Seat]] = None,
+                positions: Optional[Dict[int, int]] = None):
+    """
+    Replay every call of the board made by a seat with a known hand (in
+    `seats`, if given). positions: id(rule) -> index in system.rules, to
+    reuse across boards.
+    """
+    report.boards += 1
+    allowed = set(seats) if seats is not None else None
+    if positions is None:
+        positions = {id(rule): i for i, rule in enumerate(system.rules)}
+    for n, actual in enumerate(board.auction):
+        seat = Seat((board.dealer + n) % 4)
+        hand = board.deal.get(seat)
+        if hand is None or (allowed is not None and seat not in allowed):
+            continue
+        prefix = board.auction[:n]
+        rule = system.get_bid(prefix, hand)
+        if rule is None:
+            predicted, key = PASS, NO_RULE
+        else:
+            predicted = rule.call
+            key = f"#{positions[id(rule)]} {rule.description} -> {rule.call}"
+        report.record(auction_context(prefix), key, str(predicted), str(actual))
+
+def check_boards(system: BiddingSystem,
+                 boards: Iterable[Board],
+                 seats: Optional[Iterable[Seat]] = None) -> ConformanceReport:
+    """Conformance over in-memory boards, in-process."""
+    report = ConformanceReport()
+    start = time.perf_counter()
+    positions = {id(rule): i for i, rule in enumerate(system.rules)}
+    for board in boards:
+        check_board(system, board, report, seats, positions)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+def _run_range(system: BiddingSystem, path: str, fmt: str, start: int, end: int, seats) -> ConformanceReport:
+    return check_boards(system, boards_in_range(path, fmt, start, end), seats)
+
+def run_conformance(dsl_path: str,
+                    archive_path: str,
+                    fmt: Optional[str] = None,
+                    workers: Optional[int] = None,
+                    seats: Optional[Iterable[Seat]] = None,
+                    chunk_size: int = 4 << 20) -> ConformanceReport:
+    """
+    Replay a PBN / LIN archive through a .dsl system: each worker loads the
+    compiled system once and reads its own byte ranges of the archive
+    (ingest.board_ranges), so the parent only merges reports. workers=1
+    runs in-process.
+    """
+    fmt = file_format(archive_path, fmt)
+    seats = tuple(seats) if seats is not None else None
+    ranges = board_ranges(archive_path, fmt, chunk_size)
+    report = ConformanceReport()
+    start = time.perf_counter()
+    run_sharded([dsl_path], [(archive_path, fmt, first, last, seats) for first, last in ranges],
+                _run_range, report.merge, workers)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay archived auctions against a DSL system")
+    parser.add_argument("dsl")
+    parser.add_argument("archive", help=".pbn or .lin file")
+    parser.add_argument("--format", choices=("pbn", "lin"), default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seats", default=None, help="only these seats, e.g. NS")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    seats = [Seat("NESW".index(c)) for c in args.seats.upper()] if args.seats else None
+    print(run_conformance(args.dsl, args.archive, args.format, args.workers, seats).format(args.top))
@@ -1,5 +1,7 @@
-from typing import Dict, Tuple, Optional, Set
-from bid.models import Hand, Suit
+from functools import lru_cache
+from math import comb
+from typing import Dict, List, Tuple, Optional, Set
+from bid.models import Hand, HandBatch, Suit, Rank, ACE_TOPOLOGIES, ACE_TOPOLOGY_CODES, FEATURE_COLUMNS, np
 
 class HandConstraints:
     def __init__(self, 
@@ -22,6 +24,19 @@ class HandConstraints:
         self.aces = aces
         self.ace_topology = ace_topology
         self.balanced = balanced  # None = don't care, True = required, False = forbidden
+        self._compiled = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_compiled"] = None  # generated code does not pickle; recompiled on first use
+        return state
+
+    @property
+    def compiled(self) -> 'CompiledConstraints':
+        """Specialized predicate, built on first use (constraints are not expected to change after that)."""
+        if self._compiled is None:
+            self._compiled = CompiledConstraints(self)
+        return self._compiled
 
     def matches(self, hand: Hand) -> bool:
         if not (self.hcp_min <= hand.hcp <= self.hcp_max):
@@ -50,6 +65,13 @@ class HandConstraints:
         
         return True
 
+    def matches_batch(self, hands) -> 'np.ndarray':
+        """
+        Vectorized matches(): takes a HandBatch or a feature matrix laid out as
+        models.FEATURE_COLUMNS and returns an N-length boolean mask.
+        """
+        return self.compiled.mask(hands)
+
     def intersect(self, other: 'HandConstraints') -> 'HandConstraints':
         """Combine two constraints (e.g., previous specific knowledge + new bid info)."""
         new_min = {s: max(self.length_min[s], other.length_min[s]) for s in Suit}
@@ -96,3 +118,168 @@ class HandConstraints:
             if self.length_min[s] > 0 or self.length_max[s] < 13:
                 parts.append(f"{s}:{self.length_min[s]}-{self.length_max[s]}")
         return ", ".join(parts)
+
+# Full range of each range-checked feature; bounds covering it never reject a hand.
+FEATURE_RANGES = {"hcp": (0, 37), "total_points": (0, 50), "controls": (0, 12),
+                  "len_c": (0, 13), "len_d": (0, 13), "len_h": (0, 13), "len_s": (0, 13)}
+LENGTH_FEATURES = ("len_c", "len_d", "len_h", "len_s")
+
+# Relative cost of reading a feature off a list-based Hand (CompactHand features are all free).
+FEATURE_COSTS = {"len_c": 1, "len_d": 1, "len_h": 1, "len_s": 1, "balanced": 2, "hcp": 3,
+                 "controls": 3, "ace_count": 3, "ace_topology": 4, "total_points": 6}
+
+# Scalar expression reading each feature from a hand `h`.
+FEATURE_EXPRESSIONS = {"hcp": "h.hcp", "total_points": "h.total_points", "controls": "h.controls",
+                       "ace_count": "h.ace_count", "ace_topology": "h.ace_topology", "balanced": "h.is_balanced",
+                       "len_c": "h.length(suits[0])", "len_d": "h.length(suits[1])",
+                       "len_h": "h.length(suits[2])", "len_s": "h.length(suits[3])"}
+
+class CompiledConstraints:
+    """
+    A HandConstraints reduced to the checks that can actually reject a hand
+    (unbounded HCP 0-37, lengths 0-13, ... are dropped), ordered by expected
+    rejections per unit of evaluation cost, and turned into one generated
+    predicate.
+
+    checks: tuple of (feature, arg) with feature a FEATURE_COLUMNS name and arg
+    a (lo, hi) range, a frozenset of allowed values (ace_count, ace_topology)
+    or the required bool (balanced).
+    """
+    __slots__ = ("checks", "source", "predicate")
+
+    def __init__(self, constraints: HandConstraints):
+        checks = nontrivial_checks(constraints)
+        checks.sort(key=lambda check: FEATURE_COSTS[check[0]] / max(1e-6, 1 - _pass_probability(*check)))
+        self.checks = tuple(checks)
+
+        namespace = {"suits": tuple(Suit)}
+        terms = []
+        for i, (feature, arg) in enumerate(self.checks):
+            expr = FEATURE_EXPRESSIONS[feature]
+            if feature == "balanced":
+                terms.append(expr if arg else f"not {expr}")
+            elif isinstance(arg, frozenset):
+                namespace[f"allowed_{i}"] = arg
+                terms.append(f"{expr} in allowed_{i}")
+            else:
+                lo, hi = arg
+                full_lo, full_hi = FEATURE_RANGES[feature]
+                if lo > full_lo and hi < full_hi:
+                    terms.append(f"{lo} <= {expr} <= {hi}")
+                elif lo > full_lo:
+                    terms.append(f"{expr} >= {lo}")
+                else:
+                    terms.append(f"{expr} <= {hi}")
+        self.source = "def predicate(h):\n    return " + (" and ".join(terms) or "True") + "\n"
+        exec(self.source, namespace)
+        self.predicate = namespace["predicate"]
+
+    def __call__(self, hand: Hand) -> bool:
+        return self.predicate(hand)
+
+    @property
+    def features(self) -> Tuple[str, ...]:
+        return tuple(feature for feature, _ in self.checks)
+
+    def first_failure(self, hand: Hand) -> Optional[str]:
+        """Feature of the first check that rejects the hand, None if it matches."""
+        for feature, arg in self.checks:
+            if not _check_value(feature, arg, _scalar_feature(hand, feature)):
+                return feature
+        return None
+
+    def mask(self, hands) -> 'np.ndarray':
+        """Vectorized predicate over a HandBatch or a FEATURE_COLUMNS feature matrix."""
+        column = _batch_columns(hands)
+        mask = np.ones(len(column("hcp")), dtype=bool)
+        for feature, arg in self.checks:
+            values = column(feature)
+            if feature == "balanced":
+                mask &= values == int(arg)
+            elif feature == "ace_topology":
+                mask &= np.isin(values, [ACE_TOPOLOGY_CODES[t] for t in arg])
+            elif isinstance(arg, frozenset):
+                mask &= np.isin(values, list(arg))
+            else:
+                mask &= (values >= arg[0]) & (values <= arg[1])
+        return mask
+
+def nontrivial_checks(con: HandConstraints) -> List[Tuple[str, object]]:
+    """
+    The (feature, arg) checks of `con` that can reject some hand, in the
+    CompiledConstraints.checks format; bounds covering a feature's whole
+    range are left out.
+    """
+    checks = []
+    ranges = [("hcp", con.hcp_min, con.hcp_max),
+              ("total_points", con.tp_min, con.tp_max),
+              ("controls", con.controls_min, con.controls_max)]
+    ranges += [(LENGTH_FEATURES[s], con.length_min[s], con.length_max[s]) for s in Suit]
+    for feature, lo, hi in ranges:
+        full_lo, full_hi = FEATURE_RANGES[feature]
+        if lo > full_lo or hi < full_hi:
+            checks.append((feature, (lo, hi)))
+    if con.aces is not None and not set(range(5)) <= set(con.aces):
+        checks.append(("ace_count", frozenset(con.aces)))
+    if con.ace_topology is not None and not set(ACE_TOPOLOGIES) <= set(con.ace_topology):
+        checks.append(("ace_topology", frozenset(con.ace_topology)))
+    if con.balanced is not None:
+        checks.append(("balanced", con.balanced))
+    return checks
+
+def _scalar_feature(hand: Hand, feature: str):
+    if feature in LENGTH_FEATURES:
+        return hand.length(Suit(LENGTH_FEATURES.index(feature)))
+    if feature == "balanced":
+        return hand.is_balanced
+    return getattr(hand, feature)
+
+def _check_value(feature: str, arg, value) -> bool:
+    if feature == "balanced":
+        return value == arg
+    if isinstance(arg, frozenset):
+        return value in arg
+    return arg[0] <= value <= arg[1]
+
+@lru_cache(maxsize=None)
+def _point_pmf(points_by_rank: Tuple[int, ...]) -> Tuple[float, ...]:
+    """Distribution of the total of per-rank points over a random 13-card hand."""
+    # ways[k][t]: number of k-card subsets of the ranks seen so far with total t
+    top = 13 * max(points_by_rank)
+    ways = [[0] * (top + 1) for _ in range(14)]
+    ways[0][0] = 1
+    for points in points_by_rank:
+        for _ in range(4):
+            for k in range(13, 0, -1):
+                row, prev = ways[k], ways[k - 1]
+                for t in range(top, points - 1, -1):
+                    row[t] += prev[t - points]
+    total = comb(52, 13)
+    return tuple(w / total for w in ways[13])
+
+def _pass_probability(feature: str, arg) -> float:
+    """Rough probability that a random hand passes a check; orders the checks."""
+    if feature == "balanced":
+        return 0.476 if arg else 0.524
+    if feature == "ace_topology":
+        two_aces = _point_pmf(tuple(1 if r == Rank.ACE else 0 for r in Rank))[2]
+        return sum(1 - two_aces if t == "NONE" else two_aces / 3 for t in arg)
+    if feature in LENGTH_FEATURES:
+        pmf = [comb(13, n) * comb(39, 13 - n) / comb(52, 13) for n in range(14)]
+    elif feature == "ace_count":
+        pmf = _point_pmf(tuple(1 if r == Rank.ACE else 0 for r in Rank))
+    elif feature == "controls":
+        pmf = _point_pmf(tuple(max(0, r - 12) for r in Rank))
+    else:  # hcp; total points are close enough for ordering purposes
+        pmf = _point_pmf(tuple(max(0, r - 10) for r in Rank))
+    if isinstance(arg, frozenset):
+        return sum(pmf[v] for v in arg if 0 <= v < len(pmf))
+    lo, hi = arg
+    return sum(pmf[max(0, lo):max(0, hi + 1)])
+
+def _batch_columns(hands):
+    """Column accessor (by FEATURE_COLUMNS name) over a HandBatch or a feature matrix."""
+    if isinstance(hands, HandBatch):
+        return hands.column
+    features = np.asarray(hands)
+    return lambda name: features[:, FEATURE_COLUMNS.index(name)]
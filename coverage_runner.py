@@ -0,0 +1,132 @@
+import math
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+from bid.models import Call, CallType, CompactHand, DealGenerator, Seat, auction_over, np
+from bid.system import BiddingSystem
+from bid.sharding import run_sharded
+
+PASS = Call(CallType.PASS)
+
+class CoverageReport:
+    """
+    Coverage counters for uncontested auctions (North deals, North-South bid
+    with the system, East-West always pass). Reports from separate shards
+    combine with merge().
+    """
+    def __init__(self):
+        self.hands = 0
+        self.openings = Counter()        # dealer's first call
+        self.missed_by_hcp = Counter()   # HCP of dealer hands that passed with opening values
+        self.missed_examples: List[str] = []
+        self.unmatched = Counter()       # auction -> times our side had no rule to continue it
+        self.calls = 0
+        self.rule_calls = 0
+        self.elapsed = 0.0
+
+    def merge(self, other: 'CoverageReport') -> 'CoverageReport':
+        self.hands += other.hands
+        self.openings.update(other.openings)
+        self.missed_by_hcp.update(other.missed_by_hcp)
+        self.missed_examples = (self.missed_examples + other.missed_examples)[:5]
+        self.unmatched.update(other.unmatched)
+        self.calls += other.calls
+        self.rule_calls += other.rule_calls
+        return self
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.elapsed if self.elapsed else 0.0
+
+    def percent(self, count: int) -> float:
+        return count / self.hands * 100 if self.hands else 0.0
+
+    def format(self, top: int = 10) -> str:
+        lines = ["=== Opening Bid Distribution ==="]
+        for call, count in self.openings.most_common():
+            lines.append(f"{call}: {count} ({self.percent(count):.1f}%)")
+        passed = self.openings["PASS"]
+        lines.append(f"\nTotal Opened: {self.hands - passed} ({self.percent(self.hands - passed):.1f}%)")
+        lines.append(f"Total Passed: {passed} ({self.percent(passed):.1f}%)")
+
+        lines.append("\n=== Missed Opportunities (Passed with opening values) ===")
+        if self.missed_by_hcp:
+            lines.append(f"Found {sum(self.missed_by_hcp.values())} hands that Passed.")
+            for i, hand in enumerate(self.missed_examples):
+                lines.append(f"{i + 1}. {hand}")
+            lines.append("\nDistribution of Missed HCP:")
+            for hcp in sorted(self.missed_by_hcp):
+                lines.append(f"HCP {hcp}: {self.missed_by_hcp[hcp]} hands")
+        else:
+            lines.append("Great! No hands with opening values were passed.")
+
+        lines.append(f"\n=== Unmatched Auctions (top {top}) ===")
+        for auction, count in self.unmatched.most_common(top):
+            lines.append(f"{auction}: {count}")
+        if self.calls:
+            lines.append(f"\nCalls made by a rule: {self.rule_calls}/{self.calls} ({self.rule_calls / self.calls * 100:.1f}%)")
+        lines.append(f"{self.hands} hands in {self.elapsed:.2f}s ({self.hands_per_second:,.0f} hands/sec)")
+        return "\n".join(lines)
+
+def cover_deal(system: BiddingSystem,
+               deal: Dict[Seat, CompactHand],
+               report: CoverageReport,
+               depth: int = 4,
+               open_hcp: int = 11):
+    """Bid one deal for North-South (up to `depth` calls) and record it in `report`."""
+    history: List[Call] = []
+    our_calls = 0
+    report.hands += 1
+    while our_calls < depth and not auction_over(history):
+        seat = Seat(len(history) % 4)
+        if seat not in (Seat.NORTH, Seat.SOUTH):
+            history.append(PASS)
+            continue
+        hand = deal[seat]
+        rule = system.get_bid(history, hand)
+        call = rule.call if rule else PASS
+        report.calls += 1
+        if rule:
+            report.rule_calls += 1
+        if not history:
+            report.openings[str(call)] += 1
+            if rule is None and hand.hcp >= open_hcp:
+                report.missed_by_hcp[hand.hcp] += 1
+                if len(report.missed_examples) < 5:
+                    report.missed_examples.append(f"{hand.cards} (HCP: {hand.hcp})")
+        elif rule is None and any(c.type != CallType.PASS for c in history):
+            report.unmatched[" ".join(str(c) for c in history)] += 1
+        history.append(call)
+        our_calls += 1
+
+def _run_shard(system: BiddingSystem, seed, num_hands: int, depth: int, open_hcp: int) -> CoverageReport:
+    report = CoverageReport()
+    start = time.perf_counter()
+    for deal in DealGenerator(seed).deals(num_hands):
+        cover_deal(system, deal, report, depth, open_hcp)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+def run_coverage(dsl_path: str,
+                 num_hands: int = 1000,
+                 workers: Optional[int] = None,
+                 seed: Optional[int] = None,
+                 shard_size: int = 20000,
+                 depth: int = 4,
+                 open_hcp: int = 11) -> CoverageReport:
+    """
+    Monte Carlo coverage of a .dsl system over `num_hands` random deals,
+    sharded over a process pool (workers=1 runs in-process). Each worker
+    loads the compiled system once; each shard deals from its own
+    SeedSequence child, so a given seed and shard_size reproduce the run.
+    """
+    shards = max(1, math.ceil(num_hands / shard_size))
+    sizes = [num_hands // shards + (i < num_hands % shards) for i in range(shards)]
+    seeds = np.random.SeedSequence(seed).spawn(shards)
+
+    report = CoverageReport()
+    start = time.perf_counter()
+    run_sharded([dsl_path], [(shard_seed, size, depth, open_hcp) for shard_seed, size in zip(seeds, sizes)],
+                _run_shard, report.merge, workers)
+    report.elapsed = time.perf_counter() - start
+    return report
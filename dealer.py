@@ -0,0 +1,321 @@
+import random
+from itertools import product
+from math import comb
+from typing import Dict, Iterator, List, Optional, Tuple
+from bid.models import ACE_BIT, BALANCED_SHAPES, CompactHand, Rank, Seat, Suit, ace_topology_of
+from bid.constraints import HandConstraints
+
+HONOR_RANKS = (Rank.ACE, Rank.KING, Rank.QUEEN, Rank.JACK)
+SPOT_RANKS = tuple(r for r in Rank if r < Rank.JACK)
+# Honor-placement steps spent on one sampled shape before drawing another.
+# Placements that exist are found in a few dozen steps; proving that a
+# shape has none can take millions.
+PLACEMENT_BUDGET = 500
+
+class ConstrainedDealer:
+    """
+    Deals complete deals consistent with per-seat HandConstraints (e.g. the
+    output of Engine.estimate_deal) without rejection sampling whole hands.
+
+    1. Shape: each seat draws a suit-length pattern from its length_min /
+       length_max box (and SHAPE), weighted by how many hands have it, so
+       that the four patterns add up to 13 cards per suit. Patterns whose
+       suits cannot hold the seat's HCP/TP range are dropped up front.
+    2. Honors: the sixteen A/K/Q/J are placed highest first into the free
+       slots of each suit, skipping seats that would overshoot their
+       HCP/TP/controls/aces maximum or leave some seat unable to reach its
+       minimum (TP counts shortness, less one per short suit given an
+       honor). Aces go first: an ace that leaves some seat no count in its
+       ACES set is not placed, and once all four are down every seat's ace
+       count and topology are checked. Dead ends backtrack.
+    3. Spots: the remaining 2-T of every suit fill the remaining slots.
+
+    Every constraint is built into steps 1-2, so nothing is dealt and then
+    thrown away. What is left of rejection is cheap: a shape draw whose
+    last seat gets a disallowed pattern is redrawn before any card is
+    placed, and so is a shape whose honors are not placed within
+    PLACEMENT_BUDGET steps, which bounds the work per attempt. After
+    max_attempts failed attempts deal() tries every shape combination
+    without a budget, so it raises ValueError only when no deal satisfies
+    the constraints; the constructor rejects most such inputs up front.
+    The distribution is close to, but not exactly, uniform over consistent
+    deals.
+    """
+    def __init__(self, constraints: Dict[Seat, HandConstraints], seed=None, max_attempts: int = 10000):
+        self.constraints = {seat: constraints.get(seat) or HandConstraints() for seat in Seat}
+        self.rng = random.Random(seed)
+        self.max_attempts = max_attempts
+        self.ace_counts = [_ace_counts(self.constraints[seat]) for seat in Seat]
+        self.limits = [_honor_limits(self.constraints[seat], aces) for seat, aces in zip(Seat, self.ace_counts)]
+        # Shapes whose suits cannot hold the seat's HCP/TP/... even with every honor to choose from are dropped.
+        self.patterns = {seat: [p for p in _shape_patterns(self.constraints[seat])
+                                if self._shape_fits(p, self.limits[seat])] for seat in Seat}
+        for seat, patterns in self.patterns.items():
+            if not patterns:
+                raise ValueError(f"No hand shape satisfies the constraints for {seat}: {self.constraints[seat]}")
+        # The deck holds 40 HCP, 12 controls and 4 aces.
+        for i, total in enumerate((40, 12, 4)):
+            if (sum(lo[i] for lo, _ in self.limits) > total or sum(min(hi[i], total) for _, hi in self.limits) < total):
+                raise ValueError(f"The seats' {('HCP', 'control', 'ace')[i]} ranges cannot add up to {total}")
+        self.topologies = [self.constraints[seat].ace_topology for seat in Seat]
+        # Honors alone (any shape, TP aside) must fit, or no shape will.
+        relaxed = [(lo[:3] + (0,), hi[:3] + (50,)) for lo, hi in self.limits]
+        if self._place_honors([[13] * 4 for _ in Seat], [[False] * 4 for _ in Seat], [0] * 4, relaxed) is None:
+            raise ValueError("No placement of the honors satisfies the HCP, controls and ace constraints")
+        # Most constrained seats choose their shape first; the last one takes what is left.
+        self.seat_order = sorted(Seat, key=lambda s: len(self.patterns[s]))
+        self.last_patterns = set(self.patterns[self.seat_order[-1]])
+
+    def deal(self) -> Dict[Seat, CompactHand]:
+        for _ in range(self.max_attempts):
+            shapes = self._sample_shapes()
+            if shapes is not None:
+                deal = self._sample_cards(shapes, PLACEMENT_BUDGET)
+                if deal is not None:
+                    return deal
+        return self._search()
+
+    def deals(self, n: Optional[int] = None) -> Iterator[Dict[Seat, CompactHand]]:
+        """Stream n deals (endlessly if n is None)."""
+        count = 0
+        while n is None or count < n:
+            yield self.deal()
+            count += 1
+
+    def _sample_shapes(self) -> Optional[Dict[Seat, Tuple[int, ...]]]:
+        remaining = [13, 13, 13, 13]
+        shapes = {}
+        for seat in self.seat_order[:-1]:
+            options = []
+            weights = []
+            for pattern in self.patterns[seat]:
+                weight = 1
+                for s in range(4):
+                    if pattern[s] > remaining[s]:
+                        weight = 0
+                        break
+                    weight *= comb(remaining[s], pattern[s])
+                if weight:
+                    options.append(pattern)
+                    weights.append(weight)
+            if not options:
+                return None
+            pattern = self.rng.choices(options, weights)[0]
+            shapes[seat] = pattern
+            for s in range(4):
+                remaining[s] -= pattern[s]
+        last = tuple(remaining)
+        if last not in self.last_patterns:
+            return None
+        shapes[self.seat_order[-1]] = last
+        return shapes
+
+    def _search(self) -> Dict[Seat, CompactHand]:
+        """Try every shape combination (in random order) until one admits a deal."""
+        order = self.seat_order
+        shapes: Dict[Seat, Tuple[int, ...]] = {}
+
+        def visit(depth: int, remaining: Tuple[int, ...]) -> Optional[Dict[Seat, CompactHand]]:
+            if depth == 3:
+                if remaining not in self.last_patterns:
+                    return None
+                shapes[order[3]] = remaining
+                return self._sample_cards(shapes)
+            patterns = [p for p in self.patterns[order[depth]] if all(p[s] <= remaining[s] for s in range(4))]
+            self.rng.shuffle(patterns)
+            for pattern in patterns:
+                shapes[order[depth]] = pattern
+                deal = visit(depth + 1, tuple(remaining[s] - pattern[s] for s in range(4)))
+                if deal is not None:
+                    return deal
+            return None
+
+        deal = visit(0, (13, 13, 13, 13))
+        if deal is None:
+            raise ValueError("No deal satisfies the constraints")
+        return deal
+
+    def _sample_cards(self, shapes: Dict[Seat, Tuple[int, ...]],
+                      budget: Optional[int] = None) -> Optional[Dict[Seat, CompactHand]]:
+        """Honors by backtracking, then spots; None when no honor placement fits the shapes."""
+        free = [list(shapes[seat]) for seat in Seat]
+        # TP starts at the shape's shortness points; the first honor in a
+        # short suit then adds one point less than its HCP.
+        masks = self._place_honors(free, [[length < 3 for length in shapes[seat]] for seat in Seat],
+                                   [_shortness(shapes[seat]) for seat in Seat], self.limits, budget)
+        if masks is None:
+            return None
+        for suit in range(4):
+            spots = list(SPOT_RANKS)
+            self.rng.shuffle(spots)
+            for seat in range(4):
+                for _ in range(free[seat][suit]):
+                    masks[seat][suit] |= 1 << (spots.pop() - 2)
+        return {seat: CompactHand(tuple(masks[seat])) for seat in Seat}
+
+    def _place_honors(self, free: List[List[int]], short: List[List[bool]], tp_start: List[int],
+                      limits, budget: Optional[int] = None) -> Optional[List[List[int]]]:
+        """
+        Place A/K/Q/J (highest first) into the free slots, backtracking from
+        dead ends. Returns per-seat suit masks of the honors, or None when no
+        placement keeps every seat in its limits (or none was found within
+        `budget` search steps). `free` is updated.
+        """
+        rng = self.rng
+        masks = [[0, 0, 0, 0] for _ in Seat]
+        totals = [[0, 0, 0, tp] for tp in tp_start]  # per seat: hcp, controls, aces, tp
+        honors = [(rank, suit) for rank in HONOR_RANKS for suit in range(4)]
+        steps = [budget]
+
+        def place(i: int) -> bool:
+            if i <= 4:
+                # Aces come first: each seat's count must still be able to end in its set.
+                if not self._ace_counts_open(totals, 4 - i):
+                    return False
+                if i == 4 and not self._topologies_allowed(masks):
+                    return False  # all aces are placed
+            if i == len(honors):
+                return True
+            if steps[0] is not None:
+                steps[0] -= 1
+                if steps[0] < 0:
+                    return False
+            rank, suit = honors[i]
+            bit = 1 << (rank - 2)
+            # Unplaced honors of each suit, highest first.
+            rest = [[r for r, s in honors[i + 1:] if s == suit_] for suit_ in range(4)]
+            gains = []
+            for seat in range(4):
+                if not free[seat][suit]:
+                    continue
+                points = rank - 10
+                tp = points - (short[seat][suit] and not masks[seat][suit])
+                gain = (points, max(0, rank - 12), rank == Rank.ACE, tp)
+                total, maxima = totals[seat], limits[seat][1]
+                if any(total[k] + gain[k] > maxima[k] for k in range(4)):
+                    continue
+                gains.append((seat, gain))
+            # Weighted random order (by free slots): the first seat tried is a weighted draw.
+            gains.sort(key=lambda item: -rng.random() ** (1 / free[item[0]][suit]))
+            for seat, gain in gains:
+                total = totals[seat]
+                for k in range(4):
+                    total[k] += gain[k]
+                free[seat][suit] -= 1
+                masks[seat][suit] |= bit
+                if self._minimums_reachable(rest, free, totals, limits, masks, short) and place(i + 1):
+                    return True
+                for k in range(4):
+                    total[k] -= gain[k]
+                free[seat][suit] += 1
+                masks[seat][suit] ^= bit
+            return False
+
+        return masks if place(0) else None
+
+    def _ace_counts_open(self, totals: List[List[int]], unplaced: int) -> bool:
+        """Can every seat still end with an allowed number of aces, `unplaced` aces to go?"""
+        for seat, allowed in enumerate(self.ace_counts):
+            aces = totals[seat][2]
+            if not any(aces <= n <= aces + unplaced for n in allowed):
+                return False
+        return True
+
+    def _topologies_allowed(self, masks: List[List[int]]) -> bool:
+        for seat, allowed in enumerate(self.topologies):
+            if allowed is not None:
+                aces = [Suit(s) for s in range(4) if masks[seat][s] & ACE_BIT]
+                if ace_topology_of(aces) not in allowed:
+                    return False
+        return True
+
+    @classmethod
+    def _shape_fits(cls, pattern: Tuple[int, ...], limits) -> bool:
+        all_honors = [list(HONOR_RANKS)] * 4
+        return cls._minimums_reachable(all_honors, [list(pattern)], [[0, 0, 0, _shortness(pattern)]], [limits],
+                                       [[0] * 4], [[length < 3 for length in pattern]])
+
+    @staticmethod
+    def _minimums_reachable(rest, free, totals, limits, masks, short) -> bool:
+        """
+        Can every seat still end inside its HCP/controls/aces/TP range with
+        the unplaced honors (rest[suit], highest first)? Necessary, not
+        sufficient: place() backtracks on what this lets through.
+        """
+        need_hcp = need_ctrl = 0
+        for seat in range(len(totals)):
+            (hcp_min, ctrl_min, aces_min, tp_min), (hcp_max, _, _, tp_max) = limits[seat]
+            hcp, ctrl, aces, tp = totals[seat]
+            seat_free = free[seat]
+            # Short suits with room and no honor yet: their first honor adds one TP less than its HCP.
+            open_short = [s for s in range(4) if short[seat][s] and seat_free[s] and not masks[seat][s]]
+            if tp + max(0, hcp_min - hcp) - len(open_short) > tp_max:
+                return False
+            short_hcp, short_tp = hcp_min - hcp, tp_min - tp
+            if short_hcp <= 0 and short_tp <= 0 and ctrl_min <= ctrl and aces_min <= aces:
+                continue
+            # Best case per suit: the seat takes the top honors that fit its free slots.
+            reach_hcp = reach_ctrl = reach_aces = 0
+            plain = 0           # HCP that would count fully as TP
+            short_caps = []     # HCP reachable in each open short suit
+            for s in range(4):
+                top = rest[s][:seat_free[s]]
+                points = sum(r - 10 for r in top)
+                reach_hcp += points
+                reach_ctrl += sum(max(0, r - 12) for r in top)
+                reach_aces += bool(top) and top[0] == Rank.ACE
+                if s in open_short:
+                    short_caps.append(points)
+                else:
+                    plain += points
+            if reach_hcp < short_hcp or reach_ctrl < ctrl_min - ctrl or reach_aces < aces_min - aces:
+                return False
+            if short_tp > 0:
+                # Most TP within the HCP headroom: plain suits first, then short suits at one point off.
+                budget = hcp_max - hcp
+                best = min(plain, budget)
+                budget -= best
+                for cap in sorted(short_caps, reverse=True):
+                    if budget <= 0:
+                        break
+                    used = min(cap, budget)
+                    best += max(0, used - 1)
+                    budget -= used
+                if best < short_tp:
+                    return False
+            need_hcp += max(0, short_hcp, short_tp)
+            need_ctrl += max(0, ctrl_min - ctrl)
+        return (need_hcp <= sum(r - 10 for suit in rest for r in suit) and
+                need_ctrl <= sum(max(0, r - 12) for suit in rest for r in suit))
+
+def _shortness(pattern: Tuple[int, ...]) -> int:
+    """Distribution points of a shape before short honors: void 3, singleton 2, doubleton 1."""
+    return sum(3 - length for length in pattern if length < 3)
+
+def _shape_patterns(con: HandConstraints) -> List[Tuple[int, ...]]:
+    """Suit-length patterns (C, D, H, S) allowed by a constraint."""
+    patterns = []
+    ranges = [range(con.length_min[s], min(con.length_max[s], 13) + 1) for s in Suit]
+    for pattern in product(*ranges):
+        if sum(pattern) != 13:
+            continue
+        if con.balanced is not None and (sorted(pattern) in BALANCED_SHAPES) != con.balanced:
+            continue
+        patterns.append(pattern)
+    return patterns
+
+def _ace_counts(con: HandConstraints) -> frozenset:
+    """Ace counts a seat may hold: its ACES set, narrowed to two by an ace topology other than NONE."""
+    aces = set(con.aces) if con.aces is not None else set(range(5))
+    if con.ace_topology is not None and "NONE" not in con.ace_topology:
+        aces &= {2}  # every other topology has exactly two aces
+    return frozenset(aces)
+
+def _honor_limits(con: HandConstraints,
+                  aces: frozenset) -> Tuple[Tuple[int, int, int, int], Tuple[int, int, int, int]]:
+    """
+    ((hcp, controls, aces, tp) minimums, (hcp, controls, aces, tp) maximums).
+    The ace range spans the allowed counts; place() enforces the set itself.
+    """
+    return ((con.hcp_min, con.controls_min, min(aces, default=5), con.tp_min),
+            (con.hcp_max, con.controls_max, max(aces, default=-1), con.tp_max))
@@ -0,0 +1,777 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from bid.models import SUIT_MASK, CompactHand, Seat, Strain
+from bid.sharding import run_sharded
+
+try:
+    from endplay import dds
+    from endplay.types import Deal as DdsDeal, Denom
+except ImportError:  # full deals then go through the pure Python DoubleDummySolver
+    dds = None
+
+# Trick table of a deal, indexed [declarer][strain]: 4 seats x 5 strains (C, D, H, S, NT).
+TrickTable = List[List[int]]
+
+# DDS solves up to 40 full tables per CalcAllTables call, spread over its own threads.
+DDS_BATCH = 40
+
+class DoubleDummySolver:
+    """
+    Double-dummy trick counts for one deal (any number of cards per hand, as
+    long as all four hands hold the same number) by alpha-beta search over
+    the card play.
+
+    - Every solve is a sequence of null-window searches "can North-South
+      take t more tricks?", binary-searching t (or stepping from a guess).
+    - A transposition table per strain keeps lower/upper bounds on the
+      North-South tricks of positions at trick boundaries. Entries only
+      record the cards that decided them (see _Search), so one entry covers
+      many positions, and the bounds hold whichever side declares, so all
+      four declarers of a strain share the table.
+    - Touching cards (once played cards are ignored) are equivalent and
+      only the top one is tried; once a low card has failed without its
+      rank mattering, the lower cards of its suit are skipped too. Moves
+      are ordered so that cutoffs come early: leads by weights after the
+      DDS solver's (safe leads in short suits for the opponents, cashing
+      winners, leads towards partner), with the last lead that cut off at
+      the same trick tried first; followers win as cheaply as possible,
+      else play low, and play low when partner is already winning;
+      discards come from long suits, keeping guarded top cards.
+    - Before any card of a trick is played, the search is cut short by
+      bounds: top tricks the side on lead can cash, and trumps above all of
+      the other side's. When the trick being played decides the search,
+      a second hand whose side holds the top card of the suit led (or can
+      ruff it safely) settles it at once.
+
+    This is pure Python and too slow to score simulations with: the table
+    of a full 13-card deal takes from about 15 seconds to five minutes and
+    over a million searched trick-start positions (see `nodes`). Short
+    endings solve in milliseconds. solve_deal and solve_deals hand full
+    deals to DDS (through the endplay package) when it is installed.
+    """
+    def __init__(self, deal: Dict[Seat, object]):
+        self.hands = [_deck_mask(deal[seat]) for seat in Seat]
+        sizes = {h.bit_count() for h in self.hands}
+        if len(sizes) != 1:
+            raise ValueError("All four hands must hold the same number of cards")
+        self.total_tricks = sizes.pop()
+        self._searches: Dict[Strain, _Search] = {}
+        self._ns_tricks: Dict[Tuple[Strain, Seat], int] = {}
+
+    @property
+    def nodes(self) -> int:
+        """Trick-start positions searched so far (a measure of work)."""
+        return sum(search.nodes for search in self._searches.values())
+
+    def tricks(self, strain: Strain, declarer: Seat) -> int:
+        """Tricks taken by the declarer's side, declarer's left-hand opponent on lead."""
+        ns = self._ns_tricks_with_lead(strain, Seat((declarer + 1) % 4))
+        return ns if declarer % 2 == 0 else self.total_tricks - ns
+
+    def table(self) -> TrickTable:
+        return [[self.tricks(strain, declarer) for strain in Strain] for declarer in Seat]
+
+    def _ns_tricks_with_lead(self, strain: Strain, leader: Seat) -> int:
+        key = (strain, leader)
+        if key in self._ns_tricks:
+            return self._ns_tricks[key]
+        search = self._searches.get(strain)
+        if search is None:
+            search = self._searches[strain] = _Search(None if strain == Strain.NT else int(strain))
+        # The other opening leads of the same strain are usually within a trick or so.
+        guess = next((n for (s, _), n in self._ns_tricks.items() if s == strain), None)
+        hands = list(self.hands)
+        lo, hi = 0, self.total_tricks
+        if guess is not None:
+            if search.ns_can_take(hands, leader, guess)[0]:
+                lo = guess
+                while lo < hi and search.ns_can_take(hands, leader, lo + 1)[0]:
+                    lo += 1
+            else:
+                lo = guess - 1
+                while lo > 0 and not search.ns_can_take(hands, leader, lo)[0]:
+                    lo -= 1
+            hi = lo
+        while lo < hi:
+            target = (lo + hi + 1) // 2
+            if search.ns_can_take(hands, leader, target)[0]:
+                lo = target
+            else:
+                hi = target - 1
+        self._ns_tricks[key] = lo
+        return lo
+
+class _Search:
+    """
+    Null-window searches in one strain, sharing one transposition table.
+
+    Besides its answer, every search returns the cards that answer depends
+    on, as a deck mask: cards that won a trick by outranking another card
+    of their suit, and the top cards a cashing bound counted. A table entry
+    stores who holds the top cards of each suit down to the lowest of them,
+    plus the suit lengths of every hand, so one entry serves every position
+    that only differs in the spot cards below (partition search).
+    """
+    def __init__(self, trump: Optional[int]):
+        self.trump = trump
+        # (leader, suit lengths) -> a trie over the suits in turn, each level
+        # {top count: {top holders: next level}}, ending in [lo, hi] North-South tricks
+        self.table: Dict[tuple, dict] = {}
+        self.nodes = 0
+        # Remaining tricks -> the last lead that cut the search off at that trick.
+        self.killers: Dict[int, int] = {}
+
+    def ns_can_take(self, hands: List[int], leader: int, target: int) -> Tuple[bool, int]:
+        """Can North-South take `target` of the remaining tricks, `leader` on lead?"""
+        if target <= 0:
+            return True, 0
+        remaining = hands[leader].bit_count()
+        if target > remaining:
+            return False, 0
+        if remaining == 1:
+            return self._last_trick(hands, leader)
+
+        h0, h1, h2, h3 = hands
+        profiles = [_suit_profile(((h0 >> shift) & SUIT_MASK, (h1 >> shift) & SUIT_MASK,
+                                   (h2 >> shift) & SUIT_MASK, (h3 >> shift) & SUIT_MASK))
+                    for shift in (0, 13, 26, 39)]
+        bucket_key = (leader, profiles[0][0], profiles[1][0], profiles[2][0], profiles[3][0])
+        bucket = self.table.get(bucket_key)
+        if bucket is None:
+            bucket = self.table[bucket_key] = {}
+        else:
+            found = _probe(bucket, (profiles[0][1], profiles[1][1], profiles[2][1], profiles[3][1]), target)
+            if found is not None:
+                return found[0], _pattern_cards(found[1], profiles)
+
+        # Top tricks the leader can cash bound either side.
+        cashable, relevant = self._cashable(hands, leader)
+        if leader % 2 == 0:
+            if cashable >= target:
+                return True, relevant
+        elif remaining - cashable < target:
+            return False, relevant
+        if self.trump is not None:
+            # Trumps that outrank all of the other side's make a trick each.
+            ns, ew, relevant = self._sure_trumps(hands)
+            if ns >= target or remaining - ew < target:
+                return ns >= target, relevant
+
+        self.nodes += 1
+        result, relevant = self._play(hands, leader, 0, 0, leader, -1, False, h0 | h1 | h2 | h3, target)
+        counts = _top_counts(relevant, profiles)
+        node = bucket
+        for suit in range(3):
+            by_holders = node.setdefault(counts[suit], {})
+            node = by_holders.setdefault(profiles[suit][1] & _HOLDER_MASKS[counts[suit]], {})
+        by_holders = node.setdefault(counts[3], {})
+        key = profiles[3][1] & _HOLDER_MASKS[counts[3]]
+        bounds = by_holders.get(key)
+        if bounds is None:
+            bounds = by_holders[key] = [0, remaining]
+        if result:
+            bounds[0] = max(bounds[0], target)
+        else:
+            bounds[1] = min(bounds[1], target - 1)
+        return result, relevant
+
+    def _play(self, hands, seat, count, led, win_seat, win_card, by_rank, out, target) -> Tuple[bool, int]:
+        """
+        `seat` plays card number `count` of the trick. (win_seat, win_card) is
+        winning so far, by_rank if it outranked another card of its suit.
+        """
+        if count == 4:
+            result, relevant = self.ns_can_take(hands, win_seat, target - (win_seat % 2 == 0))
+            if by_rank:
+                relevant |= 1 << win_card
+            return result, relevant
+
+        hand = hands[seat]
+        ns_to_play = seat % 2 == 0
+        next_seat = (seat + 1) % 4
+        if count == 1 and (target == 1 if ns_to_play else target == hand.bit_count()):
+            # One trick settles it: is this one safe for the side of the second hand?
+            wins = self._second_hand_wins(hands, seat, led, win_card)
+            if wins is not None:
+                return ns_to_play, wins
+        trump = self.trump
+        relevant = 0
+        floors = [0, 0, 0, 0]
+        moves = self._moves(hands, seat, count, led, win_seat, win_card, out)
+        if count == 0:
+            killer = self.killers.get(hand.bit_count())
+            if killer is not None and killer in moves and moves[0] != killer:
+                moves.remove(killer)
+                moves.insert(0, killer)
+        for card in moves:
+            suit = card // 13
+            if card % 13 < floors[suit]:
+                continue
+            hands[seat] = hand & ~(1 << card)
+            if count == 0:
+                result, found = self._play(hands, next_seat, 1, suit, seat, card, False, out, target)
+            elif suit == win_card // 13:
+                if card > win_card:
+                    result, found = self._play(hands, next_seat, count + 1, led, seat, card, True, out, target)
+                else:
+                    result, found = self._play(hands, next_seat, count + 1, led, win_seat, win_card, True, out, target)
+            elif suit == trump:
+                result, found = self._play(hands, next_seat, count + 1, led, seat, card, False, out, target)
+            else:
+                result, found = self._play(hands, next_seat, count + 1, led, win_seat, win_card, by_rank, out, target)
+            hands[seat] = hand
+            if (found >> (13 * suit)) & ((2 << (card % 13)) - 1):
+                # A card this low matters, so the equivalent cards below it do too.
+                found |= 1 << _run_bottom(card, hand, out)
+            if result == ns_to_play:
+                if count == 0:
+                    self.killers[hand.bit_count()] = card
+                return result, found
+            relevant |= found
+            if not floors[suit]:
+                # Nothing up to the lowest relevant card of the suit mattered,
+                # so the cards below it would fail the same way.
+                cards = (relevant >> (13 * suit)) & SUIT_MASK
+                lowest = (cards & -cards).bit_length() - 1 if cards else 13
+                if card % 13 < lowest:
+                    floors[suit] = lowest
+        return not ns_to_play, relevant
+
+    def _second_hand_wins(self, hands, seat, led, lead_card) -> Optional[int]:
+        """
+        The card that wins the trick for the side of `seat` (second to play)
+        whatever the others do, 0 if a ruff does, or None if it is not sure.
+        """
+        base = 13 * led
+        third = hands[(seat + 1) % 4]
+        third_led = (third >> base) & SUIT_MASK
+        trump = self.trump
+        if trump is not None and trump != led:
+            trump_shift = 13 * trump
+            third_ruffs = not third_led and (third >> trump_shift) & SUIT_MASK
+            for hand in (hands[seat], hands[(seat + 2) % 4]):
+                if not (hand >> base) & SUIT_MASK and (hand >> trump_shift) & SUIT_MASK:
+                    return None if third_ruffs else 0
+            if third_ruffs:
+                return None
+        ours = ((hands[seat] | hands[(seat + 2) % 4]) >> base) & SUIT_MASK
+        top = ours.bit_length() - 1
+        if top > lead_card - base and (1 << top) > third_led:
+            return 1 << (base + top)
+        return None
+
+    def _beats(self, card: int, win_card: int) -> bool:
+        suit = card // 13
+        if suit == win_card // 13:
+            return card > win_card
+        return suit == self.trump
+
+    def _moves(self, hands, seat, count, led, win_seat, win_card, out) -> List[int]:
+        """Candidate cards, the top one of each run of equivalent cards, likely best first."""
+        hand = hands[seat]
+        if count:
+            base = 13 * led
+            mine = (hand >> base) & SUIT_MASK
+            if mine:
+                beat = win_card - base if win_card // 13 == led else 13
+                return [base + rank for rank in
+                        _follow_order(mine, (out >> base) & SUIT_MASK, beat, win_seat % 2 == seat % 2)]
+            return self._discards(hand, seat, win_seat, win_card, out)
+
+        # Leading: by the weight of each lead (see _nt_lead_weights, _trump_lead_weights).
+        partner = hands[(seat + 2) % 4]
+        lho = hands[(seat + 1) % 4]
+        rho = hands[(seat + 3) % 4]
+        remaining = hand.bit_count()
+        trump = self.trump
+        if trump is not None and (out >> (13 * trump)) & SUIT_MASK:
+            shift = 13 * trump
+            trumps = tuple((h >> shift) & SUIT_MASK for h in (hand, partner, lho, rho))
+        else:
+            trumps = None
+        keyed = []
+        for base in (0, 13, 26, 39):
+            mine = (hand >> base) & SUIT_MASK
+            if not mine:
+                continue
+            suits = (mine, (partner >> base) & SUIT_MASK, (lho >> base) & SUIT_MASK, (rho >> base) & SUIT_MASK)
+            if trumps is None:
+                weights = _nt_lead_weights(*suits, remaining)
+            else:
+                weights = _trump_lead_weights(*suits, remaining, base == 13 * trump, trumps)
+            keyed.extend((-weight, base + rank) for weight, rank in weights)
+        keyed.sort()
+        return [card for _, card in keyed]
+
+    def _discards(self, hand, seat, win_seat, win_card, out) -> List[int]:
+        """Candidates when void in the suit led: ruffs (cheapest first), then discards (see _discard_weight)."""
+        trump = self.trump
+        ruffs = []
+        discards = []
+        for suit in range(4):
+            base = 13 * suit
+            mine = (hand >> base) & SUIT_MASK
+            if not mine:
+                continue
+            ranks = _sequence_tops(mine, (out >> base) & SUIT_MASK)
+            if suit == trump:
+                for rank in reversed(ranks):
+                    card = base + rank
+                    if self._beats(card, win_card):
+                        ruffs.append(card)
+                    else:
+                        discards.append((-100, rank, card))
+            else:
+                weight = _discard_weight(mine, (out >> base) & SUIT_MASK)
+                discards.extend((weight, rank, base + rank) for rank in reversed(ranks))
+        discards.sort(reverse=True, key=lambda item: (item[0], -item[1]))
+        discards = [card for _, _, card in discards]
+        if win_seat % 2 == seat % 2:
+            # Partner is winning: no need to ruff.
+            return discards + ruffs
+        return ruffs + discards
+
+    def _cashable(self, hands: List[int], leader: int) -> Tuple[int, int]:
+        """
+        Top tricks the leader's side can run off without giving up the lead
+        (the leader's own, or the partner's after crossing to one of them),
+        and the cards counted.
+        """
+        out = hands[0] | hands[1] | hands[2] | hands[3]
+        hand = hands[leader]
+        partner = hands[(leader + 2) % 4]
+        opponents = (hands[(leader + 1) % 4], hands[(leader + 3) % 4])
+        own, own_cards, _ = self._top_tricks(hand, partner, opponents, out)
+        for suit in range(4):
+            shift = 13 * suit
+            if not (hand >> shift) & SUIT_MASK:
+                continue
+            top = 1 << (((out >> shift) & SUIT_MASK).bit_length() - 1 + shift)
+            if partner & top:
+                tricks, cards, by_suit = self._top_tricks(partner, hand, opponents, out)
+                if by_suit[suit] and tricks > own:
+                    return tricks, cards
+        return own, own_cards
+
+    def _top_tricks(self, hand: int, partner: int, opponents, out: int) -> Tuple[int, int, List[int]]:
+        """
+        Top cards `hand` can cash one after another, as (tricks, cards, tricks
+        per suit). A side suit only counts as many rounds as both opponents
+        can follow, unless they are out of trumps, and none if partner holds
+        nothing but trumps (it would have to ruff and take the lead).
+        """
+        trump = self.trump
+        limits = [13, 13, 13, 13]
+        if trump is not None:
+            trump_shift = 13 * trump
+            for opponent in opponents:
+                if (opponent >> trump_shift) & SUIT_MASK:
+                    for suit in range(4):
+                        if suit != trump:
+                            limits[suit] = min(limits[suit], ((opponent >> (13 * suit)) & SUIT_MASK).bit_count())
+            if not partner & ~(SUIT_MASK << trump_shift):
+                limits = [13 if suit == trump else 0 for suit in range(4)]
+        tricks = 0
+        cards = 0
+        by_suit = [0, 0, 0, 0]
+        for suit in range(4):
+            shift = 13 * suit
+            mine = (hand >> shift) & SUIT_MASK
+            if not mine:
+                continue
+            run = _top_run(mine, (out >> shift) & SUIT_MASK)
+            count = min(len(run) - 1, limits[suit])
+            if count:
+                by_suit[suit] = count
+                tricks += count
+                cards |= run[count] << shift
+        return tricks, cards, by_suit
+
+    def _sure_trumps(self, hands: List[int]) -> Tuple[int, int, int]:
+        """
+        Trump tricks each side is sure of, as (North-South, East-West, cards
+        that decide it): a hand's trumps above every trump of the other side
+        win a trick each (the partner's may fall on the same trick).
+        """
+        shift = 13 * self.trump
+        holdings = [(hand >> shift) & SUIT_MASK for hand in hands]
+        ns_top = (holdings[0] | holdings[2]).bit_length()
+        ew_top = (holdings[1] | holdings[3]).bit_length()
+        # Above the other side's top trump: bits from its rank + 1 upwards.
+        ns = max((holdings[0] >> ew_top).bit_count(), (holdings[2] >> ew_top).bit_count())
+        ew = max((holdings[1] >> ns_top).bit_count(), (holdings[3] >> ns_top).bit_count())
+        relevant = 0
+        if ns and ew_top:
+            relevant |= 1 << (ew_top - 1)
+        if ew and ns_top:
+            relevant |= 1 << (ns_top - 1)
+        return ns, ew, relevant << shift
+
+    def _last_trick(self, hands: List[int], leader: int) -> Tuple[bool, int]:
+        win_seat, win_card = leader, hands[leader].bit_length() - 1
+        by_rank = False
+        for i in range(1, 4):
+            seat = (leader + i) % 4
+            card = hands[seat].bit_length() - 1
+            if card // 13 == win_card // 13:
+                by_rank = True
+                if card > win_card:
+                    win_seat, win_card = seat, card
+            elif card // 13 == self.trump:
+                win_seat, win_card, by_rank = seat, card, False
+        return win_seat % 2 == 0, (1 << win_card) if by_rank else 0
+
+@lru_cache(maxsize=1 << 16)
+def _top_run(mine: int, rest: int) -> Tuple[int, ...]:
+    """
+    The cards of `mine` that are the highest still out, as masks of the top
+    0, 1, 2... of them (so len - 1 is how many there are).
+    """
+    run = [0]
+    while mine:
+        top = 1 << (rest.bit_length() - 1)
+        if not mine & top:
+            break
+        run.append(run[-1] | top)
+        mine ^= top
+        rest ^= top
+    return tuple(run)
+
+@lru_cache(maxsize=1 << 16)
+def _sequence_tops(mine: int, rest: int) -> Tuple[int, ...]:
+    """Top rank of each run of `mine` that is unbroken among the cards still out (`rest`)."""
+    tops = []
+    in_run = False
+    for rank in range(12, -1, -1):
+        bit = 1 << rank
+        if mine & bit:
+            if not in_run:
+                tops.append(rank)
+                in_run = True
+        elif rest & bit:
+            in_run = False
+    return tuple(tops)
+
+@lru_cache(maxsize=1 << 16)
+def _follow_order(mine: int, rest: int, beat: int, partner_winning: bool) -> Tuple[int, ...]:
+    """
+    Ranks to try when following suit: the cheapest card that beats rank
+    `beat` first (unless partner is winning), then low cards upwards.
+    """
+    ranks = _sequence_tops(mine, rest)[::-1]
+    if partner_winning:
+        return ranks
+    winners = tuple(rank for rank in ranks if rank > beat)
+    return winners + tuple(rank for rank in ranks if rank < beat)
+
+def _holders(mine: int, partner: int, lho: int, rho: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    One suit seen by the leader: (ranks, holders) of the cards still out,
+    highest first, holders 0 for the leader, 1 left-hand opponent, 2 partner
+    and 3 right-hand opponent.
+    """
+    ranks = []
+    holders = []
+    for rank in range(12, -1, -1):
+        bit = 1 << rank
+        if mine & bit:
+            holders.append(0)
+        elif lho & bit:
+            holders.append(1)
+        elif partner & bit:
+            holders.append(2)
+        elif rho & bit:
+            holders.append(3)
+        else:
+            continue
+        ranks.append(rank)
+    return tuple(ranks), tuple(holders)
+
+@lru_cache(maxsize=1 << 18)
+def _nt_lead_weights(mine: int, partner: int, lho: int, rho: int, remaining: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    (weight, rank) of each lead from one suit without trumps, higher first.
+    The weights are those of the DDS solver's move ordering: short suits for
+    the opponents (fewer cards for them to choose from), then leads that win
+    the trick or go towards partner's top cards.
+    """
+    rest = mine | partner | lho | rho
+    ranks, holders = _holders(mine, partner, lho, rho)
+    winner = holders[0]
+    second = holders[1] if len(holders) > 1 else -1
+    third = holders[2] if len(holders) > 2 else -1
+    len_l, len_r, len_p = lho.bit_count(), rho.bit_count(), partner.bit_count()
+    count_l = (len_l or remaining) << 2
+    count_r = (len_r or remaining) << 2
+    base = -(((count_l + count_r) << 5) // 19)
+    if not len_p:
+        base -= 9
+    weights = []
+    for rank in _sequence_tops(mine, rest):
+        above = sum(1 for r in ranks if r > rank)
+        rel = 14 - above
+        lower = rest & ((1 << rank) - 1)
+        sequence = bool(lower and mine & (1 << (lower.bit_length() - 1)))
+        delta = base
+        if above == 0 or partner > (lho | rho):
+            # The lead wins the trick.
+            if second == 3:
+                if len_r != 1:
+                    delta -= 1
+            elif second == 1:
+                delta += 22 if len_l != 1 else 16
+            if (second != 1 or len_l == 1) and (second != 3 or len_r == 1):
+                weight = delta + 45 + rel
+            else:
+                weight = delta + 18 + rel
+        else:
+            if winner == 3 or second == 3:
+                if len_r != 1:
+                    delta -= 10
+            elif winner == 1 and second == 2:
+                if len_p != 1:
+                    delta += 31
+            if second == 2 and third == 2:
+                delta += 35
+            elif len_p > 1 and (second, third) in ((0, 2), (2, 0)):
+                delta += 25
+            if (len_l == 1 and winner == 1) or (len_r == 1 and winner == 3):
+                weight = delta + 28 + rel
+            elif winner == 0:
+                weight = delta - 17 + rel
+            elif not sequence:
+                weight = delta + 12 + rel
+            elif above == 1:
+                weight = delta + 48
+            else:
+                weight = delta + 29 - rel
+        weights.append((weight, rank))
+    return tuple(weights)
+
+@lru_cache(maxsize=1 << 18)
+def _trump_lead_weights(mine: int, partner: int, lho: int, rho: int, remaining: int,
+                        is_trump: bool, trumps: Tuple[int, int, int, int]) -> Tuple[Tuple[int, int], ...]:
+    """
+    As _nt_lead_weights, in a trump contract with trumps still out: trumps
+    holds the trumps of (leader, partner, lho, rho), and a side suit lead
+    only wins if no opponent can ruff it.
+    """
+    my_t, p_t, l_t, r_t = trumps
+    rest = mine | partner | lho | rho
+    ranks, holders = _holders(mine, partner, lho, rho)
+    winner = holders[0]
+    second = holders[1] if len(holders) > 1 else -1
+    third = holders[2] if len(holders) > 2 else -1
+    len_m, len_l, len_r, len_p = mine.bit_count(), lho.bit_count(), rho.bit_count(), partner.bit_count()
+    count_l = (len_l or remaining) << 2
+    count_r = (len_r or remaining) << 2
+    base = -(((count_l + count_r) << 5) // 13)
+    if not is_trump and ((not len_l and l_t) or (not len_r and r_t)):
+        base -= 12
+    if not is_trump and not len_p and p_t and len_r:
+        base += 17
+    if winner == 3 or second == 3:
+        if len_r != 1:
+            base -= 12
+    elif winner == 1 and second == 2:
+        if len_p != 1:
+            base += 27
+    if not is_trump and len_m == 1 and my_t and len_p > 1 and winner == 2:
+        base += 19
+    weights = []
+    for rank in _sequence_tops(mine, rest):
+        above = sum(1 for r in ranks if r > rank)
+        rel = 14 - above
+        lower = rest & ((1 << rank) - 1)
+        sequence = bool(lower and mine & (1 << (lower.bit_length() - 1)))
+        delta = base
+        if above == 0:
+            if is_trump:
+                win = True
+            elif len_p or not p_t:
+                win = (len_l or not l_t) and (len_r or not r_t)
+            else:
+                win = (len_l or p_t > l_t) and (len_r or p_t > r_t)
+        elif partner > (lho | rho):
+            win = is_trump or ((len_l or not l_t) and (len_r or not r_t))
+        elif not is_trump and not len_p and p_t:
+            # Partner ruffs, unless an opponent void in the suit overruffs.
+            win = (len_l or not l_t or p_t > l_t) and (len_r or not r_t or p_t > r_t)
+        else:
+            win = False
+        if win:
+            if (len_l == 1 and winner == 1) or (len_r == 1 and winner == 3):
+                weight = delta + 35 + rel
+            elif winner == 0:
+                if second == 2:
+                    weight = delta + 48 + rel
+                elif above == 0:
+                    weight = delta + 31
+                else:
+                    weight = delta - 3 + rel
+            elif winner == 2:
+                weight = delta + (42 if second == 0 else 28) + rel
+            elif sequence and above == 1:
+                weight = delta + 40
+            elif sequence:
+                weight = delta + 22 + rel
+            else:
+                weight = delta + 11 + rel
+        else:
+            if second == 2 and third == 2:
+                delta += 20
+            elif len_p > 1 and (second, third) in ((0, 2), (2, 0)):
+                delta += 13
+            if (len_l == 1 and winner == 1) or (len_r == 1 and winner == 3):
+                weight = delta + rel + 2
+            elif winner == 0:
+                if second == 2:
+                    weight = delta + 33 + rel
+                elif above == 0:
+                    weight = delta + 38
+                else:
+                    weight = delta - 14 + rel
+            elif winner == 2:
+                weight = delta + 34 + rel
+            elif sequence and above == 1:
+                weight = delta + 35
+            else:
+                weight = delta + 17 - rank
+        weights.append((weight, rank))
+    return tuple(weights)
+
+@lru_cache(maxsize=1 << 16)
+def _discard_weight(mine: int, rest: int) -> int:
+    """How willingly to discard from a suit: long ones first, keeping a guarded or bare top card."""
+    length = mine.bit_count()
+    weight = (length << 6) // 30
+    top = rest.bit_length() - 1
+    second = (rest & ~(1 << top)).bit_length() - 1
+    if length == 2 and second >= 0 and mine >> second & 1:
+        weight -= 6
+    elif length == 1 and mine >> top & 1:
+        weight -= 8
+    return weight
+
+def _run_bottom(card: int, hand: int, out: int) -> int:
+    """Lowest card of `hand` equivalent to `card` (the run it tops, among the cards still out)."""
+    bottom = card
+    for lower in range(card - 1, card - card % 13 - 1, -1):
+        if hand >> lower & 1:
+            bottom = lower
+        elif out >> lower & 1:
+            break
+    return bottom
+
+@lru_cache(maxsize=1 << 16)
+def _suit_profile(holdings: Tuple[int, int, int, int]) -> Tuple[Tuple[int, ...], int, Tuple[int, ...]]:
+    """
+    One suit of the four hands: (lengths, holders, ranks). holders packs
+    the seat of each card still out, highest first, two bits per card;
+    ranks lists those cards' ranks, highest first.
+    """
+    holders = 0
+    ranks = []
+    for rank in range(12, -1, -1):
+        bit = 1 << rank
+        for seat in range(4):
+            if holdings[seat] & bit:
+                holders |= seat << (2 * len(ranks))
+                ranks.append(rank)
+                break
+    return tuple(h.bit_count() for h in holdings), holders, tuple(ranks)
+
+def _top_counts(relevant: int, profiles) -> Tuple[int, int, int, int]:
+    """Per suit, how many of the top cards still out an entry covers: down to the lowest relevant one."""
+    counts = []
+    for suit, (_, _, ranks) in enumerate(profiles):
+        cards = (relevant >> (13 * suit)) & SUIT_MASK
+        if cards:
+            lowest = (cards & -cards).bit_length() - 1
+            counts.append(sum(1 for rank in ranks if rank >= lowest))
+        else:
+            counts.append(0)
+    return tuple(counts)
+
+def _probe(bucket: dict, holders: Tuple[int, int, int, int], target: int) -> Optional[Tuple[bool, tuple]]:
+    """
+    An entry of the bucket's trie that matches the position (holders packed as
+    in _suit_profile) and decides `target`: (answer, its top counts), or None.
+    """
+    h0, h1, h2, h3 = holders
+    masks = _HOLDER_MASKS
+    for c0, by0 in bucket.items():
+        node1 = by0.get(h0 & masks[c0])
+        if node1 is None:
+            continue
+        for c1, by1 in node1.items():
+            node2 = by1.get(h1 & masks[c1])
+            if node2 is None:
+                continue
+            for c2, by2 in node2.items():
+                node3 = by2.get(h2 & masks[c2])
+                if node3 is None:
+                    continue
+                for c3, by3 in node3.items():
+                    bounds = by3.get(h3 & masks[c3])
+                    if bounds is not None and (bounds[0] >= target or bounds[1] < target):
+                        return bounds[0] >= target, (c0, c1, c2, c3)
+    return None
+
+_HOLDER_MASKS = [(1 << (2 * count)) - 1 for count in range(14)]
+
+def _pattern_cards(counts: Tuple[int, int, int, int], profiles) -> int:
+    """Deck mask of the lowest card each suit of a matching entry covers."""
+    cards = 0
+    for suit in range(4):
+        count = counts[suit]
+        if count:
+            cards |= 1 << (13 * suit + profiles[suit][2][count - 1])
+    return cards
+
+def _deck_mask(hand) -> int:
+    if not isinstance(hand, CompactHand):
+        hand = CompactHand.from_hand(hand)
+    return hand.mask
+
+def solve_deal(deal: Dict[Seat, object]) -> TrickTable:
+    """Double-dummy trick table of one deal, indexed [declarer][strain]."""
+    return solve_deals([deal], workers=1)[0]
+
+def solve_deals(deals: Iterable[Dict[Seat, object]], workers: Optional[int] = None) -> List[TrickTable]:
+    """
+    Trick tables of many deals, in order. Full 13-card deals go to DDS when
+    endplay is installed (about half a second per deal on one core; DDS
+    runs its own threads). Other deals, or all of them without endplay,
+    are solved by DoubleDummySolver, one run_sharded task per deal
+    (workers=1 runs in-process); a full deal then takes minutes.
+    """
+    masks = [tuple(_deck_mask(deal[seat]) for seat in Seat) for deal in deals]
+    tables: List[Optional[TrickTable]] = [None] * len(masks)
+    if dds is not None:
+        full = [i for i, hands in enumerate(masks) if all(h.bit_count() == 13 for h in hands)]
+        for start in range(0, len(full), DDS_BATCH):
+            batch = full[start:start + DDS_BATCH]
+            for i, table in zip(batch, dds.calc_all_tables([DdsDeal(_pbn(masks[i])) for i in batch])):
+                tables[i] = _from_dds(table)
+    rest = [i for i, table in enumerate(tables) if table is None]
+    solved: List[TrickTable] = []
+    run_sharded([], [(masks[i],) for i in rest], _solve_masks, solved.append, workers)
+    for i, table in zip(rest, solved):
+        tables[i] = table
+    return tables
+
+def _solve_masks(masks: Tuple[int, ...]) -> TrickTable:
+    return DoubleDummySolver({seat: CompactHand.from_mask(mask) for seat, mask in zip(Seat, masks)}).table()
+
+def _pbn(masks: Tuple[int, ...]) -> str:
+    """PBN deal string ("N:AKQ.JT9.876.5432 ...", spades first) of four deck masks."""
+    return "N:" + " ".join(".".join("".join("23456789TJQKA"[rank] for rank in range(12, -1, -1)
+                                           if hand >> (13 * suit + rank) & 1)
+                                   for suit in (3, 2, 1, 0))
+                           for hand in masks)
+
+def _from_dds(table) -> TrickTable:
+    """DDS table (indexed [denomination, player]) as a TrickTable."""
+    denoms = (Denom.clubs, Denom.diamonds, Denom.hearts, Denom.spades, Denom.nt)
+    return [[table[denom, int(declarer)] for denom in denoms] for declarer in Seat]
@@ -1,11 +1,16 @@
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from bid.models import Hand, Call, CallType, Seat
-from bid.system import BiddingSystem, Rule
+from bid.system import BiddingSystem, Rule, AutomatonState
 from bid.constraints import HandConstraints
+from bid.inference import SeatDistribution, infer_auction
+
+if TYPE_CHECKING:
+    from bid.tracing import Tracer
 
 class Engine:
-    def __init__(self, system: BiddingSystem):
+    def __init__(self, system: BiddingSystem, tracer: Optional['Tracer'] = None):
         self.system = system
+        self.tracer = tracer
 
     def get_bid(self, 
                 history: List[Call], 
@@ -28,10 +33,11 @@ class Engine:
             if not is_my_side:
                 active_system = opp_system
 
-        rule = active_system.get_bid(history, hand)
+        if self.tracer is None:
+            rule = active_system.get_bid(history, hand)
+        else:
+            rule = self.tracer.get_bid(active_system, history, hand)
         if rule:
-            # DEBUG
-            # print(f"DEBUG ENGINE: Matched Rule '{rule.description}' Priority={rule.priority} Call={rule.call}")
             return rule.call
         # Default fallback: Pass
         return Call(CallType.PASS)
@@ -45,39 +51,89 @@ class Engine:
         """
         Analyze the auction and return constraints for each player.
         """
-        # Initialize constraints (0-37 HCP, 0-13 len)
-        constraints = {s: HandConstraints() for s in Seat}
-        
-        current_seat = dealer_seat
-        
-        for i, call in enumerate(history):
-            # Determine which system applies
-            is_my_side = (current_seat == my_seat) or (current_seat == my_seat.partner)
-            active_system = my_system if is_my_side else opp_system
-            
-            history_before = history[:i]
-            matching_rules = []
-            
-            # Find rules in the active system that would produce this call
-            for r in active_system.rules:
-                if r.trigger(history_before) and r.call == call:
-                    matching_rules.append(r)
-            
-            if matching_rules:
-                # If multiple rules match, ideally intersection/union. 
-                # For now, take first match.
-                r = matching_rules[0]
-                constraints[current_seat] = constraints[current_seat].intersect(r.constraints)
-            else:
-                # No rule matched. 
-                # If PASS, implies no opening/response rule triggered. 
-                # This logic is complex (negative processing). 
-                # For now, do nothing if no explicit rule matches.
-                pass
-            
-            current_seat = Seat((current_seat.value + 1) % 4)
-            
-        return constraints
+        analyzer = AuctionAnalyzer(my_seat, dealer_seat, my_system, opp_system)
+        for call in history:
+            analyzer.push(call)
+        return analyzer.constraints
+
+    def infer_deal(self,
+                   history: List[Call],
+                   my_seat: Seat,
+                   dealer_seat: Seat,
+                   my_system: BiddingSystem,
+                   opp_system: BiddingSystem,
+                   method: str = "sample",
+                   **kwargs) -> Dict[Seat, 'SeatDistribution']:
+        """
+        Like estimate_deal, but per-seat feature distributions conditioned on
+        every call (negative inference included); see inference.infer_auction.
+        """
+        return infer_auction(history, my_seat, dealer_seat, my_system, opp_system, method, **kwargs)
 
     def format_estimate(self, constraints: HandConstraints) -> str:
         return str(constraints)
+
+class AuctionAnalyzer:
+    """
+    Incremental Engine.estimate_deal for auctions that grow one call at a time.
+    Keeps the per-seat constraints and each system's automaton state, so
+    push() costs one automaton step plus a scan of the rules triggered at
+    that point. Every call pushes a frame: undo() pops it and branch()
+    returns an independent analyzer sharing the frames so far, for exploring
+    alternative continuations.
+    """
+    def __init__(self,
+                 my_seat: Seat,
+                 dealer_seat: Seat,
+                 my_system: BiddingSystem,
+                 opp_system: BiddingSystem):
+        self.my_seat = my_seat
+        self.dealer_seat = dealer_seat
+        self.my_system = my_system
+        self.opp_system = opp_system
+        self.history: List[Call] = []
+        # Frame: (my automaton state, opp automaton state, constraints by seat).
+        initial = {s: HandConstraints() for s in Seat}
+        self._frames: List[Tuple[AutomatonState, AutomatonState, Dict[Seat, HandConstraints]]] = [
+            (my_system.automaton.start, opp_system.automaton.start, initial)
+        ]
+
+    @property
+    def current_seat(self) -> Seat:
+        return Seat((self.dealer_seat.value + len(self.history)) % 4)
+
+    @property
+    def constraints(self) -> Dict[Seat, HandConstraints]:
+        return dict(self._frames[-1][2])
+
+    def push(self, call: Call):
+        my_state, opp_state, constraints = self._frames[-1]
+        seat = self.current_seat
+        is_my_side = (seat == self.my_seat) or (seat == self.my_seat.partner)
+        system, state = (self.my_system, my_state) if is_my_side else (self.opp_system, opp_state)
+
+        for r in system.automaton.rules_at(state, self.history):
+            if r.call == call:
+                # If multiple rules match, ideally intersection/union. For now, take first match.
+                constraints = dict(constraints)
+                constraints[seat] = constraints[seat].intersect(r.constraints)
+                break
+        # No rule matched: negative inference (e.g. from a PASS) is not applied.
+
+        self.history.append(call)
+        self._frames.append((self.my_system.automaton.advance(my_state, call),
+                             self.opp_system.automaton.advance(opp_state, call),
+                             constraints))
+
+    def undo(self) -> Call:
+        if not self.history:
+            raise ValueError("Nothing to undo")
+        self._frames.pop()
+        return self.history.pop()
+
+    def branch(self) -> 'AuctionAnalyzer':
+        other = AuctionAnalyzer.__new__(AuctionAnalyzer)
+        other.__dict__.update(self.__dict__)
+        other.history = list(self.history)
+        other._frames = list(self._frames)
+        return other
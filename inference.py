@@ -0,0 +1,181 @@
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from bid.models import (Call, CallType, CompactHand, FEATURE_COLUMNS, HandBatch, Seat, Suit, np)
+from bid.system import BiddingSystem, Rule
+from bid.constraints import HandConstraints, LENGTH_FEATURES
+from bid.probability import FULL_DECK, feature_table, remaining_deck, table_columns
+
+HCP = FEATURE_COLUMNS.index("hcp")
+
+class SeatDistribution:
+    """
+    Posterior over one seat's hand features: rows of a FEATURE_COLUMNS
+    matrix with weights (1 per sampled hand, or the number of hands behind
+    each row of an exact table), keeping only the hands consistent with
+    every call the seat made. Calls no hand could have produced under the
+    system are listed in `unexplained` (by auction index) and ignored.
+
+    `columns` are the FEATURE_COLUMNS the rows resolve (None for all of
+    them): an exact table leaves the others at 0, so asking about them
+    raises ValueError.
+    """
+    def __init__(self, features, weights, unexplained: Tuple[int, ...] = (),
+                 columns: Optional[FrozenSet[str]] = None):
+        self.features = features
+        self.weights = weights
+        self.unexplained = unexplained
+        self.columns = columns
+
+    def _column(self, column: str) -> int:
+        if self.columns is not None and column not in self.columns:
+            raise ValueError(f"Column {column} is not resolved by this distribution "
+                             f"(pass it to infer_auction's columns)")
+        return FEATURE_COLUMNS.index(column)
+
+    @property
+    def total(self) -> float:
+        """Weight left: hands (exact) or samples consistent with the auction."""
+        return float(self.weights.sum())
+
+    def histogram(self, column: str, size: int):
+        """Probability of each value 0..size-1 of a FEATURE_COLUMNS column."""
+        counts = np.bincount(self.features[:, self._column(column)],
+                             weights=self.weights, minlength=size)[:size].astype(float)
+        return counts / counts.sum() if counts.sum() else counts
+
+    def hcp_histogram(self):
+        return self.histogram("hcp", 38)
+
+    def length_histogram(self, suit: Suit):
+        return self.histogram(LENGTH_FEATURES[suit], 14)
+
+    def mean(self, column: str) -> float:
+        values = self.features[:, self._column(column)]
+        return float((values * self.weights).sum() / self.weights.sum()) if self.total else 0.0
+
+    def probability(self, constraints: HandConstraints) -> float:
+        """Posterior probability that the hand meets the constraints."""
+        for column in constraints.compiled.features:
+            self._column(column)
+        if not self.total:
+            return 0.0
+        return float(self.weights[constraints.compiled.mask(self.features)].sum() / self.weights.sum())
+
+    def to_constraints(self) -> HandConstraints:
+        """Smallest HCP / length box holding all the posterior mass (e.g. for ConstrainedDealer)."""
+        support = self.features[self.weights > 0]
+        if not len(support):
+            return HandConstraints()
+        lengths = [support[:, FEATURE_COLUMNS.index(LENGTH_FEATURES[s])] for s in Suit]
+        return HandConstraints(hcp_min=int(support[:, HCP].min()), hcp_max=int(support[:, HCP].max()),
+                               length_min={s: int(lengths[s].min()) for s in Suit},
+                               length_max={s: int(lengths[s].max()) for s in Suit})
+
+def auction_events(history: List[Call],
+                   my_seat: Seat,
+                   dealer_seat: Seat,
+                   my_system: BiddingSystem,
+                   opp_system: BiddingSystem) -> Dict[Seat, List[Tuple[int, List[Rule], Call]]]:
+    """Per seat, (auction index, rules triggered at that point, call made) for each of its calls."""
+    events = {seat: [] for seat in Seat}
+    my_state, opp_state = my_system.automaton.start, opp_system.automaton.start
+    for i, call in enumerate(history):
+        seat = Seat((dealer_seat + i) % 4)
+        if seat in (my_seat, my_seat.partner):
+            rules = my_system.automaton.rules_at(my_state, history[:i])
+        else:
+            rules = opp_system.automaton.rules_at(opp_state, history[:i])
+        events[seat].append((i, rules, call))
+        my_state = my_system.automaton.advance(my_state, call)
+        opp_state = opp_system.automaton.advance(opp_state, call)
+    return events
+
+def consistent_mask(rules: List[Rule], call: Call, features):
+    """
+    Hands (rows of a FEATURE_COLUMNS matrix or a HandBatch) for which the
+    first matching rule bids `call`. Hands claimed by a higher-priority rule
+    with another call are excluded; hands no rule claims pass (the Engine
+    fallback), so a PASS also keeps them.
+    """
+    claimed = ok = None
+    for rule in rules:
+        mask = rule.constraints.compiled.mask(features)
+        if claimed is None:
+            claimed, ok = np.zeros(len(mask), dtype=bool), np.zeros(len(mask), dtype=bool)
+        mask &= ~claimed
+        if rule.call == call:
+            ok |= mask
+        claimed |= mask
+    if claimed is None:
+        return np.full(len(features), call.type == CallType.PASS, dtype=bool)
+    if call.type == CallType.PASS:
+        ok |= ~claimed
+    return ok
+
+def infer_auction(history: List[Call],
+                  my_seat: Seat,
+                  dealer_seat: Seat,
+                  my_system: BiddingSystem,
+                  opp_system: BiddingSystem,
+                  method: str = "sample",
+                  samples: int = 20000,
+                  seed=None,
+                  known_hand: Optional[CompactHand] = None,
+                  columns: Tuple[str, ...] = ()) -> Dict[Seat, SeatDistribution]:
+    """
+    Probabilistic Engine.estimate_deal: each seat's hand conditioned on
+    producing exactly its calls under first-match semantics, including the
+    negative inference from higher-priority rules that did not fire.
+
+    method="sample" weighs `samples` random hands; method="exact" uses the
+    exact feature table of probability.feature_table, only over the features
+    the rules involved look at plus `columns` (its distributions refuse
+    questions about any other feature). With known_hand (my_seat's cards)
+    the other seats are drawn from the remaining 39 cards. Seats are
+    inferred independently of each other.
+    """
+    if np is None:
+        raise ImportError("infer_auction requires numpy")
+    if method not in ("sample", "exact"):
+        raise ValueError(f"Unknown inference method: {method}")
+    events = auction_events(history, my_seat, dealer_seat, my_system, opp_system)
+    available = remaining_deck(known_hand.suit_masks) if known_hand is not None else FULL_DECK
+
+    if method == "sample":
+        features = random_hands(samples, available, seed).feature_matrix()
+        tables = {seat: (features, np.ones(len(features), dtype=np.int64), None) for seat in Seat}
+    else:
+        tables = {}
+        for seat in Seat:
+            needed = {"hcp", *LENGTH_FEATURES, *columns}
+            for _, rules, _ in events[seat]:
+                for rule in rules:
+                    needed.update(rule.constraints.compiled.features)
+            needed = tuple(sorted(needed))
+            tables[seat] = (*feature_table(needed, available), table_columns(needed))
+
+    result = {}
+    for seat in Seat:
+        if known_hand is not None and seat == my_seat:
+            result[seat] = SeatDistribution(HandBatch.from_hands([known_hand]).feature_matrix(),
+                                            np.ones(1, dtype=np.int64))
+            continue
+        features, weights, resolved = tables[seat]
+        unexplained = []
+        for index, rules, call in events[seat]:
+            mask = consistent_mask(rules, call, features)
+            if not weights[mask].any():
+                unexplained.append(index)
+                continue
+            weights = np.where(mask, weights, 0)
+        result[seat] = SeatDistribution(features, weights, tuple(unexplained), resolved)
+    return result
+
+def random_hands(n: int, available=FULL_DECK, seed=None, hand_size: int = 13) -> HandBatch:
+    """n independent uniform hands of hand_size cards from the `available` suit holdings."""
+    cards = np.array([suit * 13 + bit for suit in Suit for bit in range(13) if available[suit] >> bit & 1])
+    rng = np.random.default_rng(seed)
+    chosen = cards[rng.random((n, len(cards))).argsort(axis=1)[:, :hand_size]]
+    masks = np.zeros((n, 4), dtype=np.uint16)
+    for suit in Suit:
+        masks[:, suit] = np.where(chosen // 13 == suit, 1 << (chosen % 13), 0).sum(axis=1)
+    return HandBatch(masks)
@@ -0,0 +1,324 @@
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from bid.models import (Call, CallType, CompactHand, SUIT_MASK, Seat, Strain, auction_over, parse_deal,
+                        parse_hand)
+
+class Board:
+    """One played board: deal (seats whose cards are known), dealer, vulnerability and auction."""
+    __slots__ = ("number", "dealer", "vulnerability", "deal", "auction")
+
+    def __init__(self,
+                 number: Optional[int],
+                 dealer: Seat,
+                 vulnerability: str,
+                 deal: Dict[Seat, CompactHand],
+                 auction: List[Call]):
+        self.number = number
+        self.dealer = dealer
+        self.vulnerability = vulnerability  # "None", "NS", "EW" or "All"
+        self.deal = deal
+        self.auction = auction
+
+    def __repr__(self):
+        return f"Board({self.number}, {self.dealer}, {self.vulnerability}, {' '.join(map(str, self.auction))})"
+
+# One shared Call per token; every spelling PBN and LIN use.
+_CALLS: Dict[str, Call] = {}
+for _level in range(1, 8):
+    for _strain, _names in zip(Strain, (("C",), ("D",), ("H",), ("S",), ("NT", "N"))):
+        for _name in _names:
+            _CALLS[f"{_level}{_name}"] = Call(CallType.BID, _level, _strain)
+for _names, _type in ((("PASS", "P"), CallType.PASS), (("X", "D", "DBL"), CallType.DOUBLE),
+                      (("XX", "R", "RDBL"), CallType.REDOUBLE)):
+    _call = Call(_type)
+    for _name in _names:
+        _CALLS[_name] = _call
+PASS = _CALLS["PASS"]
+
+_SEATS = {"N": Seat.NORTH, "E": Seat.EAST, "S": Seat.SOUTH, "W": Seat.WEST}
+_PBN_VULNERABILITY = {"NONE": "None", "LOVE": "None", "-": "None", "NS": "NS", "EW": "EW", "ALL": "All", "BOTH": "All"}
+_LIN_VULNERABILITY = {"O": "None", "0": "None", "-": "None", "N": "NS", "E": "EW", "B": "All"}
+# LIN md|: dealer digit, then hands from South clockwise.
+_LIN_DEALERS = {"1": Seat.SOUTH, "2": Seat.WEST, "3": Seat.NORTH, "4": Seat.EAST}
+_LIN_ORDER = (Seat.SOUTH, Seat.WEST, Seat.NORTH, Seat.EAST)
+
+_TAG = re.compile(r'\[(\w+)\s+"([^"]*)"\]')
+_PBN_NOISE = re.compile(r'\{[^}]*\}|;[^\n]*|=\d+=|\$\d+')
+
+def _complete(deal: Dict[Seat, CompactHand]) -> Dict[Seat, CompactHand]:
+    """Fill in the fourth hand when the other three hold 39 cards."""
+    if len(deal) == 3 and all(sum(h.length(s) for s in range(4)) == 13 for h in deal.values()):
+        missing = next(seat for seat in Seat if seat not in deal)
+        deal[missing] = CompactHand(tuple(SUIT_MASK & ~_union(deal, s) for s in range(4)))
+    return deal
+
+def _union(deal: Dict[Seat, CompactHand], suit: int) -> int:
+    mask = 0
+    for hand in deal.values():
+        mask |= hand.suit_masks[suit]
+    return mask
+
+def _finish(calls: List[Call], all_pass: bool) -> List[Call]:
+    if all_pass:
+        while not auction_over(calls):
+            calls.append(PASS)
+    return calls
+
+# --- PBN ---------------------------------------------------------------------
+
+def parse_pbn_record(text: str) -> Optional[Board]:
+    """One PBN game (tag pairs plus the auction section); None if it has no deal."""
+    text = _PBN_NOISE.sub(" ", text)
+    tags: Dict[str, str] = {}
+    auction_tokens: List[str] = []
+    in_auction = False
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("["):
+            match = _TAG.match(line)
+            if match:
+                name, value = match.groups()
+                tags.setdefault(name, value)
+                in_auction = name == "Auction"
+            else:
+                in_auction = False
+        elif in_auction:
+            auction_tokens.extend(line.split())
+
+    deal_tag = tags.get("Deal")
+    if not deal_tag:
+        return None
+    deal = parse_deal(deal_tag)
+
+    number = int(tags["Board"]) if tags.get("Board", "").isdigit() else None
+    if tags.get("Dealer", "").upper() in _SEATS:
+        dealer = _SEATS[tags["Dealer"].upper()]
+    elif tags.get("Auction", "").upper() in _SEATS:
+        dealer = _SEATS[tags["Auction"].upper()]
+    else:
+        dealer = Seat((number - 1) % 4) if number else Seat.NORTH
+    vulnerability = _PBN_VULNERABILITY.get(tags.get("Vulnerable", "None").upper(), "None")
+
+    calls: List[Call] = []
+    all_pass = False
+    for token in auction_tokens:
+        token = token.rstrip("!?").upper()
+        if token == "AP":
+            all_pass = True
+            break
+        if token == "*":
+            break
+        call = _CALLS.get(token)
+        if call is not None:
+            calls.append(call)
+        # "-" (no call) and anything unrecognised carry no call.
+    return Board(number, dealer, vulnerability, _complete(deal), _finish(calls, all_pass))
+
+def _pbn_records(data, start: int, end: int) -> Iterator[str]:
+    """Games of a PBN buffer between byte offsets, split on blank lines."""
+    record: List[str] = []
+    position = start
+    while position < end:
+        newline = data.find(b"\n", position, end)
+        stop = end if newline < 0 else newline + 1
+        line = data[position:stop].decode("latin-1")
+        position = stop
+        if line.strip():
+            if not line.startswith("%"):  # export escapes / comments
+                record.append(line)
+        elif record:
+            yield "".join(record)
+            record = []
+    if record:
+        yield "".join(record)
+
+def _pbn_boundary(data, offset: int) -> int:
+    """First game start (just past a blank line) at or after `offset`."""
+    if offset == 0:
+        return 0
+    candidates = [p for p in (data.find(b"\n\n", offset), data.find(b"\n\r\n", offset)) if p >= 0]
+    if not candidates:
+        return len(data)
+    p = min(candidates)
+    return p + (2 if data[p:p + 2] == b"\n\n" else 3)
+
+# --- LIN ---------------------------------------------------------------------
+
+def _lin_board(pairs: List[Tuple[str, str]]) -> Optional[Board]:
+    number = None
+    dealer = None
+    vulnerability = "None"
+    deal: Dict[Seat, CompactHand] = {}
+    calls: List[Call] = []
+    for key, value in pairs:
+        if key == "md" and value:
+            dealer = _LIN_DEALERS.get(value[0], Seat.SOUTH)
+            for seat, hand in zip(_LIN_ORDER, value[1:].split(",")):
+                if hand:
+                    deal[seat] = parse_hand(hand)
+        elif key == "mb":
+            call = _CALLS.get(value.rstrip("!").upper())
+            if call is not None:
+                calls.append(call)
+        elif key == "sv":
+            vulnerability = _LIN_VULNERABILITY.get(value.upper(), "None")
+        elif key == "ah":
+            digits = re.sub(r"\D", "", value)
+            number = int(digits) if digits else number
+        elif key == "qx" and number is None:
+            digits = re.sub(r"\D", "", value)
+            number = int(digits) if digits else None
+    if dealer is None:
+        return None
+    return Board(number, dealer, vulnerability, _complete(deal), calls)
+
+def _lin_records(data, start: int, end: int) -> Iterator[List[Tuple[str, str]]]:
+    """Boards of a LIN buffer between byte offsets, as (key, value) pairs."""
+    text_lines = (data[p:q].decode("latin-1") for p, q in _line_spans(data, start, end))
+    pairs: List[Tuple[str, str]] = []
+    has_deal = False
+    for line in text_lines:
+        fields = line.strip().split("|")
+        for i in range(0, len(fields) - 1, 2):
+            key, value = fields[i].strip().lower(), fields[i + 1]
+            if not key:
+                continue
+            # md always opens a new board; qx does unless the board has not been dealt yet.
+            if (key == "md" and has_deal) or (key == "qx" and pairs):
+                yield pairs
+                pairs, has_deal = [], False
+            pairs.append((key, value))
+            has_deal = has_deal or key == "md"
+    if pairs:
+        yield pairs
+
+def _line_spans(data, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    position = start
+    while position < end:
+        newline = data.find(b"\n", position, end)
+        stop = end if newline < 0 else newline + 1
+        yield position, stop
+        position = stop
+
+def _lin_boundary(data, offset: int, key: bytes = b"qx|") -> int:
+    """First line at or after `offset` that starts with `key` (see _lin_cutter)."""
+    if offset == 0:
+        return 0
+    position = data.find(b"\n", offset)
+    while position >= 0:
+        line_start = position + 1
+        if bytes(data[line_start:line_start + 3]).lower() == key:
+            return line_start
+        position = data.find(b"\n", line_start)
+    return len(data)
+
+_LIN_QX = re.compile(rb"(?:^|\|)[qQ][xX]\|", re.M)
+
+def _lin_cutter(data):
+    """
+    Cut where _lin_records starts a board: at qx| lines in files that use
+    qx (a board's pn / md / ... lines follow its qx), otherwise at md| lines.
+    """
+    key = b"qx|" if _LIN_QX.search(data) else b"md|"
+    return lambda offset: _lin_boundary(data, offset, key)
+
+def _pbn_cutter(data):
+    return lambda offset: _pbn_boundary(data, offset)
+
+# --- Readers -----------------------------------------------------------------
+
+def parse_pbn(text: str) -> Iterator[Board]:
+    data = text.encode("utf-8")
+    for record in _pbn_records(data, 0, len(data)):
+        board = parse_pbn_record(record)
+        if board is not None:
+            yield board
+
+def parse_lin(text: str) -> Iterator[Board]:
+    data = text.encode("utf-8")
+    for pairs in _lin_records(data, 0, len(data)):
+        board = _lin_board(pairs)
+        if board is not None:
+            yield board
+
+_FORMATS = {"pbn": (_pbn_cutter, lambda data, s, e: (parse_pbn_record(r) for r in _pbn_records(data, s, e))),
+            "lin": (_lin_cutter, lambda data, s, e: (_lin_board(p) for p in _lin_records(data, s, e)))}
+
+# Index of each distinct Call in _CALLS, so workers can send auctions back as bytes.
+_CALL_LIST = list({id(call): call for call in _CALLS.values()}.values())
+_CALL_CODES = {id(call): i for i, call in enumerate(_CALL_LIST)}
+
+def file_format(path: str, fmt: Optional[str] = None) -> str:
+    """"pbn" or "lin", from the extension unless given."""
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt not in _FORMATS:
+        raise ValueError(f"Unknown board file format: {fmt}")
+    return fmt
+
+def board_ranges(path: str, fmt: Optional[str] = None, chunk_size: int = 8 << 20) -> List[Tuple[int, int]]:
+    """Byte ranges of ~chunk_size covering the file, cut at record boundaries."""
+    cutter = _FORMATS[file_format(path, fmt)][0]
+    if os.path.getsize(path) == 0:
+        return []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        boundary = cutter(data)
+        cuts = sorted({boundary(offset) for offset in range(0, len(data), chunk_size)} | {len(data)})
+    return [(start, end) for start, end in zip(cuts, cuts[1:]) if start < end]
+
+def boards_in_range(path: str, fmt: str, start: int, end: int) -> Iterator[Board]:
+    """Stream the boards whose record starts in [start, end) (see board_ranges)."""
+    parse = _FORMATS[file_format(path, fmt)][1]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for board in parse(data, start, end):
+            if board is not None:
+                yield board
+
+def _parse_range(path: str, fmt: str, start: int, end: int) -> List[tuple]:
+    """Boards of one byte range as plain tuples: much cheaper to send back than Board objects."""
+    return [(board.number, int(board.dealer), board.vulnerability,
+             tuple(board.deal[seat].suit_masks if seat in board.deal else None for seat in Seat),
+             bytes(_CALL_CODES[id(call)] for call in board.auction))
+            for board in boards_in_range(path, fmt, start, end)]
+
+def _unpack(row: tuple) -> Board:
+    number, dealer, vulnerability, masks, calls = row
+    deal = {seat: CompactHand(m) for seat, m in zip(Seat, masks) if m is not None}
+    return Board(number, Seat(dealer), vulnerability, deal, [_CALL_LIST[c] for c in calls])
+
+def read_boards(path: str,
+                fmt: Optional[str] = None,
+                workers: int = 1,
+                chunk_size: int = 8 << 20) -> Iterator[Board]:
+    """
+    Stream the boards of a PBN or LIN file (format from the extension unless
+    given). The file is memory-mapped and parsed one record at a time, so
+    memory stays bounded whatever its size. With workers > 1 it is split
+    into ~chunk_size byte ranges cut at record boundaries, parsed by a
+    process pool with at most two chunks per worker in flight; boards still
+    come out in file order. Records without a deal are skipped.
+    """
+    fmt = file_format(path, fmt)
+    if workers <= 1:
+        if os.path.getsize(path):
+            yield from boards_in_range(path, fmt, 0, os.path.getsize(path))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for start, end in board_ranges(path, fmt, chunk_size):
+            pending.append(pool.submit(_parse_range, path, fmt, start, end))
+            if len(pending) >= 2 * workers:
+                yield from map(_unpack, pending.pop(0).result())
+        for future in pending:
+            yield from map(_unpack, future.result())
+
+def read_pbn(path: str, workers: int = 1, chunk_size: int = 8 << 20) -> Iterator[Board]:
+    return read_boards(path, "pbn", workers, chunk_size)
+
+def read_lin(path: str, workers: int = 1, chunk_size: int = 8 << 20) -> Iterator[Board]:
+    return read_boards(path, "lin", workers, chunk_size)
@@ -31,13 +31,10 @@ def main():
     
     # 2. Parse System
     dsl_path = "bid/system/gib.dsl"
-    print(f"Parsing System from {dsl_path}...")
-    
-    with open(dsl_path, "r") as f:
-        dsl_text = f.read()
-        
+    print(f"Loading System from {dsl_path}...")
+
     translator = SystemTranslator()
-    system = translator.parse(dsl_text)
+    system = translator.load(dsl_path)
     print(f"Loaded {len(system.rules)} rules.")
     
     engine = Engine(system)
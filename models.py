@@ -1,7 +1,12 @@
 from enum import Enum, IntEnum
-from typing import List, Optional, Tuple, Dict
+from typing import List, Optional, Tuple, Dict, Iterable, Iterator
 import random
 
+try:
+    import numpy as np
+except ImportError:  # HandBatch and the bulk dealers need NumPy
+    np = None
+
 class Suit(IntEnum):
     CLUBS = 0
     DIAMONDS = 1
@@ -53,6 +58,38 @@ class Rank(IntEnum):
         if self.value <= 9: return str(self.value)
         return {10: "T", 11: "J", 12: "Q", 13: "K", 14: "A"}[self.value]
 
+# Bit layout of a 13-bit suit holding: bit (rank - 2), so Two = bit 0 and Ace = bit 12.
+ACE_BIT = 1 << (Rank.ACE - 2)
+KING_BIT = 1 << (Rank.KING - 2)
+QUEEN_BIT = 1 << (Rank.QUEEN - 2)
+JACK_BIT = 1 << (Rank.JACK - 2)
+HONOR_BITS = ACE_BIT | KING_BIT | QUEEN_BIT | JACK_BIT
+SUIT_MASK = (1 << 13) - 1
+_SUITS = tuple(Suit)
+
+# Per-holding feature tables, indexed by a 13-bit suit holding. Every hand
+# feature but the shape ones is the sum of its four suits' entries.
+def _holding_tables():
+    hcp, controls, aces, lengths, total_points = [], [], [], [], []
+    for m in range(1 << 13):
+        length = m.bit_count()
+        points = (4 * ((m >> 12) & 1) + 3 * ((m >> 11) & 1) +
+                  2 * ((m >> 10) & 1) + ((m >> 9) & 1))
+        hcp.append(points)
+        controls.append(2 * ((m >> 12) & 1) + ((m >> 11) & 1))
+        aces.append((m >> 12) & 1)
+        lengths.append(length)
+        if length < 3:
+            # Void=3, singleton=2, doubleton=1, less one with an honor.
+            points += 3 - length - (1 if m & HONOR_BITS else 0)
+        total_points.append(points)
+    return tuple(hcp), tuple(controls), tuple(aces), tuple(lengths), tuple(total_points)
+
+HOLDING_HCP, HOLDING_CONTROLS, HOLDING_ACE, HOLDING_LENGTH, HOLDING_TOTAL_POINTS = _holding_tables()
+
+_CARD_SUITS = {'C': Suit.CLUBS, 'D': Suit.DIAMONDS, 'H': Suit.HEARTS, 'S': Suit.SPADES}
+_CARD_RANKS = {str(r): r for r in Rank}
+
 class Card:
     def __init__(self, suit: Suit, rank: Rank):
         self.suit = suit
@@ -65,16 +102,23 @@ class Card:
     def hcp(self):
         return max(0, self.rank.value - 10)
 
+# Sorted suit lengths of a balanced hand: 4333, 4432, 5332.
+BALANCED_SHAPES = ([3, 3, 3, 4], [2, 3, 4, 4], [2, 3, 3, 5])
+
 class Hand:
     def __init__(self, cards: List[Card]):
         self.cards = sorted(cards, key=lambda c: (c.suit.value, c.rank.value), reverse=True)
         self.by_suit = {s: [] for s in Suit}
+        masks = [0, 0, 0, 0]
         for c in self.cards:
             self.by_suit[c.suit].append(c)
+            masks[c.suit] |= 1 << (c.rank.value - 2)
+        self.suit_masks = tuple(masks)
 
     @property
     def hcp(self) -> int:
-        return sum(c.hcp for c in self.cards)
+        c, d, h, s = self.suit_masks
+        return HOLDING_HCP[c] + HOLDING_HCP[d] + HOLDING_HCP[h] + HOLDING_HCP[s]
 
     def length(self, suit: Suit) -> int:
         return len(self.by_suit[suit])
@@ -90,53 +134,22 @@ class Hand:
         Void=3, Singleton=2, Doubleton=1.
         Short suits (length < 3) with an Honor (J,Q,K,A) get -1 point.
         """
-        dist_points = 0
-        penalty = 0
-        
-        for suit in Suit:
-            length = self.length(suit)
-            if length == 0:
-                dist_points += 3
-            elif length == 1:
-                dist_points += 2
-            elif length == 2:
-                dist_points += 1
-            
-            # Check penalty: short suit with honor
-            if length < 3:
-                # Check for honors in this suit
-                has_honor = False
-                for card in self.by_suit[suit]:
-                    if card.rank.value >= Rank.JACK.value:
-                        has_honor = True
-                        break
-                if has_honor:
-                    penalty += 1
-                    
-        return self.hcp + dist_points - penalty
+        c, d, h, s = self.suit_masks
+        return (HOLDING_TOTAL_POINTS[c] + HOLDING_TOTAL_POINTS[d] +
+                HOLDING_TOTAL_POINTS[h] + HOLDING_TOTAL_POINTS[s])
 
     @property
     def controls(self) -> int:
         """
         Blue Club Controls: Ace=2, King=1.
         """
-        count = 0
-        for suit in Suit:
-            for card in self.by_suit[suit]:
-                if card.rank == Rank.ACE:
-                    count += 2
-                elif card.rank == Rank.KING:
-                    count += 1
-        return count
+        c, d, h, s = self.suit_masks
+        return HOLDING_CONTROLS[c] + HOLDING_CONTROLS[d] + HOLDING_CONTROLS[h] + HOLDING_CONTROLS[s]
 
     @property
     def ace_count(self) -> int:
-        count = 0
-        for suit in Suit:
-            for card in self.by_suit[suit]:
-                if card.rank == Rank.ACE:
-                    count += 1
-        return count
+        c, d, h, s = self.suit_masks
+        return HOLDING_ACE[c] + HOLDING_ACE[d] + HOLDING_ACE[h] + HOLDING_ACE[s]
 
     @property
     def ace_topology(self) -> str:
@@ -147,30 +160,7 @@ class Hand:
         COLOR: Both Black or Both Red.
         MIXED: Neither Same Rank nor Same Color (e.g. S+D, H+C).
         """
-        if self.ace_count != 2:
-            return "NONE"
-            
-        aces = []
-        for suit in Suit:
-            for card in self.by_suit[suit]:
-                if card.rank == Rank.ACE:
-                    aces.append(suit)
-        
-        s1, s2 = aces[0], aces[1]
-        
-        # Check Rank (Both Major or Both Minor)
-        is_major1 = s1 in (Suit.SPADES, Suit.HEARTS)
-        is_major2 = s2 in (Suit.SPADES, Suit.HEARTS)
-        if is_major1 == is_major2:
-            return "RANK"
-            
-        # Check Color (Both Black or Both Red)
-        is_black1 = s1 in (Suit.SPADES, Suit.CLUBS)
-        is_black2 = s2 in (Suit.SPADES, Suit.CLUBS)
-        if is_black1 == is_black2:
-            return "COLOR"
-            
-        return "MIXED"
+        return ace_topology_of([suit for suit in Suit if HOLDING_ACE[self.suit_masks[suit]]])
 
     @property
     def is_balanced(self) -> bool:
@@ -178,51 +168,30 @@ class Hand:
         lengths = sorted(self.distribution.values())
         # Possible balanced shapes: 4333, 4432, 5332
         # (Though some consider 5422 semi-balanced, stick to strict for now)
-        return lengths in [[3, 3, 3, 4], [2, 3, 4, 4], [2, 3, 3, 5]]
+        return lengths in BALANCED_SHAPES
 
+    @staticmethod
     def from_string(s: str) -> 'Hand':
         """
-        Parse string like 'S:AKJ H:T98 ...' or 'SAK2 HK432...' or space separated cards 'SA SK ...'
-        Simplified: 'SA K5 C2...'
-        Let's support: "SAK32 HK3 DK2 C432"
+        Parse "SAK32 HK3 DK2 C432" (suit followed by its ranks) or single
+        cards "SA SK ..." / "AS KS ...". parse_hand() is the fast path and
+        also reads PBN "AK32.K3.K2.432".
         """
         cards = []
-        # Remove "S:", "H:" etc formatting if present, or just parse simple format
-        # Implementation: Input like "SAK43 CAK..." -> split by suit char?
-        # Simpler Input: List of cards like "SA SK SQ ..." or "AK43.KD.T9.872" (PBN-ish)
-        # Let's support "SA SK SQ ..." for now
-        
-        # If input is "SAK..." style
-        # "S A K 3 2 H K 3 D K 2 C 4 3 2"
-        # Let's stick to "SA SK S3 S2 HK H3 DK D2 C4 C3 C2" space separated
-        items = s.split()
-        suits = {'C': Suit.CLUBS, 'D': Suit.DIAMONDS, 'H': Suit.HEARTS, 'S': Suit.SPADES}
-        ranks = {
-            '2': Rank.TWO, '3': Rank.THREE, '4': Rank.FOUR, '5': Rank.FIVE,
-            '6': Rank.SIX, '7': Rank.SEVEN, '8': Rank.EIGHT, '9': Rank.NINE,
-            'T': Rank.TEN, 'J': Rank.JACK, 'Q': Rank.QUEEN, 'K': Rank.KING, 'A': Rank.ACE
-        }
-        
-        for item in items:
-            # Check if using Suit + Ranks format (e.g. "SAK43")
-            if item[0] in suits and len(item) > 1:
-                # Iterate over rest of chars as ranks
-                current_suit = suits[item[0]]
+        for item in s.split():
+            # Suit + ranks format (e.g. "SAK43"); unknown rank characters are ignored.
+            if item[0] in _CARD_SUITS and len(item) > 1:
+                current_suit = _CARD_SUITS[item[0]]
                 for r_char in item[1:]:
-                    if r_char not in ranks:
-                         # Fallback or error? ignore
-                         continue
-                    cards.append(Card(current_suit, ranks[r_char]))
+                    if r_char in _CARD_RANKS:
+                        cards.append(Card(current_suit, _CARD_RANKS[r_char]))
             else:
-                # Assume single card format e.g. "AS", "2C"
-                suit_char = item[-1] 
-                rank_str = item[:-1]
-                
-                if suit_char in suits:
-                    cards.append(Card(suits[suit_char], ranks[rank_str]))
+                # Single card format e.g. "AS", "2C"
+                suit_char = item[-1]
+                if suit_char in _CARD_SUITS:
+                    cards.append(Card(_CARD_SUITS[suit_char], _CARD_RANKS[item[:-1]]))
                 else:
                     raise ValueError(f"Unknown card format: {item}")
-            
         return Hand(cards)
 
     @staticmethod
@@ -231,6 +200,309 @@ class Hand:
         random.shuffle(deck)
         return Hand(deck[:13])
 
+def card_bit(card: Card) -> int:
+    """Bit of a card inside the 52-bit deck mask (suit * 13 + rank - 2)."""
+    return 1 << (card.suit.value * 13 + card.rank.value - 2)
+
+def ace_topology_of(ace_suits: List[Suit]) -> str:
+    """Topology of a hand given the suits holding its aces (see Hand.ace_topology)."""
+    if len(ace_suits) != 2:
+        return "NONE"
+    s1, s2 = ace_suits
+    if (s1 in (Suit.SPADES, Suit.HEARTS)) == (s2 in (Suit.SPADES, Suit.HEARTS)):
+        return "RANK"
+    if (s1 in (Suit.SPADES, Suit.CLUBS)) == (s2 in (Suit.SPADES, Suit.CLUBS)):
+        return "COLOR"
+    return "MIXED"
+
+class CompactHand:
+    """
+    Allocation-free hand: four 13-bit suit holdings, indexed by Suit.
+    All evaluation features are computed once at construction, so reading
+    hcp/total_points/controls/... is a plain attribute access. Exposes the
+    same API as Hand; `cards` and `by_suit` are only built when asked for.
+    """
+    __slots__ = ("suit_masks", "hcp", "total_points", "controls", "ace_count",
+                 "ace_topology", "is_balanced", "_lengths")
+
+    def __init__(self, suit_masks: Tuple[int, int, int, int]):
+        self.suit_masks = c, d, h, s = tuple(suit_masks)
+        self._lengths = lengths = (HOLDING_LENGTH[c], HOLDING_LENGTH[d], HOLDING_LENGTH[h], HOLDING_LENGTH[s])
+        self.hcp = HOLDING_HCP[c] + HOLDING_HCP[d] + HOLDING_HCP[h] + HOLDING_HCP[s]
+        self.total_points = (HOLDING_TOTAL_POINTS[c] + HOLDING_TOTAL_POINTS[d] +
+                             HOLDING_TOTAL_POINTS[h] + HOLDING_TOTAL_POINTS[s])
+        self.controls = HOLDING_CONTROLS[c] + HOLDING_CONTROLS[d] + HOLDING_CONTROLS[h] + HOLDING_CONTROLS[s]
+        self.ace_count = aces = HOLDING_ACE[c] + HOLDING_ACE[d] + HOLDING_ACE[h] + HOLDING_ACE[s]
+        self.ace_topology = "NONE" if aces != 2 else ace_topology_of(
+            [suit for suit in _SUITS if HOLDING_ACE[self.suit_masks[suit]]])
+        self.is_balanced = sorted(lengths) in BALANCED_SHAPES
+
+    @staticmethod
+    def from_mask(mask: int) -> 'CompactHand':
+        """Build from a 52-bit deck mask (see card_bit)."""
+        return CompactHand(tuple((mask >> (13 * s)) & SUIT_MASK for s in Suit))
+
+    @staticmethod
+    def from_cards(cards: List[Card]) -> 'CompactHand':
+        masks = [0, 0, 0, 0]
+        for c in cards:
+            masks[c.suit] |= 1 << (c.rank.value - 2)
+        return CompactHand(tuple(masks))
+
+    @staticmethod
+    def from_hand(hand: Hand) -> 'CompactHand':
+        return CompactHand.from_cards(hand.cards)
+
+    @staticmethod
+    def from_string(s: str) -> 'CompactHand':
+        return parse_hand(s)
+
+    @staticmethod
+    def random() -> 'CompactHand':
+        mask = 0
+        for i in random.sample(range(52), 13):
+            mask |= 1 << i
+        return CompactHand.from_mask(mask)
+
+    @property
+    def mask(self) -> int:
+        m = 0
+        for s in Suit:
+            m |= self.suit_masks[s] << (13 * s)
+        return m
+
+    def length(self, suit: Suit) -> int:
+        return self._lengths[suit]
+
+    @property
+    def distribution(self) -> Dict[Suit, int]:
+        return {s: self._lengths[s] for s in Suit}
+
+    @property
+    def by_suit(self) -> Dict[Suit, List[Card]]:
+        return {s: [Card(s, Rank(b + 2)) for b in range(12, -1, -1) if self.suit_masks[s] >> b & 1]
+                for s in Suit}
+
+    @property
+    def cards(self) -> List[Card]:
+        by_suit = self.by_suit
+        return [c for s in reversed(Suit) for c in by_suit[s]]
+
+    def to_hand(self) -> Hand:
+        return Hand(self.cards)
+
+    def __eq__(self, other):
+        return isinstance(other, CompactHand) and self.suit_masks == other.suit_masks
+
+    def __hash__(self):
+        return hash(self.suit_masks)
+
+# --- Fast text parsing ---------------------------------------------------------
+# One str.translate pass upper-cases the text and puts a space before every
+# suit letter, so "SAK32HK3" and "sak32 hk3" both split into per-suit tokens;
+# each rank string is then decoded to its 13-bit holding through a memo (a
+# corpus only ever holds a few thousand distinct rank strings).
+_SPLIT_SUITS = str.maketrans({**{c: " " + c for c in "SHDC"}, **{c.lower(): " " + c for c in "SHDC"},
+                              **{c.lower(): c for c in "TJQKA"}})
+_UPPER_RANKS = str.maketrans({c.lower(): c for c in "TJQKA"})
+_SUIT_INDEX = {"C": 0, "D": 1, "H": 2, "S": 3}
+_RANK_BIT = {c: 1 << i for i, c in enumerate("23456789TJQKA")}
+_HOLDINGS: Dict[str, int] = {"": 0, "-": 0}
+_HOLDINGS_LIMIT = 1 << 16
+
+def _holding(ranks: str) -> int:
+    """13-bit holding of a rank string such as "AKT2" (unknown characters are ignored)."""
+    mask = _HOLDINGS.get(ranks)
+    if mask is None:
+        mask = 0
+        for c in ranks.replace("10", "T"):
+            mask |= _RANK_BIT.get(c, 0)
+        if len(_HOLDINGS) < _HOLDINGS_LIMIT:
+            _HOLDINGS[ranks] = mask
+    return mask
+
+def parse_hand(text: str) -> CompactHand:
+    """
+    Parse one hand straight into a CompactHand. Accepts the Hand.from_string
+    forms ("SAK32 HK3 DK2 C432", also unspaced as in LIN, or single cards
+    "SA SK ..." / "AS KS ...") and PBN "AK32.K3.K2.432" (spades first,
+    "-" or nothing for a void).
+    """
+    if "." in text:
+        suits = text.translate(_UPPER_RANKS).split(".")
+        if len(suits) != 4:
+            raise ValueError(f"Expected four suits in {text!r}")
+        spades, hearts, diamonds, clubs = suits
+        return CompactHand((_holding(clubs.strip()), _holding(diamonds.strip()),
+                            _holding(hearts.strip()), _holding(spades.strip())))
+    masks = [0, 0, 0, 0]
+    stripped = text.lstrip()
+    if stripped[:1].upper() in _SUIT_INDEX:
+        for token in stripped.translate(_SPLIT_SUITS).split():
+            masks[_SUIT_INDEX[token[0]]] |= _holding(token[1:])
+    else:
+        for token in text.upper().split():
+            suit = _SUIT_INDEX.get(token[-1])
+            if suit is None:
+                raise ValueError(f"Unknown card format: {token}")
+            masks[suit] |= _holding(token[:-1])
+    return CompactHand(tuple(masks))
+
+def parse_deal(text: str) -> Dict[Seat, CompactHand]:
+    """
+    Parse a PBN deal "N:AKQ2.K3.A52.QJ43 JT9.AQ42.KQ3.T92 ..." into the hands
+    it lists, clockwise from the named seat; "-" hands are left out.
+    """
+    first, _, hands = text.partition(":")
+    if not hands:
+        first, hands = "N", text
+    seat = "NESW".find(first.strip().upper())
+    if seat < 0 or len(first.strip()) != 1:
+        raise ValueError(f"Unknown first seat in deal {text!r}")
+    return {Seat((seat + i) % 4): parse_hand(hand) for i, hand in enumerate(hands.split()) if hand != "-"}
+
+def parse_many(lines: Iterable[str]) -> Iterator[CompactHand]:
+    """
+    parse_hand over a list or a stream of strings (e.g. an open file), one
+    hand per item; blank items and "#" comments are skipped.
+    """
+    for line in lines:
+        line = line.strip()
+        if line and line[0] != "#":
+            yield parse_hand(line)
+
+# Integer codes for ace topology in batch feature columns.
+ACE_TOPOLOGIES = ("NONE", "RANK", "COLOR", "MIXED")
+ACE_TOPOLOGY_CODES = {name: code for code, name in enumerate(ACE_TOPOLOGIES)}
+
+# Column layout of HandBatch.feature_matrix().
+FEATURE_COLUMNS = ("hcp", "total_points", "controls", "ace_count", "ace_topology",
+                   "len_c", "len_d", "len_h", "len_s", "balanced")
+
+def hand_features(hand) -> Tuple:
+    """
+    Everything a rule can look at, as a tuple in FEATURE_COLUMNS order
+    (ace_topology by name). Works for Hand and CompactHand alike.
+    """
+    return (hand.hcp, hand.total_points, hand.controls, hand.ace_count, hand.ace_topology,
+            hand.length(Suit.CLUBS), hand.length(Suit.DIAMONDS), hand.length(Suit.HEARTS),
+            hand.length(Suit.SPADES), hand.is_balanced)
+
+_holding_columns = None
+
+def _holding_array():
+    """(8192, 5) int16 array of the HOLDING_* tables (hcp, controls, ace, length, total points)."""
+    global _holding_columns
+    if _holding_columns is None:
+        _holding_columns = np.array([HOLDING_HCP, HOLDING_CONTROLS, HOLDING_ACE, HOLDING_LENGTH,
+                                     HOLDING_TOTAL_POINTS], dtype=np.int16).T.copy()
+    return _holding_columns
+
+class HandBatch:
+    """
+    N hands held as an (N, 4) uint16 array of suit holdings (same bit layout
+    as CompactHand). Every feature is computed once, column-wise, at
+    construction: hcp, total_points, controls, ace_count, ace_topology
+    (codes from ACE_TOPOLOGIES), lengths (N, 4) and balanced.
+    """
+    def __init__(self, suit_masks):
+        if np is None:
+            raise ImportError("HandBatch requires numpy")
+        masks = np.ascontiguousarray(suit_masks, dtype=np.uint16).reshape(-1, 4)
+        self.suit_masks = masks
+
+        # One gather through the holding tables: (N, 4, 5).
+        per_suit = _holding_array()[masks]
+        lengths = per_suit[:, :, 3]
+        aces = per_suit[:, :, 2]
+
+        self.lengths = lengths
+        self.hcp = per_suit[:, :, 0].sum(axis=1)
+        self.controls = per_suit[:, :, 1].sum(axis=1)
+        self.ace_count = aces.sum(axis=1)
+        self.total_points = per_suit[:, :, 4].sum(axis=1)
+
+        # Ace topology (only defined for exactly two aces), see Hand.ace_topology.
+        majors = aces[:, Suit.HEARTS] + aces[:, Suit.SPADES]
+        blacks = aces[:, Suit.CLUBS] + aces[:, Suit.SPADES]
+        topology = np.where(majors != 1, ACE_TOPOLOGY_CODES["RANK"],
+                            np.where(blacks != 1, ACE_TOPOLOGY_CODES["COLOR"], ACE_TOPOLOGY_CODES["MIXED"]))
+        self.ace_topology = np.where(self.ace_count == 2, topology, ACE_TOPOLOGY_CODES["NONE"]).astype(np.int16)
+
+        # Balanced: 4333, 4432 or 5332.
+        shape = np.sort(lengths, axis=1)
+        balanced = np.zeros(len(masks), dtype=bool)
+        for pattern in BALANCED_SHAPES:
+            balanced |= (shape == pattern).all(axis=1)
+        self.balanced = balanced
+
+    @staticmethod
+    def from_hands(hands) -> 'HandBatch':
+        """Build from Hand or CompactHand objects."""
+        return HandBatch([h.suit_masks if isinstance(h, CompactHand) else CompactHand.from_hand(h).suit_masks
+                          for h in hands])
+
+    def __len__(self):
+        return len(self.suit_masks)
+
+    def __getitem__(self, i: int) -> CompactHand:
+        return CompactHand(tuple(int(m) for m in self.suit_masks[i]))
+
+    def length(self, suit: Suit):
+        return self.lengths[:, suit]
+
+    def column(self, name: str):
+        """Feature column by FEATURE_COLUMNS name."""
+        if name.startswith("len_"):
+            return self.lengths[:, "cdhs".index(name[-1])]
+        return getattr(self, name)
+
+    def feature_matrix(self):
+        """(N, len(FEATURE_COLUMNS)) int16 matrix, one row per hand."""
+        return np.column_stack([self.hcp, self.total_points, self.controls, self.ace_count,
+                                self.ace_topology, self.lengths, self.balanced]).astype(np.int16)
+
+class DealGenerator:
+    """
+    Seedable bulk dealer of complete deals. Each deal is a random permutation
+    of the 52 cards split 13 per seat, so all four hands are consistent and
+    no cards are thrown away. The same seed and chunk size reproduce the same
+    stream of deals.
+    """
+    def __init__(self, seed=None):
+        if np is None:
+            raise ImportError("DealGenerator requires numpy")
+        self.rng = np.random.default_rng(seed)
+
+    def deal_masks(self, n: int):
+        """(n, 4, 4) uint16 array of suit holdings indexed by [deal, Seat, Suit]."""
+        # Ranking 52 random keys gives a uniform permutation; position // 13 is the owner.
+        order = self.rng.random((n, 52)).argsort(axis=1)
+        owners = (order // 13).astype(np.uint8).reshape(n, 4, 13)  # [deal, suit, rank - 2] -> seat
+        weights = (1 << np.arange(13)).astype(np.uint16)
+        masks = np.empty((n, 4, 4), dtype=np.uint16)
+        for seat in Seat:
+            masks[:, seat, :] = (owners == seat).astype(np.uint16) @ weights
+        return masks
+
+    def batch(self, n: int) -> Dict[Seat, HandBatch]:
+        """n deals as one HandBatch per seat (row i of each batch is deal i)."""
+        masks = self.deal_masks(n)
+        return {seat: HandBatch(masks[:, seat]) for seat in Seat}
+
+    def deals(self, n: Optional[int] = None, chunk: int = 4096) -> Iterator[Dict[Seat, CompactHand]]:
+        """Stream n deals (endlessly if n is None), dealt `chunk` at a time."""
+        remaining = n
+        while remaining is None or remaining > 0:
+            size = chunk if remaining is None else min(chunk, remaining)
+            for deal in self.deal_masks(size).tolist():
+                yield {seat: CompactHand(deal[seat]) for seat in Seat}
+            if remaining is not None:
+                remaining -= size
+
+    def deal(self) -> Dict[Seat, CompactHand]:
+        return next(self.deals(1))
+
 class CallType(Enum):
     BID = 1
     PASS = 2
@@ -264,3 +536,14 @@ class Call:
                 self.type == other.type and 
                 self.level == other.level and 
                 self.strain == other.strain)
+
+def auction_over(history: List[Call]) -> bool:
+    """Four passes to start, or three passes after any other call."""
+    if len(history) < 4:
+        return False
+    return all(c.type == CallType.PASS for c in history[-3:])
+
+def auction_context(history: List[Call]) -> str:
+    """The non-pass calls so far, in DSL notation ("OPEN" before any)."""
+    calls = [str(c) for c in history if c.type != CallType.PASS]
+    return " - ".join(calls) if calls else "OPEN"
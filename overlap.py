@@ -0,0 +1,149 @@
+import argparse
+import time
+from typing import Dict, List, Tuple
+from bid.models import FEATURE_COLUMNS, np
+from bid.system import BiddingSystem, Rule
+from bid.constraints import LENGTH_FEATURES
+from bid.probability import feature_table
+from bid.inference import random_hands
+from bid.translator import SystemTranslator
+
+HCP = FEATURE_COLUMNS.index("hcp")
+
+class ContextReport:
+    """
+    How the rules triggered by one auction context split the hand space.
+    All masses are probabilities for a random hand (not conditioned on the
+    auction so far). Per rule: `matches` is the mass its constraints
+    accept, `claimed` the mass it actually bids under first-match. `overlaps`
+    maps (earlier rule, later rule) to the mass both accept; `gap` is the
+    mass no rule accepts, `gap_regions` its heaviest HCP values.
+    """
+    def __init__(self, auction: str, rules: List[Rule]):
+        self.auction = auction
+        self.rules = rules
+        self.matches: Dict[int, float] = {}
+        self.claimed: Dict[int, float] = {}
+        self.overlaps: Dict[Tuple[int, int], float] = {}
+        self.overlap = 0.0  # mass accepted by two rules or more
+        self.gap = 0.0
+        self.gap_regions: List[Tuple[str, float]] = []
+
+    @property
+    def shadowed(self) -> List[Rule]:
+        """Rules that accept some hands but never get to bid them."""
+        return [r for i, r in enumerate(self.rules) if self.matches[i] > 0 and self.claimed[i] == 0]
+
+    @property
+    def dead(self) -> List[Rule]:
+        """Rules whose constraints no hand meets."""
+        return [r for i, r in enumerate(self.rules) if self.matches[i] == 0]
+
+class OverlapReport:
+    def __init__(self, contexts: List[ContextReport], method: str, elapsed: float):
+        self.contexts = contexts
+        self.method = method
+        self.elapsed = elapsed
+
+    def format(self, top: int = 10) -> str:
+        lines = [f"{len(self.contexts)} auction contexts ({self.method}) in {self.elapsed:.2f}s"]
+        shadowed = [(c, r) for c in self.contexts for r in c.shadowed]
+        lines.append(f"\n=== Shadowed rules ({len(shadowed)}) ===")
+        for context, rule in shadowed:
+            lines.append(f"{context.auction}: {rule.call} ({rule.description}) {rule.constraints}")
+        dead = [(c, r) for c in self.contexts for r in c.dead]
+        lines.append(f"\n=== Rules no hand meets ({len(dead)}) ===")
+        for context, rule in dead:
+            lines.append(f"{context.auction}: {rule.call} {rule.constraints}")
+
+        lines.append(f"\n=== Largest overlaps (top {top}) ===")
+        pairs = [(mass, c, i, j) for c in self.contexts for (i, j), mass in c.overlaps.items()]
+        for mass, context, i, j in sorted(pairs, key=lambda p: -p[0])[:top]:
+            lines.append(f"{context.auction}: {context.rules[i].call} over {context.rules[j].call}: {mass * 100:.2f}%")
+
+        lines.append(f"\n=== Largest gaps (top {top}) ===")
+        for context in sorted(self.contexts, key=lambda c: -c.gap)[:top]:
+            regions = ", ".join(f"{region} {mass * 100:.1f}%" for region, mass in context.gap_regions[:3])
+            lines.append(f"{context.auction}: {context.gap * 100:.1f}% unclaimed ({regions})")
+        return "\n".join(lines)
+
+def auction_contexts(system: BiddingSystem) -> List[Tuple[str, List[Rule]]]:
+    """(label, rules) for every auction context of the system's automaton, in DSL notation."""
+    automaton = system.automaton
+    contexts = []
+    if automaton.open_rules:
+        contexts.append(("OPEN", automaton.open_rules))
+    if automaton.late_rules:
+        contexts.append(("PASSED OUT", automaton.late_rules))
+    stack = [((), automaton.root)]
+    while stack:
+        path, node = stack.pop()
+        if node.rules:
+            contexts.append((" - ".join(path), node.rules))
+        for (call, is_direct), child in sorted(node.children.items(), key=lambda item: str(item[0][0]), reverse=True):
+            stack.append((path + (f"({call})" if is_direct else str(call),), child))
+    return contexts
+
+def analyze_context(auction: str,
+                    rules: List[Rule],
+                    method: str = "exact",
+                    samples: int = 20000,
+                    seed=None,
+                    sample=None) -> ContextReport:
+    """
+    Overlap / gap masses for one context, over the exact feature table or a
+    random sample (`sample`: a feature matrix to reuse across contexts).
+    """
+    report = ContextReport(auction, rules)
+    if method == "exact":
+        needed = {"hcp", *LENGTH_FEATURES}
+        for rule in rules:
+            needed.update(rule.constraints.compiled.features)
+        features, weights = feature_table(tuple(sorted(needed)))
+    elif method == "sample":
+        features = sample if sample is not None else random_hands(samples, seed=seed).feature_matrix()
+        weights = np.ones(len(features), dtype=np.int64)
+    else:
+        raise ValueError(f"Unknown analysis method: {method}")
+    total = float(weights.sum())
+    mass = lambda mask: float(weights[mask].sum()) / total
+
+    masks = [rule.constraints.compiled.mask(features) for rule in rules]
+    claimed = np.zeros(len(features), dtype=bool)
+    accepted = np.zeros(len(features), dtype=np.int16)
+    for i, mask in enumerate(masks):
+        report.matches[i] = mass(mask)
+        report.claimed[i] = mass(mask & ~claimed)
+        claimed |= mask
+        accepted += mask
+        for j in range(i):
+            both = mass(masks[j] & mask)
+            if both > 0:
+                report.overlaps[(j, i)] = both
+    report.overlap = mass(accepted > 1)
+    gap = ~claimed
+    report.gap = mass(gap)
+    if report.gap > 0:
+        by_hcp = np.bincount(features[gap, HCP], weights=weights[gap], minlength=38) / total
+        report.gap_regions = [(f"HCP {hcp}", float(by_hcp[hcp])) for hcp in np.argsort(-by_hcp, kind="stable")[:5]
+                              if by_hcp[hcp] > 0]
+    return report
+
+def analyze_system(system: BiddingSystem,
+                   method: str = "exact",
+                   samples: int = 20000,
+                   seed=None) -> OverlapReport:
+    start = time.perf_counter()
+    sample = random_hands(samples, seed=seed).feature_matrix() if method == "sample" else None
+    contexts = [analyze_context(auction, rules, method, samples, seed, sample)
+                for auction, rules in auction_contexts(system)]
+    return OverlapReport(contexts, method, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rule overlap / gap analysis of a DSL bidding system")
+    parser.add_argument("dsl")
+    parser.add_argument("--method", choices=("exact", "sample"), default="exact")
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    print(analyze_system(SystemTranslator().load(args.dsl), args.method, args.samples).format(args.top))
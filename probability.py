@@ -0,0 +1,251 @@
+from functools import lru_cache
+from itertools import permutations
+from math import comb
+from typing import Dict, FrozenSet, Tuple
+from bid.models import (ACE_TOPOLOGY_CODES, BALANCED_SHAPES, FEATURE_COLUMNS, HOLDING_ACE, HOLDING_CONTROLS,
+                        HOLDING_HCP, HOLDING_LENGTH, HOLDING_TOTAL_POINTS, SUIT_MASK, Suit, ace_topology_of, np)
+from bid.constraints import HandConstraints, LENGTH_FEATURES, nontrivial_checks
+
+FULL_DECK = (SUIT_MASK,) * 4
+
+# Additive features tracked by the counting DP, with the size of their axis.
+# "extra" is total points minus HCP (shortness less short honors), at most 12.
+_AXES = {"hcp": 38, "extra": 13, "controls": 13}
+
+def count_hands(constraints: HandConstraints,
+                available: Tuple[int, int, int, int] = FULL_DECK,
+                hand_size: int = 13) -> int:
+    """
+    Exact number of `hand_size`-card hands drawn from `available` (four 13-bit
+    suit holdings, as CompactHand.suit_masks; the full deck by default) that
+    satisfy the constraints. No sampling: per-suit holdings are grouped into
+    classes (length, HCP, controls, ...) and combined suit by suit with a
+    dynamic program over the constrained features only. Cached per
+    constraint, so repeated questions are free.
+    """
+    return _count(tuple(nontrivial_checks(constraints)), tuple(available), hand_size)
+
+def probability(constraints: HandConstraints,
+                available: Tuple[int, int, int, int] = FULL_DECK,
+                hand_size: int = 13) -> float:
+    """Fraction of the hands counted by count_hands that satisfy the constraints."""
+    total = comb(sum(m.bit_count() for m in available), hand_size)
+    return count_hands(constraints, available, hand_size) / total if total else 0.0
+
+def remaining_deck(*suit_masks: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """The cards not in any of the given holdings, e.g. remaining_deck(my_hand.suit_masks)."""
+    taken = [0, 0, 0, 0]
+    for masks in suit_masks:
+        for suit in Suit:
+            taken[suit] |= masks[suit]
+    return tuple(SUIT_MASK & ~t for t in taken)
+
+@lru_cache(maxsize=None)
+def _suit_classes(available: int) -> Dict[Tuple[int, int, int, int, int], int]:
+    """(length, hcp, extra, controls, ace) -> number of sub-holdings of `available`."""
+    classes: Dict[Tuple[int, int, int, int, int], int] = {}
+    holding = available
+    while True:
+        key = (HOLDING_LENGTH[holding], HOLDING_HCP[holding],
+               HOLDING_TOTAL_POINTS[holding] - HOLDING_HCP[holding],
+               HOLDING_CONTROLS[holding], HOLDING_ACE[holding])
+        classes[key] = classes.get(key, 0) + 1
+        if holding == 0:
+            return classes
+        holding = (holding - 1) & available
+
+@lru_cache(maxsize=4096)
+def _count(checks: Tuple, available: Tuple[int, int, int, int], hand_size: int) -> int:
+    if np is None:
+        raise ImportError("count_hands requires numpy")
+    checks = dict(checks)
+    balanced = checks.pop("balanced", None)
+    if balanced is False:
+        # Not balanced: everything else, less the balanced hands.
+        rest = tuple(checks.items())
+        return _count(rest, available, hand_size) - _count(rest + (("balanced", True),), available, hand_size)
+
+    ranges = {f: checks[f] for f in ("hcp", "total_points", "controls") if f in checks}
+    axes = []
+    if "hcp" in ranges or "total_points" in ranges:
+        axes.append("hcp")
+    if "total_points" in ranges:
+        axes.append("extra")
+    if "controls" in ranges:
+        axes.append("controls")
+
+    lengths = [range(*_clip(checks.get(LENGTH_FEATURES[s], (0, 13)))) for s in Suit]
+    if balanced:
+        shapes = {p for shape in BALANCED_SHAPES for p in permutations(shape)}
+        length_sets = [tuple({n} & set(lengths[s]) for s, n in zip(Suit, shape)) for shape in sorted(shapes)]
+    else:
+        length_sets = [tuple(set(lengths[s]) for s in Suit)]
+
+    if "ace_count" in checks or "ace_topology" in checks:
+        aces = checks.get("ace_count", frozenset(range(5)))
+        topologies = checks.get("ace_topology", frozenset(("NONE", "RANK", "COLOR", "MIXED")))
+        ace_sets = []
+        for flags in range(16):
+            ace_suits = [s for s in Suit if flags >> s & 1]
+            if len(ace_suits) in aces and ace_topology_of(ace_suits) in topologies:
+                ace_sets.append(tuple({flags >> s & 1} for s in Suit))
+    else:
+        ace_sets = [({0, 1},) * 4]
+
+    total = 0
+    for allowed_lengths in length_sets:
+        if not all(allowed_lengths):
+            continue
+        for allowed_aces in ace_sets:
+            kernels = [_kernel(available[s], allowed_lengths[s], allowed_aces[s], tuple(axes)) for s in Suit]
+            total += _combine(kernels, hand_size, axes, ranges)
+    return total
+
+def _clip(bounds: Tuple[int, int]) -> Tuple[int, int]:
+    """(lo, hi) inclusive to a range() over 0-13."""
+    return max(0, bounds[0]), min(13, bounds[1]) + 1
+
+def _kernel(available: int, lengths, aces, axes: Tuple[str, ...]) -> Dict[Tuple[int, ...], int]:
+    """Suit classes allowed by the length / ace restrictions, projected on (length, *axes)."""
+    kernel: Dict[Tuple[int, ...], int] = {}
+    for (length, hcp, extra, controls, ace), ways in _suit_classes(available).items():
+        if length in lengths and ace in aces:
+            values = {"hcp": hcp, "extra": extra, "controls": controls}
+            key = (length,) + tuple(values[a] for a in axes)
+            kernel[key] = kernel.get(key, 0) + ways
+    return kernel
+
+def _combine(kernels, hand_size: int, axes, ranges) -> int:
+    """Convolve the four suit kernels and count the hands of hand_size cards in range."""
+    shape = (hand_size + 1,) + tuple(_AXES[a] for a in axes)
+    state = np.zeros(shape, dtype=np.int64)
+    state[(0,) * len(shape)] = 1
+    for kernel in kernels:
+        new = np.zeros(shape, dtype=np.int64)
+        for key, ways in kernel.items():
+            if key[0] > hand_size:
+                continue
+            target = tuple(slice(k, None) for k in key)
+            source = tuple(slice(0, n - k) for n, k in zip(shape, key))
+            new[target] += ways * state[source]
+        state = new
+
+    counts = state[hand_size]
+    grids = np.indices(counts.shape) if axes else []
+    value = dict(zip(axes, grids))
+    keep = np.ones(counts.shape, dtype=bool)
+    if "hcp" in ranges:
+        keep &= (value["hcp"] >= ranges["hcp"][0]) & (value["hcp"] <= ranges["hcp"][1])
+    if "controls" in ranges:
+        keep &= (value["controls"] >= ranges["controls"][0]) & (value["controls"] <= ranges["controls"][1])
+    if "total_points" in ranges:
+        tp = value["hcp"] + value["extra"]
+        keep &= (tp >= ranges["total_points"][0]) & (tp <= ranges["total_points"][1])
+    return int(counts[keep].sum())
+
+def feature_table(features: Tuple[str, ...] = FEATURE_COLUMNS,
+                  available: Tuple[int, int, int, int] = FULL_DECK,
+                  hand_size: int = 13):
+    """
+    Exact joint distribution of hand features: (matrix, counts) with one
+    FEATURE_COLUMNS row per distinct combination of `features` and the
+    number of hands showing it. Suit lengths (and so balanced) are always
+    resolved; columns neither asked for nor implied are left at 0. The
+    table grows with the features asked for: hcp and lengths alone give
+    ~15k rows, every feature ~330k. Cached per (features, deck, hand size).
+    table_columns(features) lists the columns it resolves.
+    """
+    needed = set(features)
+    axes = []
+    if needed & {"hcp", "total_points"}:
+        axes.append("hcp")
+    if "total_points" in needed:
+        axes.append("extra")
+    if "controls" in needed:
+        axes.append("controls")
+    if needed & {"ace_count", "ace_topology"}:
+        axes.append("aces")
+    return _feature_table(tuple(axes), tuple(available), hand_size)
+
+def table_columns(features: Tuple[str, ...]) -> FrozenSet[str]:
+    """The FEATURE_COLUMNS feature_table(features) fills in; the others stay 0."""
+    needed = set(features)
+    columns = {*LENGTH_FEATURES, "balanced"}
+    if needed & {"hcp", "total_points"}:
+        columns.add("hcp")
+    if "total_points" in needed:
+        columns.add("total_points")
+    if "controls" in needed:
+        columns.add("controls")
+    if needed & {"ace_count", "ace_topology"}:
+        columns.update(("ace_count", "ace_topology"))
+    return frozenset(columns)
+
+# Axis sizes for feature_table; "aces" is the bitmask of suits holding an ace.
+_TABLE_AXES = dict(_AXES, aces=16)
+
+@lru_cache(maxsize=64)
+def _feature_table(axes: Tuple[str, ...], available: Tuple[int, int, int, int], hand_size: int):
+    if np is None:
+        raise ImportError("feature_table requires numpy")
+    sizes = [_TABLE_AXES[a] for a in axes]
+    strides = [int(np.prod(sizes[i + 1:], dtype=np.int64)) for i in range(len(axes))]
+    flat_size = int(np.prod(sizes, dtype=np.int64))
+
+    # Per (suit, length): {offset in the flattened point space: holdings}. Every
+    # axis is sized for the whole hand, so adding offsets never carries over.
+    kernels = {}
+    for suit in Suit:
+        for (length, hcp, extra, controls, ace), ways in _suit_classes(available[suit]).items():
+            values = {"hcp": hcp, "extra": extra, "controls": controls, "aces": ace << suit}
+            offset = sum(values[a] * stride for a, stride in zip(axes, strides))
+            kernel = kernels.setdefault((suit, length), {})
+            kernel[offset] = kernel.get(offset, 0) + ways
+
+    rows, counts = [], []
+    shape_values = np.indices(sizes).reshape(len(axes), -1) if axes else np.zeros((0, 1), dtype=np.int64)
+    for pattern in _length_patterns(hand_size):
+        if not all((suit, n) in kernels for suit, n in zip(Suit, pattern)):
+            continue
+        state = np.zeros(flat_size, dtype=np.int64)
+        for offset, ways in kernels[(Suit.CLUBS, pattern[0])].items():
+            state[offset] += ways
+        for suit in (Suit.DIAMONDS, Suit.HEARTS, Suit.SPADES):
+            new = np.zeros(flat_size, dtype=np.int64)
+            for offset, ways in kernels[(suit, pattern[suit])].items():
+                new[offset:] += ways * state[:flat_size - offset]
+            state = new
+        nonzero = np.nonzero(state)[0]
+        if not len(nonzero):
+            continue
+        block = np.zeros((len(nonzero), len(FEATURE_COLUMNS)), dtype=np.int16)
+        value = dict(zip(axes, shape_values[:, nonzero])) if axes else {}
+        if "hcp" in value:
+            block[:, FEATURE_COLUMNS.index("hcp")] = value["hcp"]
+        if "extra" in value:
+            block[:, FEATURE_COLUMNS.index("total_points")] = value["hcp"] + value["extra"]
+        if "controls" in value:
+            block[:, FEATURE_COLUMNS.index("controls")] = value["controls"]
+        if "aces" in value:
+            block[:, FEATURE_COLUMNS.index("ace_count")] = [_ACE_COUNTS[m] for m in value["aces"]]
+            block[:, FEATURE_COLUMNS.index("ace_topology")] = [_ACE_TOPOLOGY_BY_MASK[m] for m in value["aces"]]
+        for suit, column in zip(Suit, LENGTH_FEATURES):
+            block[:, FEATURE_COLUMNS.index(column)] = pattern[suit]
+        block[:, FEATURE_COLUMNS.index("balanced")] = sorted(pattern) in BALANCED_SHAPES
+        rows.append(block)
+        counts.append(state[nonzero])
+    if not rows:
+        return np.zeros((0, len(FEATURE_COLUMNS)), dtype=np.int16), np.zeros(0, dtype=np.int64)
+    return np.concatenate(rows), np.concatenate(counts)
+
+def _length_patterns(hand_size: int):
+    """Every (clubs, diamonds, hearts, spades) length pattern of hand_size cards."""
+    for c in range(min(13, hand_size) + 1):
+        for d in range(min(13, hand_size - c) + 1):
+            for h in range(min(13, hand_size - c - d) + 1):
+                s = hand_size - c - d - h
+                if s <= 13:
+                    yield (c, d, h, s)
+
+_ACE_COUNTS = [m.bit_count() for m in range(16)]
+_ACE_TOPOLOGY_BY_MASK = [ACE_TOPOLOGY_CODES[ace_topology_of([s for s in Suit if m >> s & 1])] for m in range(16)]
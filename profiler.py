@@ -0,0 +1,158 @@
+import argparse
+import time
+from collections import Counter
+from typing import List, Optional, Set, Tuple
+from bid.models import Call, CallType, DealGenerator, Hand, Seat
+from bid.system import AuctionTrigger, BiddingSystem, Rule
+from bid.probability import count_hands
+from bid.tracing import rule_key
+from bid.translator import SystemTranslator, save_compiled_for
+
+class RuleProfiler:
+    """
+    Per-rule hit counts of one system over real or simulated bidding. Used
+    like a Tracer (Engine(system, tracer=RuleProfiler(system))), it makes
+    the same first-match choice as BiddingSystem.get_bid but evaluates every
+    triggered rule's constraints, so pass rates do not depend on rule order.
+
+    Per rule: trigger tests (bids where the automaton had to decide the
+    rule's trigger, see AuctionAutomaton.tested_at), trigger hits,
+    constraint passes and wins.
+    Bids for other systems are passed through uncounted.
+    """
+    def __init__(self, system: BiddingSystem):
+        self.system = system
+        self.bids = 0
+        self.tested = Counter()
+        self.triggered = Counter()
+        self.passed = Counter()
+        self.won = Counter()
+        self.elapsed = 0.0
+
+    def get_bid(self, system: BiddingSystem, history: List[Call], hand: Hand) -> Optional[Rule]:
+        if system is not self.system:
+            return system.get_bid(history, hand)
+        self.bids += 1
+        chosen = None
+        automaton = system.automaton
+        state = automaton.run(history)
+        self.tested.update(automaton.tested_at(state))
+        for rule in automaton.rules_at(state, history):
+            self.triggered[rule] += 1
+            if rule.constraints.compiled.predicate(hand):
+                self.passed[rule] += 1
+                if chosen is None:
+                    chosen = rule
+        if chosen is not None:
+            self.won[chosen] += 1
+        return chosen
+
+    def pass_rate(self, rule: Rule) -> float:
+        """Share of the rule's trigger hits whose hand met its constraints (0 if never triggered)."""
+        hits = self.triggered[rule]
+        return self.passed[rule] / hits if hits else 0.0
+
+    def rows(self) -> List[Tuple[str, int, int, int, int]]:
+        """(rule, trigger tests, trigger hits, constraint passes, wins) in system order."""
+        return [(rule_key(i, rule), self.tested[rule], self.triggered[rule], self.passed[rule], self.won[rule])
+                for i, rule in enumerate(self.system.rules)]
+
+    def format(self, top: int = 10) -> str:
+        rows = sorted(self.rows(), key=lambda row: -row[2])
+        lines = [f"Profiled bids: {self.bids} in {self.elapsed:.2f}s",
+                 f"\n=== Most triggered rules (top {top}) ===",
+                 f"{'tests':>8} {'hits':>8} {'passes':>8} {'wins':>8}  rule"]
+        for key, tested, hits, passed, won in rows[:top]:
+            lines.append(f"{tested:>8} {hits:>8} {passed:>8} {won:>8}  {key}")
+        never = [key for key, _, hits, _, _ in rows if not hits]
+        lines.append(f"\nNever triggered: {len(never)} of {len(rows)} rules")
+        return "\n".join(lines)
+
+def profile_system(system: BiddingSystem, deals: int = 1000, seed: int = 1) -> RuleProfiler:
+    """Profile a system bidding seeded self-play deals against itself (dealer rotating)."""
+    from bid.engine import Engine
+    from bid.simulator import AuctionSimulator
+
+    profiler = RuleProfiler(system)
+    simulator = AuctionSimulator(system, system)
+    simulator.engine = Engine(system, tracer=profiler)
+    start = time.perf_counter()
+    for i, deal in enumerate(DealGenerator(seed).deals(deals)):
+        simulator.bid_deal(deal, Seat(i % 4))
+    profiler.elapsed = time.perf_counter() - start
+    return profiler
+
+def _contexts(rule: Rule) -> Optional[Set]:
+    """Trie contexts the rule can fire in (as AuctionAutomaton files it); None for anywhere."""
+    trigger = rule.trigger
+    if not isinstance(trigger, AuctionTrigger) or any(c.type == CallType.PASS for c, _ in trigger.steps):
+        return None
+    if trigger.kind == 'OPEN':
+        return {"OPEN"}
+    if trigger.kind == 'SEQUENCE':
+        return {tuple(trigger.steps)} if trigger.steps else {"OPEN", "LATE"}
+    return set()
+
+def _disjoint(a: Rule, b: Rule) -> bool:
+    """True when no hand meets both rules' constraints."""
+    x, y = a.constraints, b.constraints
+    if x.balanced is not None and y.balanced is not None and x.balanced != y.balanced:
+        return True  # intersect() does not flag this contradiction
+    return count_hands(x.intersect(y)) == 0
+
+def _may_compete(a: Rule, b: Rule) -> bool:
+    """Whether swapping the two rules could change some bid."""
+    ca, cb = _contexts(a), _contexts(b)
+    if ca is not None and cb is not None and not ca & cb:
+        return False
+    return not _disjoint(a, b)
+
+def optimize_order(system: BiddingSystem, profiler: RuleProfiler) -> List[Rule]:
+    """
+    The system's rules with each run of equal priority reordered by measured
+    pass rate, highest first, so first-match scans stop sooner. A rule only
+    moves ahead of an equal-priority rule it can never compete with (different
+    auction contexts, or constraints no hand meets together), so every bid
+    stays the same. Apply with BiddingSystem.reorder.
+    """
+    rules = system.rules
+    order: List[Rule] = []
+    start = 0
+    while start < len(rules):
+        end = start
+        while end < len(rules) and rules[end].priority == rules[start].priority:
+            end += 1
+        group = rules[start:end]
+        # before[j]: earlier rules of the group that must stay ahead of rule j.
+        before = [{i for i in range(j) if _may_compete(group[i], group[j])} for j in range(len(group))]
+        placed: Set[int] = set()
+        while len(placed) < len(group):
+            ready = [j for j in range(len(group)) if j not in placed and before[j] <= placed]
+            best = max(ready, key=lambda j: (profiler.pass_rate(group[j]), -j))
+            placed.add(best)
+            order.append(group[best])
+        start = end
+    return order
+
+def moved_rules(system: BiddingSystem, order: List[Rule]) -> int:
+    return sum(1 for a, b in zip(system.rules, order) if a is not b)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile rule hit rates and reorder equal-priority rules")
+    parser.add_argument("dsl")
+    parser.add_argument("--deals", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--write", action="store_true",
+                        help="store the reordered system as the .dsl's compiled cache")
+    args = parser.parse_args()
+
+    system = SystemTranslator().load(args.dsl)
+    profiler = profile_system(system, args.deals, args.seed)
+    print(profiler.format(args.top))
+    order = optimize_order(system, profiler)
+    print(f"\nReordering moves {moved_rules(system, order)} of {len(order)} rules")
+    if args.write:
+        system.reorder(order)
+        save_compiled_for(system, args.dsl)
+        print(f"Wrote the profiled order to the compiled cache of {args.dsl}")
@@ -0,0 +1,37 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Optional, Sequence, Tuple
+from bid.system import BiddingSystem
+from bid.translator import SystemTranslator
+
+# Per-process systems, loaded once by the pool initializer.
+_worker_systems: Tuple[BiddingSystem, ...] = ()
+
+def _load_systems(dsl_paths: Tuple[str, ...]):
+    global _worker_systems
+    translator = SystemTranslator()
+    _worker_systems = tuple(translator.load(path) for path in dsl_paths)
+
+def _run_task(fn: Callable, task: tuple):
+    return fn(*_worker_systems, *task)
+
+def run_sharded(dsl_paths: Sequence[str],
+                tasks: Iterable[tuple],
+                fn: Callable,
+                merge: Callable,
+                workers: Optional[int] = None):
+    """
+    Call fn(*systems, *task) for every task, where systems are the .dsl files
+    of dsl_paths compiled once per worker process, and pass each result to
+    merge in task order. fn must be a module-level function (it is pickled
+    by name); workers=1 runs in-process.
+    """
+    dsl_paths = tuple(dsl_paths)
+    if workers == 1:
+        _load_systems(dsl_paths)
+        for task in tasks:
+            merge(_run_task(fn, task))
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_load_systems, initargs=(dsl_paths,)) as pool:
+        futures = [pool.submit(_run_task, fn, task) for task in tasks]
+        for future in futures:
+            merge(future.result())
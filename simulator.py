@@ -0,0 +1,227 @@
+import argparse
+import math
+import time
+from collections import Counter
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+from bid.models import Call, CallType, CompactHand, DealGenerator, Seat, Strain, auction_over, np
+from bid.engine import Engine
+from bid.system import BiddingSystem
+from bid.sharding import run_sharded
+
+PASS = Call(CallType.PASS)
+
+class Contract:
+    def __init__(self, level: int, strain: Strain, declarer: Seat, doubled: int = 0):
+        self.level = level
+        self.strain = strain
+        self.declarer = declarer
+        self.doubled = doubled  # 0 = undoubled, 1 = doubled, 2 = redoubled
+
+    def __str__(self):
+        return f"{self.level}{self.strain}{'x' * self.doubled} {self.declarer}"
+
+def is_legal(history: List[Call], call: Call) -> bool:
+    """Sufficient bids only; X of an opponent's bid; XX of an opponent's X."""
+    last_index = None
+    for i in range(len(history) - 1, -1, -1):
+        if history[i].type != CallType.PASS:
+            last_index = i
+            break
+    if call.type == CallType.PASS:
+        return True
+    if call.type == CallType.BID:
+        if not 1 <= call.level <= 7:
+            return False
+        for prev in reversed(history):
+            if prev.type == CallType.BID:
+                return (call.level, call.strain) > (prev.level, prev.strain)
+        return True
+    if last_index is None or (len(history) - last_index) % 2 == 0:
+        return False  # nothing to act on, or the last call was partner's
+    last = history[last_index]
+    if call.type == CallType.DOUBLE:
+        return last.type == CallType.BID
+    return last.type == CallType.DOUBLE
+
+def final_contract(history: List[Call], dealer: Seat) -> Optional[Contract]:
+    """Contract reached by a finished auction; None if it was passed out."""
+    last_bid = None
+    doubled = 0
+    for i, call in enumerate(history):
+        if call.type == CallType.BID:
+            last_bid, doubled = i, 0
+        elif call.type == CallType.DOUBLE:
+            doubled = 1
+        elif call.type == CallType.REDOUBLE:
+            doubled = 2
+    if last_bid is None:
+        return None
+    strain = history[last_bid].strain
+    side = (dealer + last_bid) % 2
+    # Declarer: first player of the declaring side to name the strain.
+    for i, call in enumerate(history):
+        if (dealer + i) % 2 == side and call.type == CallType.BID and call.strain == strain:
+            return Contract(history[last_bid].level, strain, Seat((dealer + i) % 4), doubled)
+
+class AuctionResult:
+    def __init__(self, dealer: Seat, calls: List[Call], contract: Optional[Contract], illegal: int):
+        self.dealer = dealer
+        self.calls = calls
+        self.contract = contract
+        self.illegal = illegal  # calls replaced by PASS because they were not legal
+
+class AuctionSimulator:
+    """
+    Self-play of one system pair: North-South bid with ns_system, East-West
+    with ew_system. One Engine (seated North) bids for every seat, letting
+    my_seat / dealer_seat / opp_system pick the right system for each call.
+    Illegal calls are replaced by PASS and counted.
+    """
+    def __init__(self, ns_system: BiddingSystem, ew_system: BiddingSystem, max_calls: int = 60):
+        self.ns_system = ns_system
+        self.ew_system = ew_system
+        self.engine = Engine(ns_system)
+        self.max_calls = max_calls
+
+    def bid_deal(self, deal: Dict[Seat, CompactHand], dealer: Seat = Seat.NORTH) -> AuctionResult:
+        history: List[Call] = []
+        illegal = 0
+        while not auction_over(history) and len(history) < self.max_calls:
+            seat = Seat((dealer + len(history)) % 4)
+            call = self.engine.get_bid(history, deal[seat], my_seat=Seat.NORTH,
+                                       dealer_seat=dealer, opp_system=self.ew_system)
+            if not is_legal(history, call):
+                illegal += 1
+                call = PASS
+            history.append(call)
+        return AuctionResult(dealer, history, final_contract(history, dealer), illegal)
+
+class SimulationStats:
+    """Mergeable distribution counters over many simulated auctions."""
+    def __init__(self):
+        self.auctions = 0
+        self.passed_out = 0
+        self.contracts = Counter()  # "4H" / "3NTx" (declarer not included)
+        self.levels = Counter()
+        self.strains = Counter()
+        self.declarer_side = Counter()  # "NS" / "EW"
+        self.total_calls = 0
+        self.illegal_calls = 0
+        self.elapsed = 0.0
+
+    def record(self, result: AuctionResult):
+        self.auctions += 1
+        self.total_calls += len(result.calls)
+        self.illegal_calls += result.illegal
+        contract = result.contract
+        if contract is None:
+            self.passed_out += 1
+            return
+        self.contracts[f"{contract.level}{contract.strain}{'x' * contract.doubled}"] += 1
+        self.levels[contract.level] += 1
+        self.strains[str(contract.strain)] += 1
+        self.declarer_side["NS" if contract.declarer in (Seat.NORTH, Seat.SOUTH) else "EW"] += 1
+
+    def merge(self, other: 'SimulationStats') -> 'SimulationStats':
+        self.auctions += other.auctions
+        self.passed_out += other.passed_out
+        self.contracts.update(other.contracts)
+        self.levels.update(other.levels)
+        self.strains.update(other.strains)
+        self.declarer_side.update(other.declarer_side)
+        self.total_calls += other.total_calls
+        self.illegal_calls += other.illegal_calls
+        return self
+
+    @property
+    def auctions_per_second(self) -> float:
+        return self.auctions / self.elapsed if self.elapsed else 0.0
+
+    def format(self, top: int = 10) -> str:
+        n = max(1, self.auctions)
+        lines = [f"Auctions: {self.auctions} in {self.elapsed:.2f}s ({self.auctions_per_second:,.0f} auctions/sec)",
+                 f"Passed out: {self.passed_out} ({self.passed_out / n * 100:.1f}%)",
+                 f"Average calls per auction: {self.total_calls / n:.2f}",
+                 f"Illegal calls replaced by PASS: {self.illegal_calls}",
+                 "Levels: " + ", ".join(f"{lvl}: {self.levels[lvl] / n * 100:.1f}%" for lvl in sorted(self.levels)),
+                 "Strains: " + ", ".join(f"{s}: {c / n * 100:.1f}%" for s, c in self.strains.most_common()),
+                 "Declarer: " + ", ".join(f"{s}: {c / n * 100:.1f}%" for s, c in self.declarer_side.most_common()),
+                 f"Top {top} contracts:"]
+        for contract, count in self.contracts.most_common(top):
+            lines.append(f"  {contract}: {count} ({count / n * 100:.1f}%)")
+        return "\n".join(lines)
+
+def _run_shard(ns_system: BiddingSystem, ew_system: BiddingSystem,
+               seed, num_deals: int, first_board: int) -> SimulationStats:
+    simulator = AuctionSimulator(ns_system, ew_system)
+    stats = SimulationStats()
+    start = time.perf_counter()
+    for i, deal in enumerate(DealGenerator(seed).deals(num_deals)):
+        # Rotate the dealer like board numbers do.
+        stats.record(simulator.bid_deal(deal, Seat((first_board + i) % 4)))
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+def simulate(ns_dsl: str,
+             ew_dsl: str,
+             num_deals: int = 1000,
+             workers: Optional[int] = None,
+             seed: Optional[int] = None,
+             shard_size: int = 5000) -> SimulationStats:
+    """
+    Bid `num_deals` random deals with ns_dsl against ew_dsl, sharded over a
+    process pool (workers=1 runs in-process). The same seed and shard_size
+    deal the same boards, so different system pairs can be compared.
+    """
+    shards = max(1, math.ceil(num_deals / shard_size))
+    sizes = [num_deals // shards + (i < num_deals % shards) for i in range(shards)]
+    firsts = [sum(sizes[:i]) for i in range(shards)]
+    seeds = np.random.SeedSequence(seed).spawn(shards)
+
+    stats = SimulationStats()
+    start = time.perf_counter()
+    run_sharded([ns_dsl, ew_dsl], [(shard_seed, size, first) for shard_seed, size, first in zip(seeds, sizes, firsts)],
+                _run_shard, stats.merge, workers)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+PAIRINGS = ("all", "self", "head-to-head")
+
+def system_pairs(dsl_paths: List[str], pairings: str = "all") -> List[Tuple[str, str]]:
+    """
+    (ns_dsl, ew_dsl) pairs to simulate: "self" plays each system against
+    itself, "head-to-head" plays every two systems a, b as (a, b) and (b, a)
+    so each system holds both sides of the same deals; "all" does both.
+    """
+    if pairings not in PAIRINGS:
+        raise ValueError(f"pairings must be one of {PAIRINGS}, got {pairings!r}")
+    pairs = []
+    if pairings in ("all", "self"):
+        pairs += [(path, path) for path in dsl_paths]
+    if pairings in ("all", "head-to-head"):
+        pairs += [pair for a, b in combinations(dsl_paths, 2) for pair in ((a, b), (b, a))]
+    return pairs
+
+def compare_systems(dsl_paths: List[str],
+                    num_deals: int = 1000,
+                    workers: Optional[int] = None,
+                    seed: int = 0,
+                    pairings: str = "all") -> Dict[Tuple[str, str], SimulationStats]:
+    """Simulations of the system_pairs of dsl_paths, keyed (ns_dsl, ew_dsl), all on the same seeded deals."""
+    return {(ns, ew): simulate(ns, ew, num_deals, workers, seed) for ns, ew in system_pairs(dsl_paths, pairings)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Self-play and head-to-head auction simulator")
+    parser.add_argument("systems", nargs="+", help=".dsl files to compare")
+    parser.add_argument("--deals", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pairings", choices=PAIRINGS, default="all",
+                        help="self-play, head-to-head (both seatings of every two systems), or both")
+    args = parser.parse_args()
+    results = compare_systems(args.systems, args.deals, args.workers, args.seed, args.pairings)
+    for (ns, ew), stats in results.items():
+        print(f"=== NS {ns} vs EW {ew} ===")
+        print(stats.format())
+        print()
@@ -1,9 +1,82 @@
-from typing import List, Callable, Optional
-from bid.models import Call, Hand
+from collections import OrderedDict, namedtuple
+from typing import Dict, List, Callable, Optional, Tuple
+from bid.models import Call, CallType, Hand, Suit, hand_features
 from bid.constraints import HandConstraints
 
+class AuctionTrigger:
+    """
+    Trigger of a DSL rule.
+    OPEN: nothing but passes so far (fewer than four).
+    SEQUENCE: steps [(call, is_direct)] matched backwards from the end of the
+    auction. A direct step (opponent's call, written '(1C)') must be the very
+    next call; any other step must be followed by at least one pass. Apart
+    from leading passes, the whole auction must be consumed.
+    """
+    def __init__(self, kind: str, steps: List[Tuple[Call, bool]] = ()):
+        self.kind = kind
+        self.steps = list(steps)
+
+    def __call__(self, history: List[Call]) -> bool:
+        steps = self.steps
+        if self.kind == 'OPEN':
+            return len(history) == 0 or (len(history) < 4 and all(c.type == CallType.PASS for c in history))
+
+        if self.kind == 'SEQUENCE':
+            if not history and not steps:
+                return True
+            if not history:
+                return False
+
+            hist_idx = len(history) - 1
+            step_idx = len(steps) - 1
+
+            while step_idx >= 0:
+                if hist_idx < 0:
+                    return False
+
+                call_target, is_direct = steps[step_idx]
+
+                if is_direct:
+                    # Direct mode: No intervening pass allowed
+                    if history[hist_idx] != call_target:
+                        return False
+                    hist_idx -= 1
+                else:
+                    # Standard mode: Typically implies Partner's bid + Opponent Pass
+                    pass_found = False
+
+                    # Consume passes
+                    while hist_idx >= 0 and history[hist_idx].type == CallType.PASS:
+                        pass_found = True
+                        hist_idx -= 1
+
+                    # Standard Rules require matching at least one pass if history implies response
+                    # BUT for uncontested response, we MUST have a pass.
+                    if not pass_found:
+                        return False
+
+                    if hist_idx < 0:
+                        return False
+
+                    if history[hist_idx] != call_target:
+                        return False
+
+                    hist_idx -= 1
+
+                step_idx -= 1
+
+            # Strict Match Check: Ensure no remaining non-pass calls in history
+            while hist_idx >= 0:
+                if history[hist_idx].type != CallType.PASS:
+                    return False
+                hist_idx -= 1
+
+            return True
+
+        return False
+
 class Rule:
-    def __init__(self, 
+    def __init__(self,
                  priority: int,
                  trigger: Callable[[List[Call]], bool],
                  constraints: HandConstraints,
@@ -18,20 +91,304 @@ class Rule:
     def applies(self, history: List[Call], hand: Hand) -> bool:
         if not self.trigger(history):
             return False
-        return self.constraints.matches(hand)
+        return self.constraints.compiled.predicate(hand)
+
+class CandidateIndex:
+    """
+    Candidate pruning for the rules triggered by one auction context. Each
+    rule is a bit (in list order, so the lowest set bit is the highest
+    priority); for every HCP value and every length of every suit there is
+    the set of rules whose ranges admit it. A hand's HCP and suit lengths
+    AND down to the rules that can possibly match, and only those run their
+    full predicate.
+    """
+    def __init__(self, rules: List[Rule]):
+        self.rules = list(rules)
+        self.by_hcp = [0] * 38
+        self.by_length = [[0] * 14 for _ in Suit]
+        for i, rule in enumerate(self.rules):
+            con = rule.constraints
+            bit = 1 << i
+            for hcp in range(max(0, con.hcp_min), min(37, con.hcp_max) + 1):
+                self.by_hcp[hcp] |= bit
+            for suit in Suit:
+                table = self.by_length[suit]
+                for length in range(max(0, con.length_min[suit]), min(13, con.length_max[suit]) + 1):
+                    table[length] |= bit
+
+    def bits(self, hand: Hand) -> int:
+        """Bit i set when rule i survives the HCP and length tables."""
+        by_length = self.by_length
+        return (self.by_hcp[hand.hcp]
+                & by_length[0][hand.length(Suit.CLUBS)] & by_length[1][hand.length(Suit.DIAMONDS)]
+                & by_length[2][hand.length(Suit.HEARTS)] & by_length[3][hand.length(Suit.SPADES)])
+
+    def candidates(self, hand: Hand) -> List[Rule]:
+        """Rules whose HCP and length ranges admit the hand, in priority order."""
+        bits = self.bits(hand)
+        return [rule for i, rule in enumerate(self.rules) if bits >> i & 1]
+
+    def first_match(self, hand: Hand) -> Optional[Rule]:
+        bits = self.bits(hand)
+        rules = self.rules
+        while bits:
+            low = bits & -bits
+            rule = rules[low.bit_length() - 1]
+            if rule.constraints.compiled.predicate(hand):
+                return rule
+            bits ^= low
+        return None
+
+# State of an AuctionAutomaton run: (trie node, last non-pass call, passes since it, leading passes).
+AutomatonState = Tuple[Optional['_TrieNode'], Optional[Call], int, int]
+
+class _TrieNode:
+    __slots__ = ("children", "rules")
+
+    def __init__(self):
+        self.children: Dict[Tuple[Call, bool], '_TrieNode'] = {}
+        self.rules: List[Rule] = []
+
+class AuctionAutomaton:
+    """
+    The AuctionTrigger of every rule of a system compiled into one trie over
+    the non-pass calls of the auction, so a single pass over the history
+    yields all triggered rules (in priority order).
+
+    A SEQUENCE step (call, is_direct) becomes the edge (call, is_direct): a
+    direct step must be followed immediately by the next call (or end the
+    auction), any other step by at least one pass. Leading passes are free.
+    OPEN rules live at the root and need fewer than four passes.
+
+    Triggers that are not AuctionTriggers (or SEQUENCE steps naming PASS)
+    cannot be compiled; they are called on the history and merged in.
+    """
+    def __init__(self, rules: List[Rule]):
+        self.root = _TrieNode()
+        self.open_rules: List[Rule] = []  # no call yet, fewer than four passes
+        self.late_rules: List[Rule] = []  # no call yet, four or more passes
+        self.unindexed: List[Rule] = []
+        self.rules = list(rules)
+        self._position = {id(rule): i for i, rule in enumerate(rules)}
+        self._indexes: Dict[int, CandidateIndex] = {}
+
+        for rule in rules:
+            trigger = rule.trigger
+            if not isinstance(trigger, AuctionTrigger) or any(c.type == CallType.PASS for c, _ in trigger.steps):
+                self.unindexed.append(rule)
+            elif trigger.kind == 'OPEN':
+                self.open_rules.append(rule)
+            elif trigger.kind == 'SEQUENCE':
+                if not trigger.steps:
+                    # Matches any auction of passes only.
+                    self.open_rules.append(rule)
+                    self.late_rules.append(rule)
+                    continue
+                node = self.root
+                for step in trigger.steps:
+                    node = node.children.setdefault(step, _TrieNode())
+                node.rules.append(rule)
+            # Any other kind never fires.
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_position"]  # keyed by id(), rebuilt on load
+        del state["_indexes"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._position = {id(rule): i for i, rule in enumerate(self.rules)}
+        self._indexes = {}
+
+    @property
+    def start(self) -> AutomatonState:
+        return (self.root, None, 0, 0)
+
+    @staticmethod
+    def advance(state: AutomatonState, call: Call) -> AutomatonState:
+        node, pending, passes, leading = state
+        if call.type == CallType.PASS:
+            if pending is None:
+                return (node, None, 0, leading + 1)
+            return (node, pending, passes + 1, leading)
+        if pending is not None and node is not None:
+            node = node.children.get((pending, passes == 0))
+        return (node, call, 0, leading)
+
+    def run(self, history: List[Call], state: Optional[AutomatonState] = None) -> AutomatonState:
+        state = state or self.start
+        for call in history:
+            state = self.advance(state, call)
+        return state
+
+    def rules_at(self, state: AutomatonState, history: List[Call]) -> List[Rule]:
+        """Rules triggered by `history`, which must be the auction that led to `state`."""
+        node, pending, passes, leading = state
+        if node is None:
+            rules = []
+        elif pending is None:
+            rules = self.open_rules if leading < 4 else self.late_rules
+        else:
+            child = node.children.get((pending, passes == 0))
+            rules = child.rules if child is not None else []
+
+        if not self.unindexed:
+            return rules
+        fired = [r for r in self.unindexed if r.trigger(history)]
+        if not fired:
+            return rules
+        return sorted(rules + fired, key=lambda r: self._position[id(r)])
+
+    def triggered(self, history: List[Call]) -> List[Rule]:
+        return self.rules_at(self.run(history), history)
+
+    def tested_at(self, state: AutomatonState) -> List[Rule]:
+        """
+        Rules whose trigger rules_at tests at `state`: those one edge below
+        the state's node (the opening or late list before any call), plus
+        every unindexed rule, whose trigger is always called.
+        """
+        node, pending, passes, leading = state
+        if node is None:
+            rules = []
+        elif pending is None:
+            rules = self.open_rules if leading < 4 else self.late_rules
+        else:
+            rules = [rule for child in node.children.values() for rule in child.rules]
+        return rules + self.unindexed
+
+    def first_match(self, rules: List[Rule], hand: Hand) -> Optional[Rule]:
+        """First rule of `rules` (as returned by rules_at) whose constraints the hand meets."""
+        if self.unindexed:
+            # rules_at may have built this list for one call; not worth indexing.
+            for rule in rules:
+                if rule.constraints.compiled.predicate(hand):
+                    return rule
+            return None
+        if not rules:
+            return None
+        return self.index(rules).first_match(hand)
+
+    def index(self, rules: List[Rule]) -> Optional[CandidateIndex]:
+        """The CandidateIndex of a rules_at list; None when the system has unindexed rules."""
+        if self.unindexed:
+            return None
+        # Without unindexed rules every list comes from the trie, which
+        # outlives the index, so its id() is a safe key.
+        index = self._indexes.get(id(rules))
+        if index is None:
+            index = self._indexes[id(rules)] = CandidateIndex(rules)
+        return index
+
+    def position(self, rule: Rule) -> int:
+        """Index of the rule in the system's priority order."""
+        return self._position[id(rule)]
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+class BidCache:
+    """
+    LRU memo of BiddingSystem.get_bid. Rules only look at the auction and at
+    the hand's features (models.hand_features), so entries are keyed on
+    (auction, features): different hands with the same HCP, lengths, ...
+    share an entry. maxsize=0 disables caching.
+
+    BiddingSystem keeps it off by default: building the feature key costs
+    about as much as the indexed first-match scan it saves, so even replays
+    that repeat most positions run no faster with it on.
+    """
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, Optional[Rule]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        # Pickled (e.g. in the compiled-system cache) empty.
+        return {"maxsize": self.maxsize, "hits": 0, "misses": 0, "_entries": OrderedDict()}
+
+    def lookup(self, key: tuple):
+        """(True, rule) on a hit, (False, None) on a miss."""
+        try:
+            rule = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, rule
+
+    def store(self, key: tuple, rule: Optional[Rule]):
+        self._entries[key] = rule
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
 
 class BiddingSystem:
-    def __init__(self, name: str):
+    def __init__(self, name: str, cache_size: int = 0):
         self.name = name
         self.rules: List[Rule] = []
+        self._automaton: Optional[AuctionAutomaton] = None
+        self.bid_cache = BidCache(cache_size)
 
     def add_rule(self, rule: Rule):
-        self.rules.append(rule)
-        # Keep sorted by priority (highest first)
+        self.add_rules([rule])
+
+    def add_rules(self, rules: List[Rule]):
+        self.rules.extend(rules)
+        # Keep sorted by priority (highest first); the sort is stable, so ties keep insertion order
         self.rules.sort(key=lambda r: r.priority, reverse=True)
+        self._automaton = None
+        self.bid_cache.clear()
+
+    def reorder(self, rules: List[Rule]):
+        """
+        Replace self.rules with a permutation of them, e.g. the profiled order
+        of profiler.optimize_order. Priorities must stay non-increasing.
+        """
+        if sorted(map(id, rules)) != sorted(map(id, self.rules)):
+            raise ValueError("reorder needs a permutation of the system's rules")
+        if any(a.priority < b.priority for a, b in zip(rules, rules[1:])):
+            raise ValueError("reorder must keep rules sorted by priority")
+        self.rules = list(rules)
+        self._automaton = None
+        self.bid_cache.clear()
+
+    @property
+    def automaton(self) -> AuctionAutomaton:
+        """Trigger automaton over self.rules, built lazily; add_rule invalidates it."""
+        if self._automaton is None:
+            self._automaton = AuctionAutomaton(self.rules)
+        return self._automaton
+
+    def triggered(self, history: List[Call]) -> List[Rule]:
+        """All rules whose trigger fires on this auction, in priority order."""
+        return self.automaton.triggered(history)
 
     def get_bid(self, history: List[Call], hand: Hand) -> Optional[Rule]:
-        for rule in self.rules:
-            if rule.applies(history, hand):
-                return rule
-        return None
+        automaton = self.automaton
+        rules = automaton.triggered(history)
+        cache = self.bid_cache
+        if not rules or not cache.maxsize:
+            return automaton.first_match(rules, hand)
+        # The auction only matters through the rules it triggers. Indexed rule
+        # lists live as long as the automaton (and so the cache), so their
+        # identity stands for every auction reaching them; with unindexed
+        # triggers the auction itself is the key.
+        auction_key = tuple(history) if automaton.unindexed else id(rules)
+        key = (auction_key, hand_features(hand))
+        hit, rule = cache.lookup(key)
+        if not hit:
+            rule = automaton.first_match(rules, hand)
+            cache.store(key, rule)
+        return rule
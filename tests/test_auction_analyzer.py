@@ -0,0 +1,72 @@
+import unittest
+from bid.translator import SystemTranslator
+from bid.engine import Engine, AuctionAnalyzer
+from bid.models import Call, CallType, Strain, Seat
+from bid.constraints import HandConstraints
+
+PASS = Call(CallType.PASS)
+
+def bid(level, strain):
+    return Call(CallType.BID, level, strain)
+
+def rescan_estimate(history, my_seat, dealer_seat, my_system, opp_system):
+    """Reference: re-scan every rule against every prefix of the auction."""
+    constraints = {s: HandConstraints() for s in Seat}
+    seat = dealer_seat
+    for i, call in enumerate(history):
+        system = my_system if seat in (my_seat, my_seat.partner) else opp_system
+        for r in system.rules:
+            if r.trigger(history[:i]) and r.call == call:
+                constraints[seat] = constraints[seat].intersect(r.constraints)
+                break
+        seat = Seat((seat + 1) % 4)
+    return constraints
+
+class TestAuctionAnalyzer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        translator = SystemTranslator()
+        with open("bid/system/blue_club.dsl", "r") as f:
+            cls.blue_system = translator.parse(f.read())
+        with open("bid/system/gib.dsl", "r") as f:
+            cls.gib_system = translator.parse(f.read())
+        cls.engine = Engine(cls.blue_system)
+
+    def assertSameConstraints(self, a, b):
+        self.assertEqual({s: str(c) for s, c in a.items()}, {s: str(c) for s, c in b.items()})
+
+    def test_incremental_matches_full_estimate(self):
+        history = [bid(1, Strain.CLUBS), PASS, bid(1, Strain.SPADES), PASS, bid(4, Strain.NT), PASS, bid(5, Strain.CLUBS)]
+        analyzer = AuctionAnalyzer(Seat.NORTH, Seat.NORTH, self.blue_system, self.gib_system)
+        for i, call in enumerate(history):
+            analyzer.push(call)
+            expected = rescan_estimate(history[:i + 1], Seat.NORTH, Seat.NORTH, self.blue_system, self.gib_system)
+            self.assertSameConstraints(analyzer.constraints, expected)
+            self.assertSameConstraints(self.engine.estimate_deal(history[:i + 1], Seat.NORTH, Seat.NORTH,
+                                                                 self.blue_system, self.gib_system), expected)
+        self.assertEqual(analyzer.constraints[Seat.SOUTH].controls_min, 3)
+        self.assertEqual(analyzer.constraints[Seat.SOUTH].aces, {1, 4})
+        self.assertEqual(analyzer.current_seat, Seat.WEST)
+
+    def test_undo_and_branch(self):
+        analyzer = AuctionAnalyzer(Seat.NORTH, Seat.NORTH, self.blue_system, self.gib_system)
+        analyzer.push(bid(1, Strain.CLUBS))
+        analyzer.push(PASS)
+        before = analyzer.constraints
+
+        one_spade = analyzer.branch()
+        one_spade.push(bid(1, Strain.SPADES))
+        one_nt = analyzer.branch()
+        one_nt.push(bid(1, Strain.NT))
+        self.assertEqual(one_spade.constraints[Seat.SOUTH].controls_min, 3)
+        self.assertEqual(one_nt.constraints[Seat.SOUTH].controls_min, 4)
+        self.assertEqual(len(analyzer.history), 2)
+
+        self.assertEqual(str(one_spade.undo()), "1S")
+        self.assertSameConstraints(one_spade.constraints, before)
+        self.assertEqual(one_spade.current_seat, Seat.SOUTH)
+        with self.assertRaises(ValueError):
+            AuctionAnalyzer(Seat.NORTH, Seat.NORTH, self.blue_system, self.gib_system).undo()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import random
+import unittest
+from bid.translator import SystemTranslator
+from bid.models import CompactHand, Hand, HandBatch, Suit, np
+from bid.constraints import HandConstraints
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestMatchesBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open("bid/system/blue_club.dsl", "r") as f:
+            cls.system = SystemTranslator().parse(f.read())
+        random.seed(3)
+        cls.hands = [CompactHand.random() for _ in range(3000)]
+        cls.batch = HandBatch.from_hands(cls.hands)
+
+    def test_agrees_with_matches_for_every_rule(self):
+        for rule in self.system.rules:
+            mask = rule.constraints.matches_batch(self.batch)
+            expected = [rule.constraints.matches(h) for h in self.hands]
+            self.assertEqual(mask.tolist(), expected, rule.description)
+
+    def test_feature_matrix_input(self):
+        con = HandConstraints(hcp_min=11, hcp_max=16, aces={1, 2}, ace_topology={"RANK", "NONE"},
+                              length_min={Suit.CLUBS: 0, Suit.DIAMONDS: 0, Suit.HEARTS: 5, Suit.SPADES: 0})
+        from_batch = con.matches_batch(self.batch)
+        from_matrix = con.matches_batch(self.batch.feature_matrix())
+        self.assertTrue((from_batch == from_matrix).all())
+        self.assertEqual(int(from_batch.sum()), sum(con.matches(h) for h in self.hands))
+
+class TestCompiledConstraints(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open("bid/system/precision.dsl", "r") as f:
+            cls.system = SystemTranslator().parse(f.read())
+        random.seed(4)
+        cls.hands = [Hand.random() for _ in range(200)]
+
+    def test_agrees_with_matches(self):
+        for rule in self.system.rules:
+            compiled = rule.constraints.compiled
+            for hand in self.hands:
+                self.assertEqual(compiled(hand), rule.constraints.matches(hand), compiled.source)
+                self.assertEqual(compiled.first_failure(hand) is None, rule.constraints.matches(hand))
+
+    def test_only_nontrivial_bounds_are_checked(self):
+        self.assertEqual(HandConstraints().compiled.checks, ())
+        self.assertTrue(HandConstraints().compiled(self.hands[0]))
+        length_min = {s: 0 for s in Suit}
+        length_min[Suit.HEARTS] = 5
+        con = HandConstraints(hcp_min=12, tp_max=50, length_min=length_min, aces={0, 1, 2, 3, 4})
+        self.assertEqual(set(con.compiled.features), {"hcp", "len_h"})
+        # The 5+ hearts test rejects far more hands than 12+ HCP at a lower cost.
+        self.assertEqual(con.compiled.features[0], "len_h")
+
+    def test_first_failure(self):
+        con = HandConstraints(hcp_min=15, hcp_max=17, balanced=True)
+        hand = CompactHand.from_string("SKQJ2 HKQJ2 DKJ2 C32")
+        self.assertIsNone(con.compiled.first_failure(hand))
+        weak = CompactHand.from_string("S5432 H432 D432 C32")
+        self.assertEqual(con.compiled.first_failure(weak), "hcp")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+import unittest
+from bid.benchmarks import (Workload, compare_reports, default_workloads, load_report, run_suite,
+                            run_workload, save_report)
+
+class TestBenchmarks(unittest.TestCase):
+    def test_run_workload(self):
+        seen = []
+        result = run_workload(Workload("toy", lambda: [1, 2, 3], seen.append), min_time=0.0, min_ops=10)
+        self.assertEqual(result.ops, 10)
+        self.assertEqual(seen[3:6], [1, 2, 3])  # after the warmup, inputs cycle in order
+        self.assertLessEqual(result.p50_us, result.p99_us)
+        self.assertGreater(result.ops_per_second, 0)
+
+    def test_pinned_suite(self):
+        names = [w.name for w in default_workloads()]
+        for expected in ("translator.parse.gib", "hand.construct", "hand.evaluate", "constraints.matches",
+                         "engine.get_bid.precision.opening", "engine.get_bid.precision.response",
+                         "engine.get_bid.precision.deep", "engine.estimate_deal.blue_club"):
+            self.assertIn(expected, names)
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_engine_inputs_do_not_depend_on_rules(self):
+        # Every system is measured on the same pinned auctions, whatever its rules bid.
+        workloads = {w.name: w for w in default_workloads()}
+        for depth in ("opening", "response", "deep"):
+            inputs = [workloads[f"engine.get_bid.{name}.{depth}"].setup() for name in ("gib", "precision")]
+            self.assertGreater(len(inputs[0]), 100)
+            self.assertEqual(inputs[0], inputs[1])
+        self.assertEqual(workloads["engine.estimate_deal.gib"].setup(),
+                         workloads["engine.estimate_deal.blue_club"].setup())
+
+    def test_report_round_trip_and_compare(self):
+        report = run_suite(default_workloads(), ["hand.evaluate", "translator.parse.gib"], min_time=0.01)
+        self.assertEqual(sorted(report["results"]), ["hand.evaluate", "translator.parse.gib"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            save_report(report, path)
+            baseline = load_report(path)
+        self.assertEqual(baseline, json.loads(json.dumps(report)))
+
+        slower = json.loads(json.dumps(report))
+        slower["results"]["hand.evaluate"]["ops_per_second"] /= 2
+        _, regressions = compare_reports(baseline, slower)
+        self.assertEqual(regressions, ["hand.evaluate"])
+        _, regressions = compare_reports(baseline, baseline)
+        self.assertEqual(regressions, [])
+
+if __name__ == '__main__':
+    unittest.main()
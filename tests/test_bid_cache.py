@@ -0,0 +1,75 @@
+import random
+import unittest
+from bid.translator import SystemTranslator
+from bid.system import BidCache, BiddingSystem, Rule, AuctionTrigger
+from bid.constraints import HandConstraints
+from bid.models import Call, CallType, CompactHand, Hand, Strain, hand_features
+
+PASS = Call(CallType.PASS)
+
+class TestBidCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open("bid/system/gib.dsl", "r") as f:
+            cls.source = f.read()
+
+    def setUp(self):
+        self.system = SystemTranslator().parse(self.source)
+        self.system.bid_cache.maxsize = 4096
+
+    def test_same_bids_as_uncached(self):
+        uncached = SystemTranslator().parse(self.source)
+        rng = random.Random(4)
+        auctions = [[], [PASS], [Call(CallType.BID, 1, Strain.CLUBS), PASS]]
+        position = lambda system, rule: None if rule is None else system.rules.index(rule)
+        for _ in range(300):
+            hand = CompactHand.from_mask(sum(1 << c for c in rng.sample(range(52), 13)))
+            for history in auctions:
+                self.assertEqual(position(self.system, self.system.get_bid(history, hand)),
+                                 position(uncached, uncached.get_bid(history, hand)))
+        self.assertEqual(uncached.bid_cache.info().currsize, 0)
+
+    def test_hits_on_same_features(self):
+        hand = Hand.from_string("SA SK S3 S2 HK H3 H2 DK D2 C4 C3 C2 D3")
+        compact = CompactHand.from_hand(hand)
+        self.assertEqual(hand_features(hand), hand_features(compact))
+        first = self.system.get_bid([], hand)
+        self.assertIs(self.system.get_bid([], compact), first)
+        info = self.system.bid_cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+        # A pass before opening triggers the same rules, so it shares the entry;
+        # a response to 1C does not.
+        self.system.get_bid([PASS], compact)
+        self.assertEqual(self.system.bid_cache.info().hits, 2)
+        self.system.get_bid([Call(CallType.BID, 1, Strain.CLUBS), PASS], compact)
+        self.assertEqual(self.system.bid_cache.info().misses, 2)
+
+    def test_lru_eviction(self):
+        cache = BidCache(maxsize=2)
+        cache.store("a", None)
+        cache.store("b", None)
+        cache.lookup("a")  # "b" is now least recently used
+        cache.store("c", None)
+        self.assertEqual(cache.lookup("b"), (False, None))
+        self.assertTrue(cache.lookup("a")[0])
+        self.assertTrue(cache.lookup("c")[0])
+        self.assertEqual(len(cache), 2)
+
+    def test_add_rule_invalidates(self):
+        hand = Hand.from_string("SA SK S3 S2 HK H3 H2 DK D2 C4 C3 C2 D3")
+        before = self.system.get_bid([], hand)
+        self.assertEqual(len(self.system.bid_cache), 1)
+        override = Rule(1000, AuctionTrigger('OPEN'), HandConstraints(), Call(CallType.BID, 7, Strain.NT))
+        self.system.add_rule(override)
+        self.assertEqual(len(self.system.bid_cache), 0)
+        self.assertIs(self.system.get_bid([], hand), override)
+        self.assertIsNot(before, override)
+
+    def test_disabled_by_default(self):
+        system = BiddingSystem("Empty")
+        self.assertEqual(system.bid_cache.maxsize, 0)
+        self.assertIsNone(system.get_bid([], CompactHand.random()))
+        self.assertEqual(system.bid_cache.info().misses, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import random
+import unittest
+from bid.models import (Hand, CompactHand, HandBatch, Suit, ACE_TOPOLOGIES, FEATURE_COLUMNS, np,
+                        HOLDING_HCP, HOLDING_CONTROLS, HOLDING_ACE, HOLDING_LENGTH, HOLDING_TOTAL_POINTS,
+                        Seat, parse_deal, parse_hand, parse_many)
+from bid.constraints import HandConstraints
+
+class TestCompactHand(unittest.TestCase):
+    def assertSameFeatures(self, hand, compact):
+        self.assertEqual(compact.hcp, hand.hcp)
+        self.assertEqual(compact.total_points, hand.total_points)
+        self.assertEqual(compact.controls, hand.controls)
+        self.assertEqual(compact.ace_count, hand.ace_count)
+        self.assertEqual(compact.ace_topology, hand.ace_topology)
+        self.assertEqual(compact.is_balanced, hand.is_balanced)
+        self.assertEqual(compact.distribution, hand.distribution)
+        for s in Suit:
+            self.assertEqual(compact.length(s), hand.length(s))
+
+    def test_matches_hand_on_random_deals(self):
+        random.seed(7)
+        for _ in range(500):
+            hand = Hand.random()
+            self.assertSameFeatures(hand, CompactHand.from_hand(hand))
+
+    def test_holding_tables(self):
+        akx = CompactHand.from_string("SAK2").suit_masks[Suit.SPADES]
+        self.assertEqual((HOLDING_HCP[akx], HOLDING_CONTROLS[akx], HOLDING_ACE[akx], HOLDING_LENGTH[akx]), (7, 3, 1, 3))
+        self.assertEqual(HOLDING_TOTAL_POINTS[akx], 7)
+        self.assertEqual(HOLDING_TOTAL_POINTS[0], 3)  # void
+        self.assertEqual(HOLDING_TOTAL_POINTS[1 << 12], 4 + 2 - 1)  # singleton ace
+        self.assertEqual(HOLDING_TOTAL_POINTS[0b11], 1)  # small doubleton
+        # Summed over the 13 cards of a hand, by hand.
+        hand = Hand.from_string("SA SK S2 HQ HJ DT D9 D8 D7 D6 D5 D4 D3")
+        self.assertEqual((hand.hcp, hand.total_points, hand.controls, hand.ace_count), (10, 13, 3, 1))  # club void +3, QJ doubleton +1 -1
+
+    def test_from_string(self):
+        compact = CompactHand.from_string("SAKJ2 HAKJ2 DAQJ2 C2")
+        self.assertEqual(compact.hcp, 23)
+        self.assertEqual(compact.controls, 8)
+        self.assertEqual(compact.ace_topology, "NONE")
+        self.assertEqual(str(compact.cards), "[AS, KS, JS, 2S, AH, KH, JH, 2H, AD, QD, JD, 2D, 2C]")
+
+    def test_parse_formats(self):
+        expected = CompactHand.from_cards(Hand.from_string("SAK32 HK3 DK2 C432").cards)
+        for text in ("SAK32 HK3 DK2 C432", "SAK32HK3DK2C432", "sak32 hk3 dk2 c432", "S:AK32 H:K3 D:K2 C:432",
+                     "SA SK S3 S2 HK H3 DK D2 C4 C3 C2", "AS KS 3S 2S KH 3H KD 2D 4C 3C 2C", "AK32.K3.K2.432"):
+            self.assertEqual(parse_hand(text), expected, text)
+        self.assertEqual(parse_hand("AKQJT98765432...").length(Suit.SPADES), 13)
+        self.assertEqual(parse_hand("A10.-.-.-"), parse_hand("SAT"))
+        self.assertRaises(ValueError, parse_hand, "AK.Q")
+        self.assertRaises(ValueError, parse_hand, "AX KS")
+
+    def test_parse_deal_and_many(self):
+        deal = parse_deal("E:AKQ2.K3.A52.QJ43 - JT9.AQ42.KQ3.T92 8765.JT9.JT9.AK5")
+        self.assertEqual(list(deal), [Seat.EAST, Seat.WEST, Seat.NORTH])
+        self.assertEqual(deal[Seat.NORTH], parse_hand("S8765 HJT9 DJT9 CAK5"))
+        random.seed(3)
+        hands = [CompactHand.random() for _ in range(50)]
+        lines = [".".join("".join(str(c.rank) for c in h.by_suit[s]) for s in reversed(Suit)) + "\n" for h in hands]
+        self.assertEqual(list(parse_many(iter(["# header\n", "\n"] + lines))), hands)
+
+    def test_mask_round_trip(self):
+        compact = CompactHand.random()
+        self.assertEqual(CompactHand.from_mask(compact.mask), compact)
+        self.assertEqual(bin(compact.mask).count("1"), 13)
+        self.assertEqual(CompactHand.from_cards(compact.cards), compact)
+
+    def test_constraints_accept_compact_hand(self):
+        con = HandConstraints(hcp_min=15, hcp_max=17, balanced=True)
+        hand = CompactHand.from_string("SKQJ2 HKQJ2 DKJ2 C32")
+        self.assertTrue(con.matches(hand))
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestHandBatch(unittest.TestCase):
+    def test_columns_match_scalar_evaluation(self):
+        random.seed(11)
+        hands = [CompactHand.random() for _ in range(2000)]
+        batch = HandBatch.from_hands(hands)
+        self.assertEqual(len(batch), 2000)
+        for i, h in enumerate(hands):
+            self.assertEqual(batch.hcp[i], h.hcp)
+            self.assertEqual(batch.total_points[i], h.total_points)
+            self.assertEqual(batch.controls[i], h.controls)
+            self.assertEqual(batch.ace_count[i], h.ace_count)
+            self.assertEqual(ACE_TOPOLOGIES[batch.ace_topology[i]], h.ace_topology)
+            self.assertEqual(bool(batch.balanced[i]), h.is_balanced)
+            self.assertEqual([int(x) for x in batch.lengths[i]], [h.length(s) for s in Suit])
+        self.assertEqual(batch[5], hands[5])
+
+    def test_feature_matrix_layout(self):
+        hand = Hand.from_string("SKQJ2 HKQJ2 DKJ2 C32")
+        row = HandBatch.from_hands([hand]).feature_matrix()[0]
+        features = dict(zip(FEATURE_COLUMNS, (int(x) for x in row)))
+        self.assertEqual(features["hcp"], 16)
+        self.assertEqual(features["total_points"], 17)
+        self.assertEqual(features["len_s"], 4)
+        self.assertEqual(features["len_c"], 2)
+        self.assertEqual(features["balanced"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
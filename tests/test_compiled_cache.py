@@ -0,0 +1,86 @@
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from bid.translator import SystemTranslator, CACHE_SUFFIX, save_compiled
+from bid.models import CompactHand, Call, CallType, Strain
+
+class TestCompiledSystemCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.dsl_path = os.path.join(self.tmpdir, "gib.dsl")
+        shutil.copy("bid/system/gib.dsl", self.dsl_path)
+        self.cache_path = os.path.join(self.tmpdir, "gib" + CACHE_SUFFIX)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_cached_system_bids_like_parsed(self):
+        translator = SystemTranslator()
+        parsed = translator.load(self.dsl_path)
+        self.assertTrue(os.path.exists(self.cache_path))
+        cached = translator.load(self.dsl_path)
+        self.assertIsNot(cached, parsed)
+        self.assertEqual([r.description for r in cached.rules], [r.description for r in parsed.rules])
+
+        random.seed(8)
+        histories = [[], [Call(CallType.BID, 1, Strain.NT), Call(CallType.PASS)]]
+        for _ in range(200):
+            hand = CompactHand.random()
+            for history in histories:
+                a = parsed.get_bid(history, hand)
+                b = cached.get_bid(history, hand)
+                self.assertEqual(a and a.description, b and b.description)
+
+    def test_cache_invalidated_by_content_change(self):
+        translator = SystemTranslator()
+        before = len(translator.load(self.dsl_path).rules)
+        with open(self.dsl_path, "a") as f:
+            f.write("\n7NT - PASS:\n  HCP: 0+\n")
+        self.assertEqual(len(translator.load(self.dsl_path).rules), before + 1)
+        with open(self.cache_path, "rb") as f:
+            self.assertEqual(len(pickle.load(f)["system"].rules), before + 1)
+
+    def test_corrupt_cache_is_rebuilt(self):
+        with open(self.cache_path, "wb") as f:
+            f.write(b"not a pickle")
+        system = SystemTranslator().load(self.dsl_path)
+        self.assertGreater(len(system.rules), 0)
+
+    def test_cache_invalidated_by_code_change(self):
+        translator = SystemTranslator()
+        rules = len(translator.load(self.dsl_path).rules)
+        with open(self.cache_path, "rb") as f:
+            payload = pickle.load(f)
+        payload["code"] = "0" * 64
+        payload["system"].rules = []
+        with open(self.cache_path, "wb") as f:
+            pickle.dump(payload, f)
+        self.assertEqual(len(translator.load(self.dsl_path).rules), rules)
+
+    def test_cache_raising_on_load_is_rebuilt(self):
+        with open(self.cache_path, "wb") as f:
+            pickle.dump(["a list has no .get"], f)
+        self.assertGreater(len(SystemTranslator().load(self.dsl_path).rules), 0)
+
+    def test_failed_write_leaves_no_temp_file(self):
+        system = SystemTranslator().load(self.dsl_path, use_cache=False)
+        with mock.patch("bid.translator.pickle.dump", side_effect=TypeError("cannot pickle")):
+            save_compiled(system, self.cache_path, "0" * 64)
+        self.assertEqual(os.listdir(self.tmpdir), ["gib.dsl"])
+
+    @unittest.skipIf(os.name != "posix", "POSIX file modes")
+    def test_cache_file_mode_follows_umask(self):
+        system = SystemTranslator().load(self.dsl_path, use_cache=False)
+        old = os.umask(0o027)
+        try:
+            save_compiled(system, self.cache_path, "0" * 64)
+        finally:
+            os.umask(old)
+        self.assertEqual(os.stat(self.cache_path).st_mode & 0o777, 0o640)
+
+if __name__ == "__main__":
+    unittest.main()
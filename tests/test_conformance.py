@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from bid.conformance import NO_RULE, check_boards, run_conformance
+from bid.ingest import read_lin
+from bid.models import Call, CallType, DealGenerator, Seat, Strain, auction_context
+from bid.simulator import AuctionSimulator
+from bid.translator import SystemTranslator
+from bid.tests.test_ingest import to_lin
+
+class TestConformance(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.archive = os.path.join(cls.tmp.name, "gib_selfplay.lin")
+        system = SystemTranslator().load("bid/system/gib.dsl")
+        simulator = AuctionSimulator(system, system)
+        cls.illegal = cls.calls = 0
+        with open(cls.archive, "w") as f:
+            for i, deal in enumerate(DealGenerator(12).deals(150)):
+                result = simulator.bid_deal(deal, Seat(i % 4))
+                cls.illegal += result.illegal
+                cls.calls += len(result.calls)
+                f.write(to_lin(i + 1, Seat(i % 4), deal, result.calls))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_context(self):
+        self.assertEqual(auction_context([]), "OPEN")
+        pass_ = Call(CallType.PASS)
+        self.assertEqual(auction_context([pass_, Call(CallType.BID, 1, Strain.CLUBS), pass_,
+                                          Call(CallType.BID, 1, Strain.HEARTS)]), "1C - 1H")
+
+    def test_self_play_agrees(self):
+        # The archive was bid by gib.dsl itself; only calls the simulator replaced as illegal differ.
+        report = run_conformance("bid/system/gib.dsl", self.archive, workers=1, chunk_size=4000)
+        self.assertEqual(report.boards, 150)
+        self.assertEqual(report.decisions, self.calls)
+        self.assertEqual(report.decisions - report.agreed, self.illegal)
+        self.assertIn("Agreement", report.format())
+
+    def test_other_system_and_pool(self):
+        serial = run_conformance("bid/system/precision.dsl", self.archive, workers=1, chunk_size=4000)
+        pooled = run_conformance("bid/system/precision.dsl", self.archive, workers=2, chunk_size=4000)
+        self.assertLess(serial.agreement, 1.0)
+        for field in ("decisions", "agreed", "boards", "confusion", "rule_fired", "rule_disagreed"):
+            self.assertEqual(getattr(serial, field), getattr(pooled, field), field)
+        opening = serial.context_matrix("OPEN")
+        self.assertEqual(sum(opening.values()), sum(n for (c, _, _), n in serial.confusion.items() if c == "OPEN"))
+        worst = serial.worst_rules(5)
+        self.assertTrue(worst)
+        for rule, wrong, fired in worst:
+            self.assertLessEqual(wrong, fired)
+        self.assertIn(NO_RULE, serial.rule_fired)
+
+    def test_seat_filter(self):
+        system = SystemTranslator().load("bid/system/gib.dsl")
+        boards = list(read_lin(self.archive))
+        everyone = check_boards(system, boards)
+        north_south = check_boards(system, boards, seats=[Seat.NORTH, Seat.SOUTH])
+        self.assertLess(north_south.decisions, everyone.decisions)
+        self.assertGreater(north_south.decisions, 0)
+
+if __name__ == '__main__':
+    unittest.main()
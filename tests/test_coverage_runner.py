@@ -0,0 +1,34 @@
+import unittest
+from bid.coverage_runner import CoverageReport, run_coverage
+from bid.models import np
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestCoverageRunner(unittest.TestCase):
+    def test_in_process_and_pool_agree(self):
+        serial = run_coverage("bid/system/precision.dsl", 600, workers=1, seed=12, shard_size=200)
+        pooled = run_coverage("bid/system/precision.dsl", 600, workers=2, seed=12, shard_size=200)
+        self.assertEqual(serial.hands, 600)
+        self.assertEqual(sum(serial.openings.values()), 600)
+        self.assertEqual(serial.openings, pooled.openings)
+        self.assertEqual(serial.unmatched, pooled.unmatched)
+        self.assertEqual(serial.missed_by_hcp, pooled.missed_by_hcp)
+        self.assertGreater(serial.hands_per_second, 0)
+        self.assertIn("hands/sec", serial.format())
+
+    def test_merge(self):
+        a, b = CoverageReport(), CoverageReport()
+        a.hands, b.hands = 3, 4
+        a.openings["1C"] += 2
+        b.openings["1C"] += 1
+        b.unmatched["1C PASS"] += 1
+        a.merge(b)
+        self.assertEqual(a.hands, 7)
+        self.assertEqual(a.openings["1C"], 3)
+        self.assertEqual(a.unmatched["1C PASS"], 1)
+
+    def test_format_empty(self):
+        report = CoverageReport().merge(CoverageReport())
+        self.assertIn("Total Opened: 0 (0.0%)", report.format())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from bid.models import DealGenerator, Seat, Suit, np
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestDealGenerator(unittest.TestCase):
+    def test_deals_partition_the_deck(self):
+        for deal in DealGenerator(seed=1).deals(200, chunk=64):
+            self.assertEqual(set(deal), set(Seat))
+            full = 0
+            for hand in deal.values():
+                self.assertEqual(sum(hand.length(s) for s in Suit), 13)
+                self.assertEqual(full & hand.mask, 0)
+                full |= hand.mask
+            self.assertEqual(full, (1 << 52) - 1)
+
+    def test_seed_is_reproducible(self):
+        a = [d[Seat.NORTH].mask for d in DealGenerator(seed=42).deals(50)]
+        b = [d[Seat.NORTH].mask for d in DealGenerator(seed=42).deals(50)]
+        c = [d[Seat.NORTH].mask for d in DealGenerator(seed=43).deals(50)]
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_batch_output(self):
+        batches = DealGenerator(seed=5).batch(1000)
+        total_hcp = sum(batches[seat].hcp for seat in Seat)
+        self.assertTrue((total_hcp == 40).all())
+        self.assertTrue((sum(batches[seat].lengths for seat in Seat) == 13).all())
+
+if __name__ == "__main__":
+    unittest.main()
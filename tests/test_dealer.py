@@ -0,0 +1,101 @@
+import unittest
+from bid.translator import SystemTranslator
+from bid.engine import Engine
+from bid.dealer import ConstrainedDealer
+from bid.constraints import HandConstraints
+from bid.models import Call, CallType, Strain, Seat, Suit
+
+class TestConstrainedDealer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        translator = SystemTranslator()
+        with open("bid/system/blue_club.dsl", "r") as f:
+            cls.blue_system = translator.parse(f.read())
+        with open("bid/system/gib.dsl", "r") as f:
+            cls.gib_system = translator.parse(f.read())
+        cls.engine = Engine(cls.blue_system)
+
+    def test_deals_match_estimated_constraints(self):
+        # 1C (strong) - Pass - 1NT (4 controls) - Pass
+        history = [
+            Call(CallType.BID, 1, Strain.CLUBS),
+            Call(CallType.PASS),
+            Call(CallType.BID, 1, Strain.NT),
+            Call(CallType.PASS),
+        ]
+        estimates = self.engine.estimate_deal(history, Seat.NORTH, Seat.NORTH, self.blue_system, self.gib_system)
+        dealer = ConstrainedDealer(estimates, seed=1)
+        for deal in dealer.deals(100):
+            seen = 0
+            for seat, hand in deal.items():
+                self.assertTrue(estimates[seat].matches(hand))
+                self.assertEqual(seen & hand.mask, 0)
+                seen |= hand.mask
+            self.assertEqual(seen, (1 << 52) - 1)
+            self.assertEqual(deal[Seat.SOUTH].controls, 4)
+
+    def test_tight_controls_and_aces(self):
+        constraints = {
+            Seat.NORTH: HandConstraints(hcp_min=17, controls_min=7, controls_max=7, balanced=False),
+            Seat.SOUTH: HandConstraints(hcp_min=6, controls_min=3, controls_max=3, aces={1}),
+        }
+        deal = ConstrainedDealer(constraints, seed=2).deal()
+        self.assertEqual(deal[Seat.NORTH].controls, 7)
+        self.assertEqual(deal[Seat.SOUTH].ace_count, 1)
+
+    def test_ace_count_sets(self):
+        # Ace-asking replies (0 or 3, 1 or 4) are sets, not ranges.
+        constraints = {Seat.SOUTH: HandConstraints(aces={0, 3}), Seat.NORTH: HandConstraints(aces={1, 4})}
+        counts = set()
+        for deal in ConstrainedDealer(constraints, seed=6).deals(200):
+            for seat, con in constraints.items():
+                self.assertTrue(con.matches(deal[seat]), seat)
+            counts.add((deal[Seat.SOUTH].ace_count, deal[Seat.NORTH].ace_count))
+        self.assertEqual(counts, {(0, 1), (0, 4), (3, 1)})
+        # 0 or 3 and 0 or 3 leave the other two seats one or four aces between them.
+        self.assertRaises(ValueError, ConstrainedDealer, {seat: HandConstraints(aces={0, 3}) for seat in Seat})
+
+    def test_total_points_and_topology(self):
+        constraints = {
+            Seat.NORTH: HandConstraints(hcp_max=15, tp_min=20, tp_max=20),
+            Seat.EAST: HandConstraints(ace_topology={"COLOR"}),
+            Seat.SOUTH: HandConstraints(hcp_min=9, hcp_max=11, tp_min=10, tp_max=11, ace_topology={"MIXED", "NONE"}),
+        }
+        for deal in ConstrainedDealer(constraints, seed=3).deals(50):
+            for seat, con in constraints.items():
+                self.assertTrue(con.matches(deal[seat]), seat)
+            self.assertEqual(deal[Seat.NORTH].total_points, 20)
+            self.assertEqual(deal[Seat.EAST].ace_topology, "COLOR")
+
+    def test_rare_shapes_fall_back_to_search(self):
+        # With no random attempts at all, deal() goes straight to the exhaustive search.
+        constraints = {Seat.WEST: HandConstraints(hcp_max=14, tp_min=21)}
+        deal = ConstrainedDealer(constraints, seed=4, max_attempts=0).deal()
+        self.assertTrue(constraints[Seat.WEST].matches(deal[Seat.WEST]))
+
+    def test_unsatisfiable(self):
+        cases = [
+            {Seat.NORTH: HandConstraints(hcp_min=22), Seat.SOUTH: HandConstraints(hcp_min=19)},
+            # Two aces of one color for North leave the other color to South.
+            {Seat.NORTH: HandConstraints(ace_topology={"COLOR"}), Seat.SOUTH: HandConstraints(ace_topology={"MIXED"})},
+            # Shapes short enough for 24 TP leave too few slots for 16 HCP of honors.
+            {Seat.NORTH: HandConstraints(hcp_max=16, tp_min=24)},
+        ]
+        for constraints in cases:
+            self.assertRaises(ValueError, ConstrainedDealer, constraints)
+
+    def test_seed_is_reproducible(self):
+        constraints = {Seat.EAST: HandConstraints(hcp_min=15, hcp_max=17, balanced=True)}
+        a = [d[Seat.EAST].mask for d in ConstrainedDealer(constraints, seed=9).deals(20)]
+        b = [d[Seat.EAST].mask for d in ConstrainedDealer(constraints, seed=9).deals(20)]
+        self.assertEqual(a, b)
+
+    def test_impossible_shape(self):
+        length_min = {s: 0 for s in Suit}
+        length_min[Suit.SPADES] = 7
+        length_min[Suit.HEARTS] = 7
+        with self.assertRaises(ValueError):
+            ConstrainedDealer({Seat.NORTH: HandConstraints(length_min=length_min)})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import random
+import unittest
+from bid.double_dummy import DoubleDummySolver, dds, solve_deal, solve_deals
+from bid.models import CompactHand, Seat, Strain
+
+def ending(**hands):
+    """Deal from space separated cards per seat, e.g. ending(N="SA SK", E=...)."""
+    return {seat: CompactHand.from_string(hands[str(seat)]) for seat in Seat}
+
+def random_ending(rng, cards):
+    deck = list(range(52))
+    rng.shuffle(deck)
+    return {seat: CompactHand.from_mask(sum(1 << c for c in deck[cards * seat:cards * (seat + 1)])) for seat in Seat}
+
+def minimax_ns_tricks(masks, trump, leader):
+    """Exhaustive search without any pruning, as a reference."""
+    def play(hands, seat, played):
+        if len(played) == 4:
+            win_seat, win = played[0]
+            for s, c in played[1:]:
+                if (c // 13 == win // 13 and c > win) or (c // 13 == trump and win // 13 != trump):
+                    win_seat, win = s, c
+            won = int(win_seat % 2 == 0)
+            return won + (play(hands, win_seat, ()) if any(hands) else 0)
+        cards = [c for c in range(52) if hands[seat] >> c & 1]
+        if played:
+            follow = [c for c in cards if c // 13 == played[0][1] // 13]
+            cards = follow or cards
+        results = []
+        for card in cards:
+            rest = list(hands)
+            rest[seat] &= ~(1 << card)
+            results.append(play(tuple(rest), (seat + 1) % 4, played + ((seat, card),)))
+        return max(results) if seat % 2 == 0 else min(results)
+    return play(tuple(masks), leader, ())
+
+class TestDoubleDummySolver(unittest.TestCase):
+    def test_top_cards_in_notrump(self):
+        deal = ending(N="SA SK SQ", E="S5 S4 S3", S="H4 H3 H2", W="HA HK HQ")
+        solver = DoubleDummySolver(deal)
+        # East leads a spade into North's winners; West's hearts win on a heart lead.
+        self.assertEqual(solver.tricks(Strain.NT, Seat.NORTH), 3)
+        self.assertEqual(solver.tricks(Strain.NT, Seat.SOUTH), 0)
+
+    def test_ruff(self):
+        deal = ending(N="SA SK", E="HA HK", S="C3 C2", W="D3 D2")
+        # Hearts trumps, East declares: South leads a club, East ruffs and draws the rest.
+        self.assertEqual(DoubleDummySolver(deal).tricks(Strain.HEARTS, Seat.EAST), 2)
+        # In notrump nobody can follow South's clubs.
+        self.assertEqual(DoubleDummySolver(deal).tricks(Strain.NT, Seat.EAST), 0)
+
+    def test_finesse(self):
+        # North's AQ sits over West's K unless North has to lead the suit.
+        deal = ending(N="SA SQ", E="S6 S5", S="S4 S3", W="SK S2")
+        solver = DoubleDummySolver(deal)
+        self.assertEqual(solver.tricks(Strain.NT, Seat.EAST), 0)  # South leads towards the AQ
+        self.assertEqual(solver.tricks(Strain.NT, Seat.WEST), 1)  # North leads away from it
+
+    def test_matches_exhaustive_search(self):
+        rng = random.Random(7)
+        for _ in range(8):
+            deal = random_ending(rng, 3)
+            masks = [deal[seat].mask for seat in Seat]
+            table = solve_deal(deal)
+            for strain in Strain:
+                trump = None if strain == Strain.NT else int(strain)
+                for declarer in Seat:
+                    ns = minimax_ns_tricks(masks, trump, (declarer + 1) % 4)
+                    expected = ns if declarer % 2 == 0 else 3 - ns
+                    self.assertEqual(table[declarer][strain], expected, (declarer, strain))
+
+    def test_table_shape(self):
+        rng = random.Random(3)
+        deal = random_ending(rng, 6)
+        table = solve_deal(deal)
+        self.assertEqual(len(table), 4)
+        for declarer in Seat:
+            self.assertEqual(len(table[declarer]), 5)
+            for strain in Strain:
+                self.assertTrue(0 <= table[declarer][strain] <= 6)
+                self.assertEqual(table[declarer][strain], DoubleDummySolver(deal).tricks(strain, declarer))
+
+    def test_batch(self):
+        rng = random.Random(11)
+        deals = [random_ending(rng, 4) for _ in range(3)]
+        self.assertEqual(solve_deals(deals, workers=1), [solve_deal(deal) for deal in deals])
+        self.assertEqual(solve_deals(deals, workers=2), [solve_deal(deal) for deal in deals])
+
+    FULL_DEAL = dict(N="S6 HQ H8 H7 H5 H4 D2 CA CQ CJ C9 C5 C2",
+                     E="SA S9 S7 S4 S3 HA H9 H2 DK D8 D7 CT C6",
+                     S="S8 S5 HK HT H3 DQ D9 D6 D4 C8 C7 C4 C3",
+                     W="SK SQ SJ ST S2 HJ H6 DA DJ DT D5 D3 CK")
+    # Checked against the DDS solver.
+    FULL_TABLE = [[10, 2, 9, 1, 2], [3, 11, 3, 12, 7], [10, 2, 9, 1, 2], [3, 11, 3, 12, 7]]
+
+    def test_full_deal(self):
+        # One of the quicker deals for the pure Python search (about 15 seconds); most take minutes.
+        self.assertEqual(DoubleDummySolver(ending(**self.FULL_DEAL)).table(), self.FULL_TABLE)
+
+    @unittest.skipIf(dds is None, "endplay not installed")
+    def test_dds_backend(self):
+        rng = random.Random(5)
+        endings = [random_ending(rng, 4) for _ in range(2)]
+        deals = [endings[0], ending(**self.FULL_DEAL), endings[1]]
+        # The full deal goes to DDS, the endings to DoubleDummySolver, and the order is kept.
+        self.assertEqual(solve_deals(deals, workers=1),
+                         [DoubleDummySolver(endings[0]).table(), self.FULL_TABLE, DoubleDummySolver(endings[1]).table()])
+        self.assertEqual(solve_deal(ending(**self.FULL_DEAL)), self.FULL_TABLE)
+        # More deals than one DDS call takes.
+        full = [random_ending(rng, 13) for _ in range(45)]
+        tables = solve_deals(full)
+        self.assertEqual(len(tables), 45)
+        self.assertEqual(tables[44], solve_deal(full[44]))
+
+    def test_unequal_hands(self):
+        deal = ending(N="SA SK", E="S5 S4", S="H4 H3", W="HA")
+        with self.assertRaises(ValueError):
+            DoubleDummySolver(deal)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from bid.translator import SystemTranslator
+from bid.engine import Engine
+from bid.inference import consistent_mask, infer_auction, random_hands
+from bid.models import Call, CallType, CompactHand, Seat, Strain, Suit
+from bid.constraints import HandConstraints
+
+PASS = Call(CallType.PASS)
+ONE_NT = Call(CallType.BID, 1, Strain.NT)
+ONE_CLUB = Call(CallType.BID, 1, Strain.CLUBS)
+
+class TestInference(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open("bid/system/gib.dsl", "r") as f:
+            cls.gib = SystemTranslator().parse(f.read())
+        cls.toy = SystemTranslator().parse(
+            "OPEN 1NT:\n  HCP: 15-17\n  SHAPE: BALANCED\n\n"
+            "OPEN 1C:\n  HCP: 12+\n")
+
+    def test_first_match_semantics(self):
+        hands = random_hands(5000, seed=2)
+        rules = self.toy.triggered([])
+        club = consistent_mask(rules, ONE_CLUB, hands)
+        notrump = consistent_mask(rules, ONE_NT, hands)
+        passed = consistent_mask(rules, PASS, hands)
+        # Every hand makes exactly one of the three calls.
+        self.assertTrue(((club.astype(int) + notrump + passed) == 1).all())
+        # 1C denies a 1NT opening.
+        strong_nt = HandConstraints(hcp_min=15, hcp_max=17, balanced=True).compiled.mask(hands)
+        self.assertFalse((club & strong_nt).any())
+        self.assertTrue((hands.hcp[passed] < 12).all())
+
+    def test_negative_inference_from_pass(self):
+        history = [PASS, Call(CallType.BID, 1, Strain.HEARTS)]
+        result = infer_auction(history, Seat.NORTH, Seat.NORTH, self.gib, self.gib, "exact")
+        self.assertLess(result[Seat.NORTH].to_constraints().hcp_max, 12)
+        self.assertEqual(result[Seat.EAST].length_histogram(Suit.HEARTS)[:5].sum(), 0)
+        self.assertEqual(result[Seat.SOUTH].unexplained, ())
+        self.assertAlmostEqual(result[Seat.SOUTH].hcp_histogram().sum(), 1.0)
+
+    def test_sampling_agrees_with_exact(self):
+        history = [PASS, Call(CallType.BID, 1, Strain.HEARTS), PASS, Call(CallType.BID, 1, Strain.SPADES)]
+        engine = Engine(self.gib)
+        exact = engine.infer_deal(history, Seat.NORTH, Seat.NORTH, self.gib, self.gib, "exact")
+        sampled = engine.infer_deal(history, Seat.NORTH, Seat.NORTH, self.gib, self.gib, "sample", seed=3)
+        for seat in Seat:
+            self.assertAlmostEqual(exact[seat].mean("hcp"), sampled[seat].mean("hcp"), delta=0.3)
+            self.assertAlmostEqual(exact[seat].mean("len_h"), sampled[seat].mean("len_h"), delta=0.1)
+
+    def test_columns_outside_the_rules(self):
+        # The toy rules only look at HCP and shape.
+        history = [ONE_NT]
+        exact = infer_auction(history, Seat.NORTH, Seat.NORTH, self.toy, self.toy, "exact")
+        with self.assertRaises(ValueError):
+            exact[Seat.NORTH].mean("controls")
+        with self.assertRaises(ValueError):
+            exact[Seat.NORTH].histogram("ace_count", 5)
+        with self.assertRaises(ValueError):
+            exact[Seat.NORTH].probability(HandConstraints(controls_min=3))
+        exact = infer_auction(history, Seat.NORTH, Seat.NORTH, self.toy, self.toy, "exact",
+                              columns=("controls", "ace_count"))
+        sampled = infer_auction(history, Seat.NORTH, Seat.NORTH, self.toy, self.toy, "sample", seed=4)
+        for column in ("controls", "ace_count"):
+            self.assertAlmostEqual(exact[Seat.NORTH].mean(column), sampled[Seat.NORTH].mean(column), delta=0.1)
+        self.assertGreater(exact[Seat.NORTH].mean("controls"), 3)
+        self.assertAlmostEqual(exact[Seat.NORTH].probability(HandConstraints(controls_min=5)),
+                               sampled[Seat.NORTH].probability(HandConstraints(controls_min=5)), delta=0.03)
+
+    def test_known_hand(self):
+        hand = CompactHand.from_string("SA SK HA HK DA DK CA CK C2 C3 C4 C5 C6")
+        result = infer_auction([], Seat.NORTH, Seat.NORTH, self.toy, self.toy, "exact", known_hand=hand)
+        self.assertEqual(result[Seat.NORTH].mean("hcp"), 28)
+        self.assertEqual(result[Seat.EAST].probability(HandConstraints(hcp_min=13)), 0.0)
+
+    def test_unexplained_call(self):
+        result = infer_auction([Call(CallType.BID, 7, Strain.NT)], Seat.NORTH, Seat.NORTH,
+                               self.toy, self.toy, "sample", samples=500, seed=1)
+        self.assertEqual(result[Seat.NORTH].unexplained, (0,))
+        self.assertEqual(result[Seat.NORTH].total, 500)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+from bid.ingest import parse_lin, parse_pbn, read_boards, read_lin, read_pbn
+from bid.models import Call, CallType, CompactHand, DealGenerator, Seat, Suit
+from bid.simulator import AuctionSimulator
+from bid.translator import SystemTranslator
+
+PBN_SAMPLE = """% PBN 2.1
+[Event "Club game"]
+[Board "3"]
+[Dealer "S"]
+[Vulnerable "EW"]
+[Deal "N:AKQ2.K3.A52.QJ43 JT9.AQ42.KQ3.T92 8765.JT9.JT9.AK5 43.8765.8764.876"]
+{ a comment spanning
+  two lines }
+[Auction "S"]
+Pass 1C! =1= Pass 1H
+Pass 2NT $1 Pass 3NT
+AP
+[Note "1:Could be short"]
+
+[Event "Club game"]
+[Board "4"]
+[Dealer "W"]
+[Vulnerable "All"]
+[Deal "W:- - AKQJT98765432... -"]
+[Auction "W"]
+7S X XX Pass
+Pass Pass
+"""
+
+LIN_SAMPLE = ("pn|a,b,c,d|st||md|3SAKQ2HK3DA52CQJ43,SJT9HAQ42DKQ3CT92,S8765HJT9DJT9CAK5,|"
+              "rh||ah|Board 5|sv|n|mb|1C!|an|strong|mb|p|mb|1H|mb|p|mb|p|mb|p|pg||\n"
+              "qx|o6|md|4S8765HJT9DJT9CAK5,S43H8765D8764C876,SAKQ2HK3DA52CQJ43,SJT9HAQ42DKQ3CT92|sv|b|\n"
+              "mb|p|mb|p|mb|p|mb|p|pg||\n")
+
+def to_pbn(number, dealer, deal, calls):
+    hands = " ".join(".".join("".join("AKQJT98765432"[12 - b] for b in range(12, -1, -1) if hand.suit_masks[s] >> b & 1)
+                              for s in (Suit.SPADES, Suit.HEARTS, Suit.DIAMONDS, Suit.CLUBS))
+                     for hand in (deal[Seat(i)] for i in range(4)))
+    auction = " ".join("Pass" if str(c) == "PASS" else str(c) for c in calls)
+    return (f'[Board "{number}"]\n[Dealer "{dealer}"]\n[Vulnerable "None"]\n[Deal "N:{hands}"]\n'
+            f'[Auction "{dealer}"]\n{auction}\n\n')
+
+def to_lin(number, dealer, deal, calls):
+    order = (Seat.SOUTH, Seat.WEST, Seat.NORTH, Seat.EAST)
+    hands = ",".join("".join(s + "".join("AKQJT98765432"[12 - b] for b in range(12, -1, -1)
+                                         if deal[seat].suit_masks["CDHS".index(s)] >> b & 1) for s in "SHDC")
+                     for seat in order)
+    digit = {Seat.SOUTH: 1, Seat.WEST: 2, Seat.NORTH: 3, Seat.EAST: 4}[dealer]
+    mb = "".join(f"mb|{'p' if str(c) == 'PASS' else 'd' if str(c) == 'X' else 'r' if str(c) == 'XX' else str(c)}|"
+                 for c in calls)
+    return f"qx|o{number}|md|{digit}{hands}|sv|o|{mb}pg||\n"
+
+def to_lin_lines(number, dealer, deal, calls):
+    """to_lin spread over lines the way vugraph files are: qx, then pn / md / mb lines."""
+    record = to_lin(number, dealer, deal, calls)
+    record = record.replace("|md|", f"|\npn|n{number},e,s,w|st||\nmd|", 1)
+    return record.replace("|mb|", "|\nmb|", 1).replace("|pg||", "|\npg||")
+
+class TestIngest(unittest.TestCase):
+    def test_pbn_sample(self):
+        first, second = list(parse_pbn(PBN_SAMPLE))
+        self.assertEqual((first.number, first.dealer, first.vulnerability), (3, Seat.SOUTH, "EW"))
+        self.assertEqual(first.deal[Seat.NORTH], CompactHand.from_string("SA SK SQ S2 HK H3 DA D5 D2 CQ CJ C4 C3"))
+        self.assertEqual(" ".join(map(str, first.auction)), "PASS 1C PASS 1H PASS 2NT PASS 3NT PASS PASS PASS")
+        self.assertEqual(second.vulnerability, "All")
+        self.assertEqual(list(second.deal), [Seat.EAST])
+        self.assertEqual(second.deal[Seat.EAST].length(Suit.SPADES), 13)
+        self.assertEqual(" ".join(map(str, second.auction)), "7S X XX PASS PASS PASS")
+
+    def test_lin_sample(self):
+        first, second = list(parse_lin(LIN_SAMPLE))
+        self.assertEqual((first.number, first.dealer, first.vulnerability), (5, Seat.NORTH, "NS"))
+        # East's hand is left out of md and reconstructed.
+        self.assertEqual(first.deal[Seat.EAST], CompactHand.from_string("S4 S3 H8 H7 H6 H5 D8 D7 D6 D4 C8 C7 C6"))
+        self.assertEqual(" ".join(map(str, first.auction)), "1C PASS 1H PASS PASS PASS")
+        self.assertEqual((second.number, second.dealer, second.vulnerability), (6, Seat.EAST, "All"))
+        self.assertEqual(len(second.auction), 4)
+
+    def test_names_outside_latin_1(self):
+        pbn = PBN_SAMPLE.replace('[Board "3"]', '[Board "3"]\n[West "Łukasz"]')
+        self.assertEqual([board.number for board in parse_pbn(pbn)], [3, 4])
+        lin = LIN_SAMPLE.replace("pn|a,b,c,d|", "pn|Łukasz,b,c,d|")
+        self.assertEqual([board.number for board in parse_lin(lin)], [5, 6])
+
+    def test_files_round_trip(self):
+        with open("bid/system/gib.dsl", "r") as f:
+            system = SystemTranslator().parse(f.read())
+        simulator = AuctionSimulator(system, system)
+        boards = []
+        for i, deal in enumerate(DealGenerator(8).deals(120)):
+            dealer = Seat(i % 4)
+            boards.append((i + 1, dealer, deal, simulator.bid_deal(deal, dealer).calls))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pbn_path, lin_path = os.path.join(tmp, "boards.pbn"), os.path.join(tmp, "boards.lin")
+            with open(pbn_path, "w") as f:
+                f.writelines(to_pbn(*b) for b in boards)
+            with open(lin_path, "w") as f:
+                f.writelines(to_lin(*b) for b in boards)
+
+            for reader, path in ((read_pbn, pbn_path), (read_lin, lin_path)):
+                for workers, chunk in ((1, 1 << 20), (2, 2000)):
+                    read = list(reader(path, workers=workers, chunk_size=chunk))
+                    self.assertEqual(len(read), len(boards), (path, workers))
+                    for board, (number, dealer, deal, calls) in zip(read, boards):
+                        self.assertEqual((board.number, board.dealer), (number, dealer))
+                        self.assertEqual(board.deal, deal)
+                        self.assertEqual(board.auction, calls)
+            self.assertEqual(len(list(read_boards(lin_path, workers=3, chunk_size=500))), len(boards))
+
+    def test_multiline_lin_chunks(self):
+        # Chunks must not cut between a qx line and the pn / md lines of its board.
+        deals = DealGenerator(9).deals(300)
+        records = [to_lin_lines(i + 1, Seat(i % 4), deal, [Call(CallType.PASS)] * 4) for i, deal in enumerate(deals)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "vugraph.lin")
+            with open(path, "w") as f:
+                f.writelines(records)
+            serial = [(b.number, b.dealer, b.deal, b.auction) for b in read_lin(path)]
+            parallel = [(b.number, b.dealer, b.deal, b.auction) for b in read_lin(path, workers=2, chunk_size=3000)]
+        self.assertEqual([number for number, _, _, _ in serial], list(range(1, 301)))
+        self.assertEqual(parallel, serial)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from bid.constraints import HandConstraints
+from bid.models import Suit
+from bid.probability import probability
+from bid.translator import SystemTranslator
+from bid.overlap import analyze_context, analyze_system, auction_contexts
+
+TOY = """
+OPEN 1NT:
+  HCP: 15-17
+  SHAPE: BALANCED
+
+OPEN 1C:
+  HCP: 12-21
+
+OPEN 2C:
+  HCP: 16-17
+  SHAPE: BALANCED
+
+1C - 1H:
+  HCP: 6+
+  LEN H: 4+
+"""
+
+class TestOverlap(unittest.TestCase):
+    def setUp(self):
+        self.system = SystemTranslator().parse(TOY)
+
+    def test_contexts(self):
+        labels = [label for label, _ in auction_contexts(self.system)]
+        self.assertEqual(labels, ["OPEN", "1C"])
+
+    def test_exact_masses(self):
+        label, rules = auction_contexts(self.system)[0]
+        report = analyze_context(label, rules)
+        calls = [str(r.call) for r in rules]
+        nt, club, two_clubs = calls.index("1NT"), calls.index("1C"), calls.index("2C")
+        # 2C is entirely inside 1NT's range, so it never bids.
+        self.assertEqual([str(r.call) for r in report.shadowed], ["2C"])
+        self.assertEqual(report.claimed[two_clubs], 0)
+        self.assertAlmostEqual(report.overlaps[(nt, two_clubs)], report.matches[two_clubs])
+        # 1NT sits inside 1C's range: claimed mass is what 1NT leaves over.
+        self.assertAlmostEqual(report.claimed[club], report.matches[club] - report.matches[nt])
+        self.assertAlmostEqual(report.gap, 1 - report.matches[club])
+        self.assertEqual(report.dead, [])
+        self.assertTrue(all(region.startswith("HCP ") for region, _ in report.gap_regions))
+
+    def test_response_length_applied(self):
+        label, rules = auction_contexts(self.system)[1]
+        self.assertEqual(rules[0].constraints.length_min[Suit.HEARTS], 4)
+        report = analyze_context(label, rules)
+        hcp_only = probability(HandConstraints(hcp_min=6))
+        self.assertAlmostEqual(report.matches[0], probability(rules[0].constraints))
+        self.assertLess(report.matches[0], hcp_only)
+
+    def test_sampling_agrees_with_exact(self):
+        with open("bid/system/blue_club.dsl", "r") as f:
+            system = SystemTranslator().parse(f.read())
+        exact = analyze_system(system)
+        sampled = analyze_system(system, "sample", samples=20000, seed=4)
+        self.assertEqual([c.auction for c in exact.contexts], [c.auction for c in sampled.contexts])
+        for e, s in zip(exact.contexts, sampled.contexts):
+            self.assertAlmostEqual(e.gap, s.gap, delta=0.02, msg=e.auction)
+            self.assertAlmostEqual(e.overlap, s.overlap, delta=0.02, msg=e.auction)
+        self.assertIn("Shadowed rules", exact.format())
+
+if __name__ == '__main__':
+    unittest.main()
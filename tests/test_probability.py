@@ -0,0 +1,61 @@
+import itertools
+import random
+import unittest
+from math import comb
+from bid.constraints import HandConstraints
+from bid.models import CompactHand, DealGenerator, Seat, Suit
+from bid.probability import count_hands, probability, remaining_deck
+
+def lengths(**bounds):
+    """length_min / length_max dicts from e.g. S=(5, 13)."""
+    mins = {s: bounds.get(str(s), (0, 13))[0] for s in Suit}
+    maxs = {s: bounds.get(str(s), (0, 13))[1] for s in Suit}
+    return {"length_min": mins, "length_max": maxs}
+
+CONSTRAINTS = [
+    HandConstraints(hcp_min=15, hcp_max=17, balanced=True),
+    HandConstraints(tp_min=22),
+    HandConstraints(controls_min=5, aces={2}, ace_topology={"RANK", "COLOR"}),
+    HandConstraints(hcp_min=11, hcp_max=15, tp_min=12, balanced=False, **lengths(H=(5, 13))),
+    HandConstraints(hcp_max=9, **lengths(S=(6, 6), H=(0, 3))),
+]
+
+class TestProbability(unittest.TestCase):
+    def test_whole_deck(self):
+        self.assertEqual(count_hands(HandConstraints()), comb(52, 13))
+        five_spades = HandConstraints(**lengths(S=(5, 13)))
+        self.assertEqual(count_hands(five_spades), sum(comb(13, k) * comb(39, 13 - k) for k in range(5, 14)))
+        # Exactly one of balanced / unbalanced.
+        self.assertAlmostEqual(probability(HandConstraints(balanced=True)) +
+                               probability(HandConstraints(balanced=False)), 1.0)
+
+    def test_matches_enumeration_of_partial_deck(self):
+        rng = random.Random(3)
+        cards = rng.sample(range(52), 18)
+        available = [0, 0, 0, 0]
+        for card in cards:
+            available[card // 13] |= 1 << (card % 13)
+        hands = [CompactHand.from_mask(sum(1 << c for c in combo)) for combo in itertools.combinations(cards, 5)]
+        for constraints in [HandConstraints(hcp_min=4, hcp_max=9),
+                            HandConstraints(tp_min=8, controls_max=2),
+                            HandConstraints(aces={1, 2}, ace_topology={"NONE", "MIXED"}),
+                            HandConstraints(hcp_min=3, **lengths(C=(0, 2), S=(0, 1))),
+                            HandConstraints(balanced=False, hcp_max=6)]:
+            self.assertEqual(count_hands(constraints, tuple(available), 5),
+                             sum(constraints.matches(h) for h in hands), str(constraints))
+
+    def test_agrees_with_sampling(self):
+        hands = DealGenerator(5).batch(20000)[Seat.NORTH]
+        for constraints in CONSTRAINTS:
+            sampled = constraints.matches_batch(hands).mean()
+            self.assertAlmostEqual(probability(constraints), sampled, delta=0.006, msg=str(constraints))
+
+    def test_remaining_deck(self):
+        hand = CompactHand.from_string("SAKQJT98765432")
+        rest = remaining_deck(hand.suit_masks)
+        self.assertEqual(count_hands(HandConstraints(), rest), comb(39, 13))
+        self.assertEqual(count_hands(HandConstraints(**lengths(S=(1, 13))), rest), 0)
+        self.assertEqual(probability(HandConstraints(hcp_min=31), rest), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+from bid.models import DealGenerator, Seat
+from bid.profiler import RuleProfiler, moved_rules, optimize_order, profile_system
+from bid.simulator import AuctionSimulator
+from bid.translator import SystemTranslator, save_compiled_for
+
+class TestProfiler(unittest.TestCase):
+    def load(self, name="precision"):
+        return SystemTranslator().load(f"bid/system/{name}.dsl", use_cache=False)
+
+    def test_counts(self):
+        system = self.load()
+        profiler = profile_system(system, deals=150, seed=3)
+        self.assertGreater(profiler.bids, 150)
+        rows = profiler.rows()
+        for _, tested, hits, passed, won in rows:
+            self.assertTrue(won <= passed <= hits <= tested <= profiler.bids)
+        # Responses are only tested after their opening, not on every bid.
+        self.assertLess(min(tested for _, tested, _, _, _ in rows), max(tested for _, tested, _, _, _ in rows))
+        self.assertLessEqual(sum(profiler.won.values()), profiler.bids)
+        # Same choice as the unprofiled system.
+        hand = next(DealGenerator(4).deals(1))[Seat.SOUTH]
+        self.assertIs(RuleProfiler(system).get_bid(system, [], hand), system.get_bid([], hand))
+
+    def test_reorder_keeps_every_bid(self):
+        for name in ("precision", "blue_club"):
+            system, reference = self.load(name), self.load(name)
+            order = optimize_order(system, profile_system(system, deals=300, seed=5))
+            self.assertGreater(moved_rules(system, order), 0)
+            system.reorder(order)
+            self.assertTrue(all(a.priority >= b.priority for a, b in zip(system.rules, system.rules[1:])))
+            optimized, plain = AuctionSimulator(system, system), AuctionSimulator(reference, reference)
+            for i, deal in enumerate(DealGenerator(6).deals(300)):
+                self.assertEqual(optimized.bid_deal(deal, Seat(i % 4)).calls,
+                                 plain.bid_deal(deal, Seat(i % 4)).calls, name)
+
+    def test_reorder_validates(self):
+        system = self.load()
+        self.assertRaises(ValueError, system.reorder, system.rules[1:])
+        self.assertRaises(ValueError, system.reorder, list(reversed(system.rules)))
+
+    def test_order_persists_in_compiled_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "precision.dsl")
+            shutil.copy("bid/system/precision.dsl", path)
+            system = SystemTranslator().load(path)
+            order = optimize_order(system, profile_system(system, deals=100, seed=7))
+            system.reorder(order)
+            save_compiled_for(system, path)
+            reloaded = SystemTranslator().load(path)
+            self.assertEqual([(r.description, str(r.call)) for r in reloaded.rules],
+                             [(r.description, str(r.call)) for r in order])
+
+if __name__ == '__main__':
+    unittest.main()
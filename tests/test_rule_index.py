@@ -0,0 +1,98 @@
+import random
+import unittest
+from bid.translator import SystemTranslator
+from bid.system import BiddingSystem, CandidateIndex, Rule
+from bid.constraints import HandConstraints
+from bid.models import Call, CallType, CompactHand, Strain
+
+PASS = Call(CallType.PASS)
+
+def linear_get_bid(system, history, hand):
+    for rule in system.rules:
+        if rule.applies(history, hand):
+            return rule
+    return None
+
+def auctions_for(system):
+    """Auctions reaching every rule's trigger, plus a few variations on the pass gaps."""
+    auctions = [[], [PASS], [PASS, PASS, PASS], [PASS] * 4]
+    for rule in system.rules:
+        history = []
+        for call, is_direct in rule.trigger.steps:
+            history.append(call)
+            if not is_direct:
+                history.append(PASS)
+        auctions.append(history)
+        auctions.append([PASS] + history)
+        if history and history[-1] == PASS:
+            auctions.append(history[:-1])
+    return auctions
+
+class TestRuleIndex(unittest.TestCase):
+    def test_same_bids_as_linear_scan(self):
+        translator = SystemTranslator()
+        random.seed(17)
+        hands = [CompactHand.random() for _ in range(20)]
+        for path in ("bid/system/blue_club.dsl", "bid/system/precision.dsl", "bid/system/gib.dsl"):
+            with open(path, "r") as f:
+                system = translator.parse(f.read())
+            for history in auctions_for(system):
+                for hand in hands:
+                    self.assertIs(system.get_bid(history, hand), linear_get_bid(system, history, hand))
+
+    def test_automaton_matches_trigger_closures(self):
+        translator = SystemTranslator()
+        random.seed(5)
+        for path in ("bid/system/blue_club.dsl", "bid/system/gib.dsl"):
+            with open(path, "r") as f:
+                system = translator.parse(f.read())
+            auctions = auctions_for(system)
+            # Vary the pass gaps to probe the direct / pass-consuming distinction.
+            for history in list(auctions):
+                variant = []
+                for call in history:
+                    if call != PASS or random.random() < 0.7:
+                        variant.append(call)
+                    if random.random() < 0.3:
+                        variant.append(PASS)
+                auctions.append(variant)
+            for history in auctions:
+                expected = [r for r in system.rules if r.trigger(history)]
+                self.assertEqual(system.triggered(history), expected, [str(c) for c in history])
+
+    def test_candidate_index_prunes_soundly(self):
+        with open("bid/system/precision.dsl", "r") as f:
+            system = SystemTranslator().parse(f.read())
+        system.bid_cache.maxsize = 0
+        openings = system.triggered([])
+        index = CandidateIndex(openings)
+        random.seed(23)
+        pruned = 0
+        for _ in range(200):
+            hand = CompactHand.random()
+            candidates = index.candidates(hand)
+            self.assertEqual([r for r in candidates if r.constraints.matches(hand)],
+                             [r for r in openings if r.constraints.matches(hand)])
+            self.assertIs(index.first_match(hand), linear_get_bid(system, [], hand))
+            self.assertIs(system.get_bid([], hand), linear_get_bid(system, [], hand))
+            pruned += len(openings) - len(candidates)
+        self.assertGreater(pruned, 200 * len(openings) // 2)
+
+    def test_arbitrary_triggers_keep_priority_order(self):
+        system = BiddingSystem("Mixed")
+        translator = SystemTranslator()
+        dsl = translator.parse("OPEN 1C:\n  HCP: 12+\n\nOPEN 1D:\n  HCP: 10+\n")
+        for rule in dsl.rules:
+            system.add_rule(rule)
+        system.add_rule(Rule(11, lambda h: True, HandConstraints(hcp_min=15),
+                             Call(CallType.BID, 2, Strain.NT), "Anywhere 2NT"))
+        system.add_rule(Rule(5, lambda h: True, HandConstraints(),
+                             Call(CallType.BID, 3, Strain.NT), "Anywhere 3NT"))
+        strong = CompactHand.from_string("SAKQ2 HAK2 DKQ2 C32")
+        weak = CompactHand.from_string("S5432 H432 D432 C32")
+        self.assertEqual(str(system.get_bid([], strong).call), "2NT")
+        self.assertEqual(str(system.get_bid([], weak).call), "3NT")
+        self.assertEqual(str(system.get_bid([Call(CallType.BID, 1, Strain.HEARTS)], weak).call), "3NT")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from bid.simulator import (AuctionSimulator, SimulationStats, compare_systems, final_contract, is_legal, simulate,
+                           system_pairs)
+from bid.translator import SystemTranslator
+from bid.models import Call, CallType, CompactHand, Seat, Strain, auction_over, np
+
+PASS = Call(CallType.PASS)
+X = Call(CallType.DOUBLE)
+XX = Call(CallType.REDOUBLE)
+
+def bid(level, strain):
+    return Call(CallType.BID, level, strain)
+
+class TestAuctionRules(unittest.TestCase):
+    def test_auction_over(self):
+        self.assertFalse(auction_over([PASS, PASS, PASS]))
+        self.assertTrue(auction_over([PASS] * 4))
+        self.assertFalse(auction_over([bid(1, Strain.CLUBS), PASS, PASS]))
+        self.assertTrue(auction_over([bid(1, Strain.CLUBS), PASS, PASS, PASS]))
+
+    def test_is_legal(self):
+        one_heart = [bid(1, Strain.HEARTS)]
+        self.assertTrue(is_legal(one_heart, bid(1, Strain.SPADES)))
+        self.assertFalse(is_legal(one_heart, bid(1, Strain.DIAMONDS)))
+        self.assertTrue(is_legal(one_heart, X))
+        self.assertFalse(is_legal(one_heart + [PASS], X))  # partner's bid
+        self.assertTrue(is_legal(one_heart + [PASS, PASS], X))  # balancing
+        self.assertFalse(is_legal(one_heart, XX))
+        self.assertTrue(is_legal(one_heart + [X], XX))
+        self.assertFalse(is_legal([], X))
+
+    def test_final_contract(self):
+        # N: 1H, E: P, S: 2H, W: X, N: 4H, E: X, all pass -> 4H doubled by North.
+        calls = [bid(1, Strain.HEARTS), PASS, bid(2, Strain.HEARTS), X, bid(4, Strain.HEARTS), X, PASS, PASS, PASS]
+        contract = final_contract(calls, Seat.NORTH)
+        self.assertEqual(str(contract), "4Hx N")
+        # Dealer East: E: P, S: 1S, W: P, N: 3NT -> declarer North.
+        calls = [PASS, bid(1, Strain.SPADES), PASS, bid(3, Strain.NT), PASS, PASS, PASS]
+        self.assertEqual(str(final_contract(calls, Seat.EAST)), "3NT N")
+        self.assertIsNone(final_contract([PASS] * 4, Seat.NORTH))
+
+class TestAuctionSimulator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open("bid/system/blue_club.dsl", "r") as f:
+            cls.blue_system = SystemTranslator().parse(f.read())
+
+    def test_bid_deal(self):
+        deal = {
+            Seat.NORTH: CompactHand.from_string("SKQJ2 HKQJ2 DKJ2 C32"),
+            Seat.EAST: CompactHand.from_string("S543 H543 D543 C5432"),
+            Seat.SOUTH: CompactHand.from_string("SA98 HA98 DA98 CA987"),
+            Seat.WEST: CompactHand.from_string("S76 H76 DQT76 CKQJT6"),
+        }
+        result = AuctionSimulator(self.blue_system, self.blue_system).bid_deal(deal, Seat.NORTH)
+        self.assertEqual(str(result.calls[0]), "1NT")
+        self.assertTrue(auction_over(result.calls))
+        self.assertEqual(result.illegal, 0)
+        self.assertIn(result.contract.declarer, (Seat.NORTH, Seat.SOUTH))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_simulate(self):
+        stats = simulate("bid/system/gib.dsl", "bid/system/blue_club.dsl", 300, workers=1, seed=3, shard_size=100)
+        self.assertEqual(stats.auctions, 300)
+        self.assertEqual(stats.passed_out + sum(stats.contracts.values()), 300)
+        self.assertGreater(stats.auctions_per_second, 0)
+        again = simulate("bid/system/gib.dsl", "bid/system/blue_club.dsl", 300, workers=1, seed=3, shard_size=100)
+        self.assertEqual(stats.contracts, again.contracts)
+        merged = SimulationStats().merge(stats).merge(again)
+        self.assertEqual(merged.auctions, 600)
+
+    def test_system_pairs(self):
+        self.assertEqual(system_pairs(["a", "b", "c"], "head-to-head"),
+                         [("a", "b"), ("b", "a"), ("a", "c"), ("c", "a"), ("b", "c"), ("c", "b")])
+        self.assertEqual(system_pairs(["a", "b"]), [("a", "a"), ("b", "b"), ("a", "b"), ("b", "a")])
+        self.assertRaises(ValueError, system_pairs, ["a"], "round-robin")
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_compare_head_to_head(self):
+        gib, blue = "bid/system/gib.dsl", "bid/system/blue_club.dsl"
+        results = compare_systems([gib, blue], 200, workers=1, seed=5, pairings="head-to-head")
+        self.assertEqual(list(results), [(gib, blue), (blue, gib)])
+        # Both seatings bid the same seeded deals as a plain simulate() of the pair.
+        forward, backward = results[(gib, blue)], results[(blue, gib)]
+        self.assertEqual(forward.auctions, backward.auctions)
+        self.assertEqual(forward.contracts, simulate(gib, blue, 200, workers=1, seed=5).contracts)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import unittest
+from bid.engine import Engine
+from bid.models import DealGenerator, Seat, parse_hand
+from bid.simulator import AuctionSimulator
+from bid.translator import SystemTranslator
+from bid.tracing import Tracer
+
+class TestTracing(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open("bid/system/gib.dsl", "r") as f:
+            cls.system = SystemTranslator().parse(f.read())
+
+    def test_same_calls_as_untraced(self):
+        tracer = Tracer(keep=50)
+        plain = AuctionSimulator(self.system, self.system)
+        traced = AuctionSimulator(self.system, self.system)
+        traced.engine = Engine(self.system, tracer=tracer)
+        for i, deal in enumerate(DealGenerator(5).deals(60)):
+            self.assertEqual(traced.bid_deal(deal, Seat(i % 4)).calls, plain.bid_deal(deal, Seat(i % 4)).calls)
+        self.assertEqual(len(tracer.traces), 50)
+        self.assertGreater(tracer.bids, 60)
+        self.assertEqual(sum(tracer.stage_ns.values()), tracer.total_ns)
+        json.dumps(tracer.to_dict())
+
+    def test_trace_explains_choice(self):
+        tracer = Tracer()
+        hand = parse_hand("AQ2.KJ3.KQ32.Q32")  # 17 HCP, balanced
+        rule = tracer.get_bid(self.system, [], hand)
+        self.assertIs(rule, self.system.get_bid([], hand))
+        trace = tracer.traces[0]
+        self.assertEqual(trace.context, "OPEN")
+        self.assertEqual(trace.rules[-1].outcome, "matched")
+        self.assertEqual(trace.rule, trace.rules[-1].key)
+        self.assertTrue(trace.rule.endswith("-> 1NT"))
+        for r in trace.rules[:-1]:
+            self.assertIn(r.outcome, ("pruned", "rejected"))
+            self.assertIsNotNone(r.failed)
+        self.assertIn("OPEN", trace.explain())
+
+    def test_folded_stacks(self):
+        tracer = Tracer(keep=0)
+        for deal in DealGenerator(2).deals(20):
+            tracer.get_bid(self.system, [], deal[Seat.NORTH])
+        lines = tracer.folded().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, ns = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith("get_bid;OPEN;"))
+            self.assertGreater(int(ns), 0)
+        self.assertEqual(tracer.traces, [])
+        self.assertEqual(sum(n for _, _, n in tracer.hottest(None)), sum(tracer.rule_checks.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+import argparse
+import json
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from bid.models import Call, DealGenerator, Hand, Seat, auction_context
+from bid.system import BiddingSystem, CandidateIndex, Rule
+from bid.constraints import LENGTH_FEATURES
+
+STAGES = ("automaton", "index", "constraints")
+
+def rule_key(position: int, rule: Rule) -> str:
+    """Same labels as conformance reports: "#<position> <description> -> <call>"."""
+    return f"#{position} {rule.description} -> {rule.call}"
+
+def _hand_text(hand: Hand) -> str:
+    # PBN "AK32.K3.K2.432", spades first.
+    return ".".join("".join("AKQJT98765432"[12 - b] for b in range(12, -1, -1) if mask >> b & 1)
+                    for mask in reversed(hand.suit_masks))
+
+def _pruned_by(index: CandidateIndex, i: int, hand: Hand) -> str:
+    """The index table (hcp or a suit length) that ruled out rule i."""
+    bit = 1 << i
+    if not index.by_hcp[hand.hcp] & bit:
+        return "hcp"
+    for suit, feature in enumerate(LENGTH_FEATURES):
+        if not index.by_length[suit][hand.length(suit)] & bit:
+            return feature
+    return "index"
+
+class RuleTrace:
+    """
+    One triggered rule as get_bid met it: outcome is "pruned" (by the
+    candidate index), "rejected" (predicate false) or "matched". failed is
+    the index table or constraint feature that turned it down; ns the time
+    spent in its predicate.
+    """
+    __slots__ = ("key", "outcome", "failed", "ns")
+
+    def __init__(self, key: str, outcome: str, failed: Optional[str] = None, ns: int = 0):
+        self.key = key
+        self.outcome = outcome
+        self.failed = failed
+        self.ns = ns
+
+    def to_dict(self) -> dict:
+        return {"rule": self.key, "outcome": self.outcome, "failed": self.failed, "ns": self.ns}
+
+class BidTrace:
+    """One traced get_bid: triggered rules up to the winner, and ns per stage."""
+    def __init__(self, history: List[Call], hand: Hand):
+        self.auction = " ".join(str(c) for c in history)
+        self.context = auction_context(history)
+        self.hand = _hand_text(hand)
+        self.triggered = 0
+        self.rules: List[RuleTrace] = []
+        self.rule: Optional[str] = None
+        self.stages: Dict[str, int] = {}
+        self.total_ns = 0
+
+    def to_dict(self) -> dict:
+        return {"auction": self.auction, "context": self.context, "hand": self.hand,
+                "triggered": self.triggered, "rule": self.rule, "total_ns": self.total_ns,
+                "stages": dict(self.stages), "rules": [r.to_dict() for r in self.rules]}
+
+    def explain(self) -> str:
+        lines = [f"{self.context} [{self.auction or '-'}] {self.hand}: {self.rule or 'no rule (PASS)'}",
+                 f"  {self.triggered} triggered, {self.total_ns} ns ("
+                 + ", ".join(f"{stage} {self.stages[stage]}" for stage in STAGES) + ")"]
+        for r in self.rules:
+            reason = f" ({r.failed})" if r.failed else ""
+            lines.append(f"  {r.outcome:<8} {r.key}{reason} {r.ns} ns")
+        return "\n".join(lines)
+
+class Tracer:
+    """
+    Opt-in instrumentation of BiddingSystem.get_bid. Tracer.get_bid makes
+    the same choice as the system (first matching triggered rule) while
+    timing each stage and each predicate; the bid cache is bypassed, so
+    every traced bid is evaluated in full. Nothing is recorded unless a
+    Tracer is used, e.g. Engine(system, tracer=Tracer()).
+
+    Keeps the last `keep` traces (all when None) and, over every bid,
+    per-rule predicate time and folded stacks for flame graphs.
+    """
+    def __init__(self, keep: Optional[int] = None):
+        self.keep = keep
+        self.traces: List[BidTrace] = []
+        self.bids = 0
+        self.total_ns = 0
+        self.stage_ns = Counter()
+        self.rule_ns = Counter()
+        self.rule_checks = Counter()
+        self.stacks = Counter()  # "get_bid;<context>;<stage>[;<rule>]" -> self ns
+
+    def get_bid(self, system: BiddingSystem, history: List[Call], hand: Hand) -> Optional[Rule]:
+        trace = BidTrace(history, hand)
+        clock = time.perf_counter_ns
+        start = clock()
+        automaton = system.automaton
+        rules = automaton.triggered(history)
+        triggered_at = clock()
+        index = automaton.index(rules) if rules else None
+        bits = index.bits(hand) if index is not None else -1
+        indexed_at = clock()
+
+        chosen = None
+        evaluated: List[Tuple[int, int]] = []  # (position in rules, predicate ns)
+        for i, rule in enumerate(rules):
+            if not bits >> i & 1:
+                continue
+            # Lazy compilation of the constraints is charged to the stage, not the rule.
+            predicate = rule.constraints.compiled.predicate
+            t0 = clock()
+            matched = predicate(hand)
+            evaluated.append((i, clock() - t0))
+            if matched:
+                chosen = rule
+                break
+        end = clock()
+
+        # Everything else is worked out off the clock.
+        timings = dict(evaluated)
+        last = evaluated[-1][0] if chosen is not None else len(rules) - 1
+        for i, rule in enumerate(rules[:last + 1]):
+            key = rule_key(automaton.position(rule), rule)
+            if i not in timings:
+                trace.rules.append(RuleTrace(key, "pruned", _pruned_by(index, i, hand)))
+            elif rule is chosen:
+                trace.rules.append(RuleTrace(key, "matched", ns=timings[i]))
+            else:
+                trace.rules.append(RuleTrace(key, "rejected", rule.constraints.compiled.first_failure(hand), timings[i]))
+
+        trace.triggered = len(rules)
+        trace.rule = trace.rules[-1].key if chosen is not None else None
+        trace.stages = {"automaton": triggered_at - start, "index": indexed_at - triggered_at,
+                        "constraints": end - indexed_at}
+        trace.total_ns = end - start
+        self._record(trace)
+        return chosen
+
+    def _record(self, trace: BidTrace):
+        self.bids += 1
+        self.total_ns += trace.total_ns
+        self.stage_ns.update(trace.stages)
+        frame = "get_bid;" + trace.context.replace(";", ",")
+        self.stacks[frame + ";automaton"] += trace.stages["automaton"]
+        self.stacks[frame + ";index"] += trace.stages["index"]
+        predicates = 0
+        for r in trace.rules:
+            if r.outcome != "pruned":
+                self.rule_ns[r.key] += r.ns
+                self.rule_checks[r.key] += 1
+                self.stacks[f"{frame};constraints;{r.key.replace(';', ',')}"] += r.ns
+                predicates += r.ns
+        self.stacks[frame + ";constraints"] += trace.stages["constraints"] - predicates
+        self.traces.append(trace)
+        if self.keep is not None and len(self.traces) > self.keep:
+            del self.traces[:len(self.traces) - self.keep]
+
+    def hottest(self, top: Optional[int] = 10) -> List[Tuple[str, int, int]]:
+        """(rule, total predicate ns, evaluations), most time first (all when top is None)."""
+        return [(key, ns, self.rule_checks[key]) for key, ns in self.rule_ns.most_common(top)]
+
+    def folded(self) -> str:
+        """Folded stacks ("frame;frame;frame ns" per line) for flamegraph.pl / speedscope."""
+        return "".join(f"{stack} {ns}\n" for stack, ns in sorted(self.stacks.items()) if ns > 0)
+
+    def to_dict(self) -> dict:
+        return {"bids": self.bids, "total_ns": self.total_ns, "stages": dict(self.stage_ns),
+                "rules": [{"rule": key, "ns": ns, "evaluations": n} for key, ns, n in self.hottest(None)],
+                "traces": [t.to_dict() for t in self.traces]}
+
+    def save_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    def save_folded(self, path: str):
+        with open(path, "w") as f:
+            f.write(self.folded())
+
+    def format(self, top: int = 10) -> str:
+        per_bid = self.total_ns / self.bids if self.bids else 0.0
+        lines = [f"Traced bids: {self.bids}, {per_bid:,.0f} ns/bid",
+                 "Stages: " + ", ".join(f"{s} {self.stage_ns[s] / max(1, self.total_ns) * 100:.0f}%" for s in STAGES),
+                 f"\n=== Rules by predicate time (top {top}) ==="]
+        for key, ns, n in self.hottest(top):
+            lines.append(f"{key}: {ns:,} ns over {n} evaluations ({ns / n:,.0f} ns each)")
+        return "\n".join(lines)
+
+if __name__ == "__main__":
+    from bid.engine import Engine
+    from bid.simulator import AuctionSimulator
+    from bid.translator import SystemTranslator
+
+    parser = argparse.ArgumentParser(description="Trace rule evaluation of a DSL system over self-play auctions")
+    parser.add_argument("dsl")
+    parser.add_argument("--deals", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write every trace and per-rule totals to this file")
+    parser.add_argument("--folded", help="write folded stacks (flame graph input) to this file")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    system = SystemTranslator().load(args.dsl)
+    tracer = Tracer(keep=None if args.json else 0)
+    simulator = AuctionSimulator(system, system)
+    simulator.engine = Engine(system, tracer=tracer)
+    for i, deal in enumerate(DealGenerator(args.seed).deals(args.deals)):
+        simulator.bid_deal(deal, Seat(i % 4))
+    print(tracer.format(args.top))
+    if args.json:
+        tracer.save_json(args.json)
+    if args.folded:
+        tracer.save_folded(args.folded)
@@ -1,16 +1,63 @@
+import hashlib
+import os
+import pickle
 import re
+import tempfile
+from functools import lru_cache
 from typing import List, Dict
 from bid.models import Call, CallType, Suit, Strain
 from bid.constraints import HandConstraints
-from bid.system import Rule, BiddingSystem
+from bid.system import Rule, BiddingSystem, AuctionTrigger
+
+# Compiled systems are cached next to the .dsl file as <name>.dslc (see SystemTranslator.load).
+CACHE_SUFFIX = ".dslc"
+# Bump when the cache payload changes shape, to invalidate existing caches.
+CACHE_FORMAT = 3
+# Modules whose code builds or defines a compiled system; their source is part of the cache key.
+CODE_MODULES = ("models.py", "constraints.py", "system.py", "translator.py")
+
+@lru_cache(maxsize=None)
+def code_digest() -> str:
+    """SHA-256 of the CODE_MODULES sources, so any change to them invalidates compiled caches."""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in CODE_MODULES:
+        with open(os.path.join(package_dir, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
 
 class SystemTranslator:
-    def __init__(self):
-        print("DEBUG: SystemTranslator Moving Steps Logic Outside")
-        pass
+    def load(self, dsl_path: str, use_cache: bool = True) -> BiddingSystem:
+        """
+        Parse a .dsl file, going through the compiled-system cache: a pickle
+        of the BiddingSystem (rules, triggers, automaton) stored next to the
+        file and keyed by the SHA-256 of its text and of the code that
+        compiles it (code_digest). A stale or unreadable cache is rebuilt;
+        failing to write one is not an error.
+        """
+        with open(dsl_path, "rb") as f:
+            source = f.read()
+        digest = hashlib.sha256(source).hexdigest()
+        cache_path = compiled_path(dsl_path)
+
+        if use_cache:
+            try:
+                with open(cache_path, "rb") as f:
+                    cached = pickle.load(f)
+                if (cached.get("format") == CACHE_FORMAT and cached.get("sha256") == digest
+                        and cached.get("code") == code_digest()):
+                    return cached["system"]
+            except Exception:
+                pass  # unreadable, corrupt or written by other code: rebuild
+
+        system = self.parse(source.decode("utf-8"))
+        if use_cache:
+            save_compiled(system, cache_path, digest)
+        return system
 
     def parse(self, text: str) -> BiddingSystem:
         system = BiddingSystem("ParsedSystem")
+        rules: List[Rule] = []
         lines = text.strip().split('\n')
         
         current_rule_data = None
@@ -23,7 +70,7 @@ class SystemTranslator:
             # Look for rule start: "OPEN 1NT:" or "RESPONSE 1NT:"
             if line.endswith(':'):
                 if current_rule_data:
-                    self._add_rule_from_data(system, current_rule_data)
+                    self._add_rule_from_data(rules, current_rule_data)
                 
                 heading = line[:-1]
                 if '-' in heading:
@@ -104,10 +151,11 @@ class SystemTranslator:
                     current_rule_data['shape'][suit] = (mn, mx)
 
         if current_rule_data:
-            self._add_rule_from_data(system, current_rule_data)
+            self._add_rule_from_data(rules, current_rule_data)
+        system.add_rules(rules)
         return system
 
-    def _add_rule_from_data(self, system: BiddingSystem, data: Dict):
+    def _add_rule_from_data(self, rules: List[Rule], data: Dict):
         call = self._parse_call(data['bid'])
         
         constraints = HandConstraints(
@@ -142,70 +190,14 @@ class SystemTranslator:
             # DEBUG
             # print(f"DEBUG TRANS: Rule {data['bid']} Steps={[(str(c), d) for c,d in steps]} Shape={data['shape']}")
         
-        def trigger(history: List[Call]) -> bool:
-            if trig_type == 'OPEN':
-                return len(history) == 0 or (len(history) < 4 and all(c.type == CallType.PASS for c in history))
-            
-            if trig_type == 'SEQUENCE':
-                if not history and not steps:
-                    return True
-                if not history:
-                    return False
-                
-                hist_idx = len(history) - 1
-                step_idx = len(steps) - 1
-                
-                while step_idx >= 0:
-                    if hist_idx < 0:
-                        return False
-                    
-                    call_target, is_direct = steps[step_idx]
-                    
-                    if is_direct:
-                        # Direct mode: No intervening pass allowed
-                        if history[hist_idx] != call_target:
-                            return False
-                        hist_idx -= 1
-                    else:
-                        # Standard mode: Typically implies Partner's bid + Opponent Pass
-                        pass_found = False
-                        
-                        # Consume passes
-                        while hist_idx >= 0 and history[hist_idx].type == CallType.PASS:
-                            pass_found = True
-                            hist_idx -= 1
-                        
-                        # Standard Rules require matching at least one pass if history implies response
-                        # BUT for uncontested response, we MUST have a pass.
-                        if not pass_found:
-                            return False
-                            
-                        if hist_idx < 0:
-                            return False
-                        
-                        if history[hist_idx] != call_target:
-                            return False
-                        
-                        hist_idx -= 1
-                    
-                    step_idx -= 1
-                
-                # Strict Match Check: Ensure no remaining non-pass calls in history
-                while hist_idx >= 0:
-                    if history[hist_idx].type != CallType.PASS:
-                        return False
-                    hist_idx -= 1
+        trigger = AuctionTrigger(trig_type, steps)
 
-                return True
-
-            return False 
-            
         prio = 10
         if data['balanced']: prio += 5
         if call.level == 1 and call.strain == Strain.NT: prio = 20
         
         rule = Rule(prio, trigger, constraints, call, description=f"{trig_type} {data['bid']}")
-        system.add_rule(rule)
+        rules.append(rule)
 
     def _parse_call(self, s: str) -> Call:
         if s == 'PASS': return Call(CallType.PASS)
@@ -216,3 +208,45 @@ class SystemTranslator:
         strain_str = s[1:]
         strains = {'C': Strain.CLUBS, 'D': Strain.DIAMONDS, 'H': Strain.HEARTS, 'S': Strain.SPADES, 'NT': Strain.NT}
         return Call(CallType.BID, level, strains[strain_str])
+
+def compiled_path(dsl_path: str) -> str:
+    return os.path.splitext(dsl_path)[0] + CACHE_SUFFIX
+
+def save_compiled_for(system: BiddingSystem, dsl_path: str):
+    """
+    Store `system` as the compiled cache of dsl_path, keyed by the file's
+    current text, so SystemTranslator.load returns it (rule order included)
+    until the .dsl changes.
+    """
+    with open(dsl_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    save_compiled(system, compiled_path(dsl_path), digest)
+
+def _new_file_mode() -> int:
+    """0666 less the process umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+def save_compiled(system: BiddingSystem, cache_path: str, source_sha256: str):
+    """Write a compiled-system cache atomically (concurrent workers may race on it)."""
+    system.automaton  # build it so it is stored too
+    payload = {"format": CACHE_FORMAT, "sha256": source_sha256, "code": code_digest(), "system": system}
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".", suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # mkstemp creates the file 0600; give it the mode open() would, so
+        # workers running as other users can read the shared cache.
+        os.chmod(tmp_path, _new_file_mode())
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        pass  # the cache is optional
+    finally:
+        try:
+            os.unlink(tmp_path)  # only still there if writing failed
+        except OSError:
+            pass